@@ -1,18 +1,24 @@
 
 #!/bin/bash
 
+status=0
+
+# Every test writes to a scratch data dir, never the tracked data/
+root=$(pwd)
+sandbox=$(mktemp -d)
+
 echo "🧪 Testing MotivAgent..."
 echo "=========================="
 
 # Test 1: Direct CLI usage
 echo "Test 1: Direct input mode"
-python3 main.py "walked 20 minutes and watched 3 episodes of One Piece"
+(cd "$sandbox" && PYTHONPATH="$root" python3 "$root/main.py" "walked 20 minutes and watched 3 episodes of One Piece")
 
 echo -e "\n\n"
 
 # Test 2: Interactive mode with predefined inputs
 echo "Test 2: Module imports"
-python3 -c "
+(cd "$sandbox" && PYTHONPATH="$root" python3 -c "
 from src.planner import Planner
 from src.executor import Executor
 from src.memory import Memory
@@ -39,6 +45,41 @@ trends = insight.analyze_weekly_trends()
 print('✅ Insights: Generated weekly analysis')
 
 print('\\n🎉 All tests passed! MotivAgent is ready to roast!')
-"
+") || status=1
+rm -rf "$sandbox"
+
+echo -e "\n\n"
+
+# Test 3: Storage invariants (sharded reads, streak runs, compaction, codecs, write-behind,
+# back-pressure, insight memoization, P², LTTB)
+echo "Test 3: Storage invariants"
+python3 -m tools.check_storage --sessions 200 || status=1
+
+echo -e "\n\n"
+
+# Test 4: Concurrent writers must not lose or duplicate sessions
+echo "Test 4: Concurrent writers"
+python3 -m tools.stress_writers --processes 4 --sessions 25 || status=1
+
+echo -e "\n\n"
+
+# Test 5: Batch-write a scratch log, then check its stats view against a full recompute
+echo "Test 5: Stats view vs full recompute"
+scratch=$(mktemp -d)
+printf '%s\n' "ran for 30 minutes" "studied python for 2 hours" "watched netflix for 3 hours" \
+    | (cd "$scratch" && PYTHONPATH="$root" python3 "$root/main.py" --offline --input - > /dev/null 2>&1) || status=1
+(cd "$scratch" && PYTHONPATH="$root" python3 -m tools.verify_stats) || status=1
+rm -rf "$scratch"
+
+echo -e "\n\n"
+
+# Test 6: The HTTP API end to end, on a free port with its own data dir
+echo "Test 6: HTTP API"
+python3 -m tools.check_server || status=1
 
-echo -e "\n✅ Testing complete!"
+if [ $status -eq 0 ]; then
+    echo -e "\n✅ Testing complete!"
+else
+    echo -e "\n❌ Some tests failed"
+fi
+exit $status
@@ -1,5 +1,99 @@
-python
-(254, 226, 226, 0.8) 100%);
+import os
+import re
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import List, Dict, Any, Optional
+
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+from src.planner import Planner
+from src.executor import Executor
+from src.memory import Memory
+from src.insight import Insight
+from src.aggregate import ActivityAggregate
+from src.chart_data import category_columns
+from src.jobs import JobRunner, run_reflection_job
+
+st.set_page_config(page_title="MotivAgent", page_icon="🔥", layout="wide")
+
+class MotivAgentWeb:
+    def run(self):
+        # Reset each rerun; set by _render_job while a job is still producing verdicts
+        self._job_running = False
+
+        st.markdown("""
+        <style>
+        .main-header {
+            text-align: center;
+            padding: 2rem 1rem;
+            margin-bottom: 2rem;
+            border-radius: 16px;
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            color: white;
+            animation: slideInUp 0.6s ease-out;
+        }
+
+        .main-header h1 {
+            font-size: 2.5rem;
+            font-weight: 800;
+            margin-bottom: 0.25rem;
+        }
+
+        .main-header h3, .main-header p {
+            margin: 0.25rem 0;
+            opacity: 0.9;
+        }
+
+        .stats-scroll-stack {
+            padding: 0.5rem 0;
+        }
+
+        .stats-header {
+            text-align: center;
+            margin-bottom: 1rem;
+        }
+
+        .stats-subtitle {
+            font-size: 0.85rem;
+            opacity: 0.7;
+        }
+
+        .metric-container {
+            text-align: center;
+            padding: 1rem;
+            border-radius: 12px;
+            background: rgba(255, 255, 255, 0.05);
+            border: 1px solid rgba(255, 255, 255, 0.1);
+            animation: fadeInUp 0.6s ease-out;
+        }
+
+        .insight-card {
+            padding: 1rem 1.25rem;
+            margin: 0.75rem 0;
+            border-radius: 12px;
+            background: rgba(102, 126, 234, 0.08);
+            border-left: 4px solid #667eea;
+        }
+
+        .productivity-high { color: #4caf50; font-weight: 700; }
+        .productivity-medium { color: #ff9800; font-weight: 700; }
+        .productivity-low { color: #f44336; font-weight: 700; }
+
+        .metric-card {
+            position: relative;
+            padding: 1.25rem;
+            border-radius: 16px;
+            background: rgba(255, 255, 255, 0.9);
+            border: 1px solid rgba(102, 126, 234, 0.2);
+            box-shadow: 0 4px 12px rgba(0, 0, 0, 0.08);
+        }
+
+        .metric-card.warning {
+            background: linear-gradient(135deg, rgba(254, 242, 242, 0.8) 0%, rgba(254, 226, 226, 0.8) 100%);
             border-color: rgba(245, 101, 101, 0.3);
         }
 
@@ -196,7 +290,19 @@ python
                 </div>
             """, unsafe_allow_html=True)
 
-            streak_info = st.session_state.memory.get_streak_info()
+            # Each user gets their own Memory partition, shared by every
+            # browser session open on that user; blank means the shared log, as in main.py
+            user_id = st.text_input("👤 User", value=st.session_state.get('user_id') or os.getenv("MOTIVAGENT_USER", ""),
+                                    placeholder="shared log").strip() or None
+            if user_id is not None and not USER_ID_PATTERN.fullmatch(user_id):
+                # Rejected before shared_user_store, so a bad id never opens a store or a partition
+                st.error("👤 User ids are 1-64 letters, digits, '_', '-' or '.', not starting with '.'")
+                st.stop()
+            st.session_state.user_id = user_id
+            st.session_state.memory, st.session_state.insight = shared_user_store(user_id)
+
+            streak_info = cached_streak_info(st.session_state.user_id, st.session_state.memory.data_version(),
+                                             datetime.now().date())
 
             # Native Streamlit metrics with enhanced styling
             st.markdown("### 🔥 Current Streak")
@@ -234,20 +340,61 @@ python
                 st.progress(progress)
                 st.write(f"{int(progress * 100)}% Complete")
 
-        # Main content tabs
-        tab1, tab2, tab3, tab4 = st.tabs(["Log Activities", "Weekly Insights", "Smart Analytics", "Test Mode"])
+        views = {
+            "Log Activities": self.activity_logger,
+            "Weekly Insights": self.weekly_insights,
+            "Smart Analytics": self.smart_analytics,
+            "Test Mode": self.test_mode
+        }
 
-        with tab1:
-            self.activity_logger()
+        with st.sidebar.expander("⚙️ Rendering", expanded=False):
+            lazy = st.toggle("Lazy views", value=True, help="Only load data and build charts for the selected view")
+            prefetch = st.toggle("Prefetch other views", value=False, disabled=not lazy,
+                                 help="Warm the other views' data in the background after this one renders")
 
-        with tab2:
-            self.weekly_insights()
+        timings = st.session_state.setdefault('view_timings', {})
 
-        with tab3:
-            self.smart_analytics()
+        if lazy:
+            # Only the selected view runs; hidden views cost nothing
+            selected = st.radio("View", list(views), horizontal=True, label_visibility="collapsed", key="active_view")
+            begin = time.perf_counter()
+            views[selected]()
+            timings[selected] = time.perf_counter() - begin
 
-        with tab4:
-            self.test_mode()
+            if prefetch:
+                self._prefetch_views([name for name in views if name != selected])
+        else:
+            # Every tab renders on every rerun
+            for tab, (name, render) in zip(st.tabs(list(views)), views.items()):
+                with tab:
+                    begin = time.perf_counter()
+                    render()
+                    timings[name] = time.perf_counter() - begin
+
+        if timings:
+            st.sidebar.caption("⏱️ " + " · ".join(f"{name}: {seconds * 1000:.0f} ms" for name, seconds in timings.items()))
+
+        # Rendered after the tabs so it counts this rerun's lookups
+        cache = st.session_state.insight.cache_stats()
+        st.sidebar.caption(f"⚡ Insight cache: {cache['hits']} hits / {cache['misses']} misses "
+                           f"({cache['hit_rate']:.0%} hit rate)")
+
+        # Poll a running job only after the whole page has rendered
+        if self._job_running:
+            time.sleep(JOB_POLL_INTERVAL)
+            st.rerun()
+
+    def _prefetch_views(self, names: List[str]):
+        """Warm the memoized data behind other views on a background thread (no Streamlit calls there)"""
+        insight = st.session_state.insight
+        warmers = {
+            "Weekly Insights": lambda: (insight.analyze_weekly_trends(), insight.suggest_improvements(),
+                                        insight.long_term_trends()),
+            "Smart Analytics": insight.weekly_aggregate
+        }
+        for name in names:
+            if name in warmers:
+                prefetch_pool().submit(warmers[name])
 
     def activity_logger(self):
         st.markdown("### Daily Activity Log")
@@ -270,7 +417,7 @@ python
 
             if st.button("Analyze Activities", type="primary", use_container_width=True):
                 if user_input.strip():
-                    self.process_activities(user_input)
+                    self.process_activities(user_input, "Log Activities")
                 else:
                     st.warning("Please enter some activities to analyze")
 
@@ -317,7 +464,7 @@ python
             for i, (button_text, activity_text, icon) in enumerate(suggested_activities):
                 col = cols[i % 3]
                 if col.button(f"{icon} {button_text}", use_container_width=True):
-                    self.process_activities(activity_text)
+                    self.process_activities(activity_text, "Log Activities")
 
             # Custom quick activity builder
             with st.expander("🛠️ Build Custom Activity", expanded=False):
@@ -340,159 +487,196 @@ python
                     custom_text += f" {custom_details}"
 
                 if st.button("🚀 Log Custom Activity", use_container_width=True):
-                    self.process_activities(custom_text)
+                    self.process_activities(custom_text, "Log Activities")
 
-    def process_activities(self, user_input):
-        with st.spinner("🧠 Analyzing your life choices... This might sting a little..."):
-            # Parse activities
-            activities = st.session_state.planner.parse_input(user_input)
+        self._render_job("Log Activities")
 
-            # Process with executor
-            processed = st.session_state.executor.process_activities(activities)
+    def process_activities(self, user_input, view: str):
+        """Submit the reflection pipeline as a background job; view's _render_job shows it as it progresses"""
+        runner = job_runner()
+        owner = st.session_state.setdefault('session_key', uuid.uuid4().hex)
+        planner, executor = shared_engines()
 
-            # Store in memory
-            st.session_state.memory.store_session(processed)
+        try:
+            job = runner.submit(run_reflection_job, planner, executor, st.session_state.memory, user_input, owner=owner)
+        except RuntimeError:
+            st.warning("⏳ Still roasting your previous entry... give it a second.")
+            return
 
-            # Display results with enhanced styling
-            st.success("✅ Analysis Complete! Brace yourself...")
+        st.session_state.job_id = job.id
+        st.session_state.job_view = view
 
-            total_calories = sum(a['calories_burned'] for a in processed)
-            avg_productivity = sum(a['productivity_score'] for a in processed) / len(processed)
+    def _render_job(self, view: str):
+        """Render the session's current job in the view that submitted it.
 
-            # Enhanced summary metrics
-            col1, col2, col3, col4 = st.columns(4)
+        Polling happens once at the end of run(), so an unfinished job
+        never cuts off the views rendered after this one.
+        """
+        if st.session_state.get('job_view') != view:
+            return
+        job = job_runner().get(st.session_state.get('job_id'))
+        if job is None:
+            return
 
-            with col1:
-                st.markdown(f"""
-                <div class="metric-container">
-                    <h2 style="color: #ff6b6b;">🔥</h2>
-                    <h3>{total_calories}</h3>
-                    <p>Calories Burned</p>
-                </div>
-                """, unsafe_allow_html=True)
-
-            with col2:
-                color = "#4caf50" if avg_productivity >= 7 else "#ff9800" if avg_productivity >= 4 else "#f44336"
-                st.markdown(f"""
-                <div class="metric-container">
-                    <h2 style="color: {color};">📊</h2>
-                    <h3>{avg_productivity:.1f}/10</h3>
-                    <p>Avg Productivity</p>
-                </div>
-                """, unsafe_allow_html=True)
-
-            with col3:
-                st.markdown(f"""
-                <div class="metric-container">
-                    <h2 style="color: #667eea;">📝</h2>
-                    <h3>{len(processed)}</h3>
-                    <p>Activities</p>
-                </div>
-                """, unsafe_allow_html=True)
-
-            with col4:
-                total_time = sum(a['duration'] for a in processed)
-                st.markdown(f"""
-                <div class="metric-container">
-                    <h2 style="color: #764ba2;">⏰</h2>
-                    <h3>{total_time}</h3>
-                    <p>Total Minutes</p>
-                </div>
-                """, unsafe_allow_html=True)
+        processed = job.results()
+        if not job.finished:
+            progress = len(processed) / job.total if job.total else 0.0
+            st.progress(progress, text="🧠 Analyzing your life choices... This might sting a little...")
+        elif job.status == 'failed':
+            st.error(f"❌ Analysis failed: {job.error}")
+        elif processed:
+            self._render_summary(processed)
+
+        if processed:
+            st.markdown("### 🎭 RoastBot's Individual Verdicts")
+        # Cards appear one by one as their messages complete
+        for i, activity in enumerate(processed, 1):
+            self._render_verdict(i, activity)
 
-            # Individual activity results with enhanced cards
-        st.markdown("### 🎭 RoastBot's Individual Verdicts")
+        if not job.finished:
+            self._job_running = True
 
-        for i, activity in enumerate(processed, 1):
-            productivity_class = "productivity-high" if activity['productivity_score'] >= 7 else \
-                               "productivity-medium" if activity['productivity_score'] >= 4 else "productivity-low"
-
-            # Build context display
-            context_info = []
-            context = activity.get('context', {})
-            if 'location' in context:
-                context_info.append(f"📍 {context['location']}")
-            if context.get('with_others'):
-                context_info.append("👥 With others")
-            elif context.get('with_others') == False:
-                context_info.append("🚶 Solo")
-            if 'time_of_day' in context:
-                context_info.append(f"🕐 {context['time_of_day']}")
-
-            mood_emoji = {'positive': '😊', 'negative': '😔', 'neutral': '😐'}
-            mood_display = mood_emoji.get(activity.get('mood', 'neutral'), '😐')
-
-            subcategory = activity.get('subcategory', 'general')
-            subcategory_display = f" ({subcategory})" if subcategory != 'general' else ""
-
-            confidence = activity.get('confidence', 0)
-            confidence_display = "🎯 High" if confidence > 0.7 else "🤔 Medium" if confidence > 0.3 else "❓ Low"
-
-            animation_delay = (i-1)*0.1
+    def _render_summary(self, processed):
+        # Display results with enhanced styling
+        st.success("✅ Analysis Complete! Brace yourself...")
+
+        total_calories = sum(a['calories_burned'] for a in processed)
+        avg_productivity = sum(a['productivity_score'] for a in processed) / len(processed)
+
+        # Enhanced summary metrics
+        col1, col2, col3, col4 = st.columns(4)
+
+        with col1:
             st.markdown(f"""
-            <div class="activity-card {productivity_class}" style="animation: slideInUp 0.6s ease-out; animation-delay: {animation_delay}s; animation-fill-mode: both;">
-                <div style="display: flex; align-items: center; margin-bottom: 1rem;">
-                    <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); width: 40px; height: 40px; border-radius: 50%; display: flex; align-items: center; justify-content: center; margin-right: 1rem; font-size: 1.2rem; box-shadow: 0 4px 15px rgba(102, 126, 234, 0.3);">
-                        📌
-                    </div>
-                    <h4 style="margin: 0; flex: 1; color: #f1f5f9; font-size: 1.3rem; font-weight: 600;">Activity {i}: {activity['text']}</h4>
-                </div>
+            <div class="metric-container">
+                <h2 style="color: #ff6b6b;">🔥</h2>
+                <h3>{total_calories}</h3>
+                <p>Calories Burned</p>
+            </div>
+            """, unsafe_allow_html=True)
 
-                <div style="display: grid; grid-template-columns: 2fr 1fr; gap: 2rem; margin: 1.5rem 0; background: rgba(255, 255, 255, 0.03); padding: 1.5rem; border-radius: 12px; border: 1px solid rgba(255, 255, 255, 0.1);">
-                    <div style="color: #e2e8f0;">
-                        <div style="margin-bottom: 0.8rem;"><span style="color: #94a3b8; font-weight: 500;">Category:</span> <span style="color: #60a5fa; font-weight: 600;">{activity['category'].title()}{subcategory_display}</span></div>
-                        <div style="margin-bottom: 0.8rem;"><span style="color: #94a3b8; font-weight: 500;">Duration:</span> <span style="color: #34d399; font-weight: 600;">{activity['duration']} minutes</span></div>
-                        <div style="margin-bottom: 0.8rem;"><span style="color: #94a3b8; font-weight: 500;">Intensity:</span> <span style="color: #fbbf24; font-weight: 600;">{activity['intensity'].title()}</span></div>
-                        <div><span style="color: #94a3b8; font-weight: 500;">Mood:</span> <span style="font-weight: 600;">{mood_display} {activity.get('mood', 'neutral').title()}</span></div>
-                    </div>
-                    <div style="text-align: center;">
-                        <div style="background: linear-gradient(135deg, #ef4444 0%, #f97316 100%); color: white; padding: 0.8rem; border-radius: 12px; margin-bottom: 1rem; box-shadow: 0 4px 15px rgba(239, 68, 68, 0.3);">
-                            <div style="font-size: 1.8rem; font-weight: 700; margin-bottom: 0.2rem;">{activity['calories_burned']}</div>
-                            <div style="font-size: 0.9rem; opacity: 0.9;">calories</div>
-                        </div>
-                        <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 0.8rem; border-radius: 12px; margin-bottom: 0.5rem; box-shadow: 0 4px 15px rgba(102, 126, 234, 0.3);">
-                            <div style="font-size: 1.8rem; font-weight: 700; margin-bottom: 0.2rem;">{activity['productivity_score']}/10</div>
-                            <div style="font-size: 0.9rem; opacity: 0.9;">productivity</div>
-                        </div>
-                        <div style="color: #64748b; font-size: 0.8rem; opacity: 0.8;">Parse: {confidence_display}</div>
-                    </div>
-                </div>
+        with col2:
+            color = "#4caf50" if avg_productivity >= 7 else "#ff9800" if avg_productivity >= 4 else "#f44336"
+            st.markdown(f"""
+            <div class="metric-container">
+                <h2 style="color: {color};">📊</h2>
+                <h3>{avg_productivity:.1f}/10</h3>
+                <p>Avg Productivity</p>
+            </div>
+            """, unsafe_allow_html=True)
 
-                {f'<div style="margin: 1rem 0; color: #94a3b8; font-size: 0.95rem; padding: 0.8rem; background: rgba(255, 255, 255, 0.02); border-radius: 8px; border-left: 3px solid #667eea;"><strong>Context:</strong> {" • ".join(context_info)}</div>' if context_info else ''}
+        with col3:
+            st.markdown(f"""
+            <div class="metric-container">
+                <h2 style="color: #667eea;">📝</h2>
+                <h3>{len(processed)}</h3>
+                <p>Activities</p>
             </div>
             """, unsafe_allow_html=True)
 
-            # Use Streamlit components for roast message
+        with col4:
+            total_time = sum(a['duration'] for a in processed)
             st.markdown(f"""
-            <div style="
-                background: linear-gradient(135deg, rgba(255, 59, 48, 0.15) 0%, rgba(255, 149, 0, 0.1) 100%);
-                backdrop-filter: blur(15px);
-                border: 2px solid rgba(255, 59, 48, 0.4);
-                padding: 1.8rem;
-                border-radius: 16px;
-                margin: 1.5rem 0;
-                color: #ffffff;
-                box-shadow: 0 12px 35px rgba(255, 59, 48, 0.25), 0 4px 15px rgba(0, 0, 0, 0.1), inset 0 1px 0 rgba(255, 255, 255, 0.15);
-                position: relative;
-                overflow: hidden;
-                font-size: 1.05rem;
-                line-height: 1.6;
-                text-shadow: 0 1px 3px rgba(0, 0, 0, 0.3);
-                animation: roastGlow 0.6s ease-out;
-            ">
-                <div style="color: #ffcc02; text-shadow: 0 2px 10px rgba(255, 204, 2, 0.4); font-weight: 700; font-size: 1.1rem; margin-bottom: 0.5rem;">
-                    🎭 RoastBot Says:
-                </div>
-                {activity['motivation_message']}
-                <div style="position: absolute; top: 1rem; right: 1rem; font-size: 1.5rem; opacity: 0.7;">🎭</div>
+            <div class="metric-container">
+                <h2 style="color: #764ba2;">⏰</h2>
+                <h3>{total_time}</h3>
+                <p>Total Minutes</p>
             </div>
             """, unsafe_allow_html=True)
 
+    def _render_verdict(self, i, activity):
+        productivity_class = "productivity-high" if activity['productivity_score'] >= 7 else \
+                           "productivity-medium" if activity['productivity_score'] >= 4 else "productivity-low"
+
+        # Build context display
+        context_info = []
+        context = activity.get('context', {})
+        if 'location' in context:
+            context_info.append(f"📍 {context['location']}")
+        if context.get('with_others'):
+            context_info.append("👥 With others")
+        elif context.get('with_others') == False:
+            context_info.append("🚶 Solo")
+        if 'time_of_day' in context:
+            context_info.append(f"🕐 {context['time_of_day']}")
+
+        mood_emoji = {'positive': '😊', 'negative': '😔', 'neutral': '😐'}
+        mood_display = mood_emoji.get(activity.get('mood', 'neutral'), '😐')
+
+        subcategory = activity.get('subcategory', 'general')
+        subcategory_display = f" ({subcategory})" if subcategory != 'general' else ""
+
+        confidence = activity.get('confidence', 0)
+        confidence_display = "🎯 High" if confidence > 0.7 else "🤔 Medium" if confidence > 0.3 else "❓ Low"
+
+        animation_delay = (i-1)*0.1
+        st.markdown(f"""
+        <div class="activity-card {productivity_class}" style="animation: slideInUp 0.6s ease-out; animation-delay: {animation_delay}s; animation-fill-mode: both;">
+            <div style="display: flex; align-items: center; margin-bottom: 1rem;">
+                <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); width: 40px; height: 40px; border-radius: 50%; display: flex; align-items: center; justify-content: center; margin-right: 1rem; font-size: 1.2rem; box-shadow: 0 4px 15px rgba(102, 126, 234, 0.3);">
+                    📌
+                </div>
+                <h4 style="margin: 0; flex: 1; color: #f1f5f9; font-size: 1.3rem; font-weight: 600;">Activity {i}: {activity['text']}</h4>
+            </div>
+
+            <div style="display: grid; grid-template-columns: 2fr 1fr; gap: 2rem; margin: 1.5rem 0; background: rgba(255, 255, 255, 0.03); padding: 1.5rem; border-radius: 12px; border: 1px solid rgba(255, 255, 255, 0.1);">
+                <div style="color: #e2e8f0;">
+                    <div style="margin-bottom: 0.8rem;"><span style="color: #94a3b8; font-weight: 500;">Category:</span> <span style="color: #60a5fa; font-weight: 600;">{activity['category'].title()}{subcategory_display}</span></div>
+                    <div style="margin-bottom: 0.8rem;"><span style="color: #94a3b8; font-weight: 500;">Duration:</span> <span style="color: #34d399; font-weight: 600;">{activity['duration']} minutes</span></div>
+                    <div style="margin-bottom: 0.8rem;"><span style="color: #94a3b8; font-weight: 500;">Intensity:</span> <span style="color: #fbbf24; font-weight: 600;">{activity['intensity'].title()}</span></div>
+                    <div><span style="color: #94a3b8; font-weight: 500;">Mood:</span> <span style="font-weight: 600;">{mood_display} {activity.get('mood', 'neutral').title()}</span></div>
+                </div>
+                <div style="text-align: center;">
+                    <div style="background: linear-gradient(135deg, #ef4444 0%, #f97316 100%); color: white; padding: 0.8rem; border-radius: 12px; margin-bottom: 1rem; box-shadow: 0 4px 15px rgba(239, 68, 68, 0.3);">
+                        <div style="font-size: 1.8rem; font-weight: 700; margin-bottom: 0.2rem;">{activity['calories_burned']}</div>
+                        <div style="font-size: 0.9rem; opacity: 0.9;">calories</div>
+                    </div>
+                    <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 0.8rem; border-radius: 12px; margin-bottom: 0.5rem; box-shadow: 0 4px 15px rgba(102, 126, 234, 0.3);">
+                        <div style="font-size: 1.8rem; font-weight: 700; margin-bottom: 0.2rem;">{activity['productivity_score']}/10</div>
+                        <div style="font-size: 0.9rem; opacity: 0.9;">productivity</div>
+                    </div>
+                    <div style="color: #64748b; font-size: 0.8rem; opacity: 0.8;">Parse: {confidence_display}</div>
+                </div>
+            </div>
+
+            {f'<div style="margin: 1rem 0; color: #94a3b8; font-size: 0.95rem; padding: 0.8rem; background: rgba(255, 255, 255, 0.02); border-radius: 8px; border-left: 3px solid #667eea;"><strong>Context:</strong> {" • ".join(context_info)}</div>' if context_info else ''}
+        </div>
+        """, unsafe_allow_html=True)
+
+        # Use Streamlit components for roast message
+        st.markdown(f"""
+        <div style="
+            background: linear-gradient(135deg, rgba(255, 59, 48, 0.15) 0%, rgba(255, 149, 0, 0.1) 100%);
+            backdrop-filter: blur(15px);
+            border: 2px solid rgba(255, 59, 48, 0.4);
+            padding: 1.8rem;
+            border-radius: 16px;
+            margin: 1.5rem 0;
+            color: #ffffff;
+            box-shadow: 0 12px 35px rgba(255, 59, 48, 0.25), 0 4px 15px rgba(0, 0, 0, 0.1), inset 0 1px 0 rgba(255, 255, 255, 0.15);
+            position: relative;
+            overflow: hidden;
+            font-size: 1.05rem;
+            line-height: 1.6;
+            text-shadow: 0 1px 3px rgba(0, 0, 0, 0.3);
+            animation: roastGlow 0.6s ease-out;
+        ">
+            <div style="color: #ffcc02; text-shadow: 0 2px 10px rgba(255, 204, 2, 0.4); font-weight: 700; font-size: 1.1rem; margin-bottom: 0.5rem;">
+                🎭 RoastBot Says:
+            </div>
+            {activity['motivation_message']}
+            <div style="position: absolute; top: 1rem; right: 1rem; font-size: 1.5rem; opacity: 0.7;">🎭</div>
+        </div>
+        """, unsafe_allow_html=True)
+
+
     def weekly_insights(self):
         st.markdown("### Weekly Overview")
 
+        # One pass over the week feeds the trends, summary cards and suggestions;
+        # all three are memoized until the next write, so reruns are free
         insights = st.session_state.insight.analyze_weekly_trends()
-        weekly_summary = st.session_state.memory.get_weekly_summary()
+        weekly_summary = st.session_state.insight.weekly_aggregate().summary()
 
         # Clean summary cards
         col1, col2, col3, col4 = st.columns(4)
@@ -532,15 +716,7 @@ python
         with col2:
             st.markdown("### 📋 Activity Breakdown")
             if insights['category_analysis']['breakdown']:
-                breakdown_data = []
-                for category, stats in insights['category_analysis']['breakdown'].items():
-                    breakdown_data.append({
-                        'Category': category.title(),
-                        'Count': stats['count'],
-                        'Time (min)': stats['total_time']
-                    })
-
-                df = pd.DataFrame(breakdown_data)
+                df = pd.DataFrame(category_columns(insights['category_analysis']['breakdown']))
 
                 # Create a pie chart
                 fig = px.pie(df, values='Count', names='Category', 
@@ -549,6 +725,33 @@ python
                 fig.update_layout(height=400)
                 st.plotly_chart(fig, use_container_width=True)
 
+        # Long-horizon trends over the daily rollups
+        long_term = st.session_state.insight.long_term_trends()
+        if long_term and long_term['days'] >= 14:
+            st.markdown("### 📈 Long-term Trends")
+            rolling = long_term['productivity']['rolling']
+
+            col1, col2, col3, col4 = st.columns(4)
+            col1.metric("7-day Avg Score", f"{rolling[7] or 0:.1f}")
+            col2.metric("30-day Avg Score", f"{rolling[30] or 0:.1f}")
+            col3.metric("90-day Avg Score", f"{rolling[90] or 0:.1f}")
+            col4.metric("Weekly Slope", f"{long_term['productivity']['slope_per_week']:+.2f}")
+
+            # Downsampled server-side, so the payload is bounded whatever the history length
+            df_trend = pd.DataFrame(st.session_state.insight.trend_chart())
+            fig = px.line(df_trend, x='date', y=['productivity', 'rolling_7', 'rolling_30', 'ewma'],
+                          title="Daily Productivity (rolling means and EWMA)")
+            fig.update_layout(height=350, legend_title_text="")
+            st.plotly_chart(fig, use_container_width=True)
+
+            if long_term['category_slopes']:
+                df_slopes = pd.DataFrame(list(long_term['category_slopes'].items()),
+                                         columns=['Category', 'Min/day per week'])
+                fig = px.bar(df_slopes, x='Category', y='Min/day per week',
+                             title="Category Trends (last 30 days)")
+                fig.update_layout(height=300)
+                st.plotly_chart(fig, use_container_width=True)
+
         # Suggestions with enhanced styling
         suggestions = st.session_state.insight.suggest_improvements()
         st.markdown("### 🎯 Improvement Suggestions")
@@ -565,18 +768,13 @@ python
         st.markdown("### 🧠 Smart Analytics Dashboard")
         st.markdown("*Advanced insights powered by enhanced activity understanding*")
 
-        # Get enhanced data
-        weekly_data = st.session_state.memory.get_weekly_data()
-        if not weekly_data:
+        # Every section below reads from one aggregation pass over the week
+        aggregate = st.session_state.insight.weekly_aggregate()
+        if not aggregate.sessions:
             st.info("📊 No data available yet. Start logging activities to see advanced analytics!")
             return
 
-        # Extract all activities for analysis
-        all_activities = []
-        for session in weekly_data:
-            all_activities.extend(session.get('activities', []))
-
-        if not all_activities:
+        if not aggregate.activities:
             st.info("📊 No activities found in recent data.")
             return
 
@@ -586,21 +784,9 @@ python
         with col1:
             st.markdown("#### 🎯 Activity Patterns")
 
-            # Category distribution with subcategories
-            category_data = {}
-            subcategory_data = {}
-
-            for activity in all_activities:
-                cat = activity.get('category', 'other')
-                subcat = activity.get('subcategory', 'general')
-
-                category_data[cat] = category_data.get(cat, 0) + 1
-                key = f"{cat} - {subcat}" if subcat != 'general' else cat
-                subcategory_data[key] = subcategory_data.get(key, 0) + 1
-
-            # Create category chart
-            if category_data:
-                df_cat = pd.DataFrame(list(category_data.items()), columns=['Category', 'Count'])
+            # Category distribution
+            if aggregate.categories:
+                df_cat = pd.DataFrame(category_columns(aggregate.categories))
                 fig = px.bar(df_cat, x='Category', y='Count', 
                            title="Activity Categories",
                            color='Count',
@@ -612,15 +798,21 @@ python
             st.markdown("#### ⏰ Time Patterns")
 
             # Duration analysis
-            durations = [activity.get('duration', 0) for activity in all_activities]
-            if durations:
-                avg_duration = sum(durations) / len(durations)
-                max_duration = max(durations)
-                total_time = sum(durations)
-
-                st.metric("Average Duration", f"{avg_duration:.1f} min")
-                st.metric("Longest Session", f"{max_duration} min") 
-                st.metric("Total Time Tracked", f"{total_time//60}h {total_time%60}m")
+            total_time = aggregate.total_minutes
+
+            st.metric("Average Duration", f"{aggregate.avg_duration:.1f} min")
+            st.metric("Longest Session", f"{aggregate.max_duration} min")
+            st.metric("Total Time Tracked", f"{total_time//60}h {total_time%60}m")
+
+        # Full-history timeline, bucketed to stay within the chart point budget
+        timeline = st.session_state.insight.activity_timeline()
+        if len(timeline['date']) > 1:
+            df_timeline = pd.DataFrame({key: timeline[key] for key in ('date', 'minutes', 'productivity')})
+            fig = px.bar(df_timeline, x='date', y='minutes', color='productivity',
+                         title=f"Minutes Tracked per {timeline['bucket'].title()}",
+                         color_continuous_scale='viridis')
+            fig.update_layout(height=300)
+            st.plotly_chart(fig, use_container_width=True)
 
         # Productivity trends
         st.markdown("#### 📈 Productivity Intelligence")
@@ -629,30 +821,24 @@ python
 
         with col1:
             # Mood analysis
-            moods = [activity.get('mood', 'neutral') for activity in all_activities]
-            mood_counts = {mood: moods.count(mood) for mood in set(moods)}
-
             st.markdown("**Mood Distribution**")
-            for mood, count in mood_counts.items():
-                percentage = (count / len(moods)) * 100
+            for mood, count in aggregate.moods.items():
+                percentage = (count / aggregate.activities) * 100
                 emoji = {'positive': '😊', 'negative': '😔', 'neutral': '😐'}
                 st.write(f"{emoji.get(mood, '😐')} {mood.title()}: {percentage:.1f}%")
 
         with col2:
             # Intensity patterns
-            intensities = [activity.get('intensity', 'medium') for activity in all_activities]
-            intensity_counts = {i: intensities.count(i) for i in set(intensities)}
-
             st.markdown("**Intensity Levels**")
-            for intensity, count in intensity_counts.items():
-                percentage = (count / len(intensities)) * 100
+            for intensity, count in aggregate.intensities.items():
+                percentage = (count / aggregate.activities) * 100
                 emoji = {'high': '🔥', 'medium': '⚡', 'low': '🌱'}
                 st.write(f"{emoji.get(intensity, '⚡')} {intensity.title()}: {percentage:.1f}%")
 
         with col3:
             # Context insights
-            social_activities = sum(1 for a in all_activities if a.get('context', {}).get('with_others'))
-            solo_activities = sum(1 for a in all_activities if a.get('context', {}).get('with_others') == False)
+            social_activities = aggregate.social['social']
+            solo_activities = aggregate.social['solo']
 
             st.markdown("**Social vs Solo**")
             if social_activities + solo_activities > 0:
@@ -664,7 +850,7 @@ python
         st.markdown("#### 🔮 AI-Powered Insights")
 
         # Generate smart insights
-        insights = self._generate_smart_insights(all_activities)
+        insights = self._generate_smart_insights(aggregate)
 
         for insight in insights:
             st.markdown(f"""
@@ -678,26 +864,23 @@ python
         # Parsing quality analysis
         st.markdown("#### 🎯 Input Understanding Quality")
 
-        confidence_scores = [activity.get('confidence', 0) for activity in all_activities]
-        if confidence_scores:
-            avg_confidence = sum(confidence_scores) / len(confidence_scores)
-            high_confidence = sum(1 for c in confidence_scores if c > 0.7)
+        high_confidence = aggregate.high_confidence
 
-            col1, col2, col3 = st.columns(3)
-            col1.metric("Average Parse Confidence", f"{avg_confidence:.2f}")
-            col2.metric("High Confidence Parses", f"{high_confidence}/{len(confidence_scores)}")
-            col3.metric("Parse Success Rate", f"{(high_confidence/len(confidence_scores)*100):.1f}%")
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Average Parse Confidence", f"{aggregate.avg_confidence:.2f}")
+        col2.metric("High Confidence Parses", f"{high_confidence}/{aggregate.activities}")
+        col3.metric("Parse Success Rate", f"{(high_confidence/aggregate.activities*100):.1f}%")
 
-    def _generate_smart_insights(self, activities: List[Dict]) -> List[str]:
+    def _generate_smart_insights(self, aggregate: ActivityAggregate) -> List[str]:
         """Generate AI-powered insights from activity data"""
         insights = []
+        total = aggregate.activities
 
-        if not activities:
+        if not total:
             return ["No activities to analyze yet!"]
 
         # Productivity patterns
-        prod_scores = [a.get('productivity_score', 5) for a in activities]
-        avg_prod = sum(prod_scores) / len(prod_scores)
+        avg_prod = aggregate.avg_activity_productivity
 
         if avg_prod > 7:
             insights.append("🏆 **Productivity Champion**: You're consistently hitting high productivity scores! Keep up the excellent work.")
@@ -705,29 +888,25 @@ python
             insights.append("📈 **Growth Opportunity**: Your productivity scores suggest room for improvement. Consider adding more structured activities.")
 
         # Time management insights
-        durations = [a.get('duration', 0) for a in activities]
-        if durations:
-            long_sessions = sum(1 for d in durations if d > 120)
-            if long_sessions > len(durations) * 0.3:
-                insights.append("⏰ **Marathon Sessions**: You tend to do long activity sessions. Consider breaking them up with short breaks for better focus.")
+        if aggregate.long_activities > total * 0.3:
+            insights.append("⏰ **Marathon Sessions**: You tend to do long activity sessions. Consider breaking them up with short breaks for better focus.")
 
         # Mood correlation
-        positive_moods = sum(1 for a in activities if a.get('mood') == 'positive')
-        if positive_moods > len(activities) * 0.6:
+        if aggregate.moods.get('positive', 0) > total * 0.6:
             insights.append("😊 **Positive Vibes**: You report positive moods frequently! This suggests good activity choices that align with your preferences.")
 
         # Category diversity
-        categories = set(a.get('category') for a in activities)
+        categories = aggregate.categories
         if len(categories) > 5:
             insights.append("🌈 **Well-Rounded**: You engage in diverse activity types, which is excellent for balanced personal development.")
         elif len(categories) < 3:
             insights.append("🎯 **Specialization**: You focus on fewer activity types. Consider exploring new categories for variety.")
 
         # Context insights
-        social_count = sum(1 for a in activities if a.get('context', {}).get('with_others'))
-        if social_count > len(activities) * 0.5:
+        social_count = aggregate.social['social']
+        if social_count > total * 0.5:
             insights.append("👥 **Social Butterfly**: You frequently engage in activities with others. Great for building relationships!")
-        elif social_count < len(activities) * 0.2:
+        elif social_count < total * 0.2:
             insights.append("🧘 **Solo Focus**: You prefer individual activities. Consider occasional social activities for balance.")
 
         return insights if insights else ["🤖 Analyzing your patterns... More data needed for deeper insights!"]
@@ -754,8 +933,51 @@ python
             col = cols[i % 2]
             with col:
                 if st.button(f"{title}", key=f"test_{i}", use_container_width=True):
-                    st.markdown(f"**Testing scenario:** *{scenario}*")
-                    self.process_activities(scenario)
+                    st.session_state.test_scenario = scenario
+                    self.process_activities(scenario, "Test Mode")
+
+        if st.session_state.get('test_scenario'):
+            st.markdown(f"**Testing scenario:** *{st.session_state.test_scenario}*")
+        self._render_job("Test Mode")
+
+@st.cache_resource
+def shared_engines():
+    """One Planner and Executor per process: both are stateless per request, and
+    sharing them shares the lexicons, the HTTP connection pool and the message cache"""
+    return Planner(), Executor()
+
+# User ids the sidebar accepts: exactly the names Memory keeps as-is for partition directories
+USER_ID_PATTERN = re.compile(r'[A-Za-z0-9_-][A-Za-z0-9_.-]{0,63}')
+
+# User stores kept open per process; the least recently used is dropped beyond this.
+# Stores here don't use write-behind, so a dropped one holds no thread or unflushed
+# sessions, and reopening it folds any uncheckpointed log tail back in.
+MAX_OPEN_USERS = 64
+
+@st.cache_resource(max_entries=MAX_OPEN_USERS)
+def shared_user_store(user_id: Optional[str]):
+    """One Memory and Insight per user per process, so their view and memoized insights are shared"""
+    memory = Memory(user_id=user_id)
+    return memory, Insight(memory)
+
+# Seconds between reruns while a background job is still producing verdicts
+JOB_POLL_INTERVAL = 0.4
+
+@st.cache_resource
+def job_runner():
+    """Process-wide bounded job pool: busy sessions queue here instead of holding script threads"""
+    return JobRunner(max_workers=4, max_active_per_owner=1)
+
+@st.cache_resource
+def prefetch_pool():
+    """Small process-wide pool for background view prefetching"""
+    return ThreadPoolExecutor(max_workers=2, thread_name_prefix="view-prefetch")
+
+@st.cache_data(max_entries=256)
+def cached_streak_info(user_id: Optional[str], data_version: tuple, day) -> Dict[str, Any]:
+    """Streak info for a user at a given data version; day is part of the key since streaks age"""
+    memory, _ = shared_user_store(user_id)
+    return memory.get_streak_info()
 
 if __name__ == "__main__":
     app = MotivAgentWeb()
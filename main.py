@@ -5,20 +5,60 @@ MotivAgent - Sarcastic Motivational AI Agent
 ODSC Agentic AI Hackathon Entry
 """
 
+import argparse
+import json
 import os
 import sys
+import time
 from datetime import datetime
-from src.planner import Planner
-from src.executor import Executor
 from src.memory import Memory
-from src.insight import Insight
+from src.instrumentation import instruments
+
+# Planner, Executor and Insight are imported on first use: the Executor
+# pulls in the HTTP stack and Insight pulls in numpy, neither of which a
+# streak check needs. Batch-mode-only modules are likewise imported there.
 
 class MotivAgent:
-    def __init__(self):
-        self.planner = Planner()
-        self.executor = Executor()
-        self.memory = Memory()
-        self.insight = Insight(self.memory)
+    def __init__(self, user_id=None, executor=None, offline=False, stub_latency=None):
+        self.user_id = user_id or os.getenv("MOTIVAGENT_USER") or None
+        self.offline = offline
+        self.stub_latency = stub_latency
+
+        # Components are built the first time a command needs them
+        self._planner = None
+        self._executor = executor
+        self._memory = None
+        self._insight = None
+
+    @property
+    def planner(self):
+        if self._planner is None:
+            from src.planner import Planner
+            self._planner = Planner()
+        return self._planner
+
+    @property
+    def executor(self):
+        if self._executor is None:
+            from src.executor import Executor, StubExecutor
+            if self.stub_latency is not None:
+                self._executor = StubExecutor(latency=self.stub_latency)
+            else:
+                self._executor = Executor(offline=self.offline)
+        return self._executor
+
+    @property
+    def memory(self):
+        if self._memory is None:
+            self._memory = Memory(user_id=self.user_id)
+        return self._memory
+
+    @property
+    def insight(self):
+        if self._insight is None:
+            from src.insight import Insight
+            self._insight = Insight(self.memory)
+        return self._insight
         
     def display_banner(self):
         """Display the MotivAgent banner"""
@@ -43,25 +83,33 @@ class MotivAgent:
         if streak_info['is_streak_broken']:
             print(f"💔 Days inactive: {streak_info['days_inactive']} (streak broken!)")
         
-    def process_daily_reflection(self, user_input: str):
+    def process_daily_reflection(self, user_input: str, verbose: bool = True):
         """Process user's daily reflection"""
-        print(f"\n🔍 ANALYZING: '{user_input}'")
-        print("=" * 50)
+        if verbose:
+            print(f"\n🔍 ANALYZING: '{user_input}'")
+            print("=" * 50)
         
         # Step 1: Parse input
-        print("📋 Planning activities...")
-        activities = self.planner.parse_input(user_input)
+        if verbose:
+            print("📋 Planning activities...")
+        with instruments.timer('agent.parse'):
+            activities = self.planner.parse_input(user_input)
         
         # Step 2: Execute with Gemini
-        print("🧠 Generating roasts/motivation...")
-        processed_activities = self.executor.process_activities(activities)
+        if verbose:
+            print("🧠 Generating roasts/motivation...")
+        with instruments.timer('agent.score'):
+            processed_activities = self.executor.process_activities(activities)
         
         # Step 3: Store in memory
-        print("💾 Storing in memory...")
-        self.memory.store_session(processed_activities)
+        if verbose:
+            print("💾 Storing in memory...")
+        with instruments.timer('agent.store'):
+            self.memory.store_session(processed_activities)
         
         # Step 4: Display results
-        self.display_results(processed_activities)
+        if verbose:
+            self.display_results(processed_activities)
         
         return processed_activities
     
@@ -165,25 +213,194 @@ class MotivAgent:
             else:
                 print("🤔 Invalid choice. Even basic number selection is challenging for you, huh?")
 
-def main():
-    """Main entry point"""
+def read_reflections(path: str, fmt: str):
+    """Stream reflection texts from a JSONL or CSV file ('-' streams stdin).
+
+    JSONL lines are objects with 'text' or 'reflection'; lines that aren't
+    JSON objects are taken as the reflection itself.
+    """
+    import csv
+
+    f = sys.stdin if path == "-" else open(path, newline='', encoding='utf-8')
+    try:
+        if fmt == "csv":
+            for record in csv.DictReader(f):
+                yield record.get('text') or record.get('reflection') or ''
+            return
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith('{'):
+                try:
+                    record = json.loads(line)
+                    yield record.get('text') or record.get('reflection') or ''
+                    continue
+                except ValueError:
+                    pass
+            yield line
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+def run_batch(agent: MotivAgent, texts, out, **pipeline_options):
+    """Stream reflections through the staged pipeline, writing JSONL results in input order"""
+    from src.pipeline import Pipeline
+
+    pipeline = Pipeline(agent.planner, agent.executor, agent.memory, **pipeline_options)
+    stage_times = {stage: [] for stage in Pipeline.STAGES}
+    counts = {'reflections': 0, 'activities': 0, 'errors': 0}
+
+    begin = time.perf_counter()
+    for result in pipeline.run(texts):
+        counts['reflections'] += 1
+        if 'error' in result:
+            counts['errors'] += 1
+            out.write(json.dumps(result) + "\n")
+            continue
+
+        activities = result['activities']
+        counts['activities'] += len(activities)
+        for stage, seconds in result.pop('timings').items():
+            stage_times[stage].append(seconds)
+        out.write(json.dumps({
+            **result,
+            'total_calories': sum(a['calories_burned'] for a in activities),
+            'avg_productivity': round(sum(a['productivity_score'] for a in activities) / len(activities), 1)
+                                if activities else 0
+        }, default=str) + "\n")
+
+    elapsed = time.perf_counter() - begin
+    return counts, stage_times, elapsed
+
+def print_batch_report(counts, stage_times, elapsed: float, executor_counters, file):
+    import statistics
+
+    print(f"\n📊 BATCH REPORT", file=file)
+    print("=" * 50, file=file)
+    print(f"   Reflections: {counts['reflections']:,} ({counts['errors']:,} failed), "
+          f"activities: {counts['activities']:,}", file=file)
+    rate = counts['reflections'] / elapsed if elapsed else 0
+    print(f"   ⚡ {elapsed:.2f}s — {rate:,.1f} reflections/s", file=file)
+
+    print(f"\n   {'stage':<8}{'p50':>10}{'p95':>10}{'p99':>10}", file=file)
+    for stage, samples in stage_times.items():
+        if not samples:
+            continue
+        cuts = statistics.quantiles(samples, n=100) if len(samples) > 1 else samples * 99
+        print(f"   {stage:<8}" + "".join(f"{cuts[p] * 1000:>8.2f}ms" for p in (49, 94, 98)), file=file)
+
+    print(f"\n   🧠 API calls: {executor_counters['api_calls']:,} | cache hits: {executor_counters['cache_hits']:,} | "
+          f"fallbacks: {executor_counters['fallbacks']:,} | API errors: {executor_counters['api_errors']:,}", file=file)
+
+def print_profile(elapsed: float, profile_out, file):
+    print(f"\n⏱️  PROFILE ({elapsed * 1000:.1f} ms wall)", file=file)
+    print("=" * 50, file=file)
+    if not instruments.histograms:
+        print("   No instrumented stages ran.", file=file)
+    for line in instruments.report():
+        print(line, file=file)
+    if profile_out:
+        print(f"\n   📄 cProfile stats written to {profile_out} (python -m pstats {profile_out})", file=file)
+
+def run(args):
+    """Run the command selected on the command line"""
+    if args.streak:
+        agent = MotivAgent(user_id=args.user)
+        agent.display_streak_info()
+        return
+
+    if args.input:
+        import contextlib
+
+        # Results own stdout; everything else (warnings, the report) goes to stderr
+        out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+        agent = MotivAgent(user_id=args.user, offline=args.offline, stub_latency=args.stub_latency)
+        fmt = args.format or ("csv" if args.input.lower().endswith(".csv") else "jsonl")
+        try:
+            with contextlib.redirect_stdout(sys.stderr):
+                counts, stage_times, elapsed = run_batch(
+                    agent, read_reflections(args.input, fmt), out, parse_workers=args.parse_workers,
+                    parse_processes=args.parse_workers > 1, score_workers=args.workers,
+                    queue_size=args.queue_size, store_batch=args.store_batch)
+        finally:
+            agent.memory.close()
+            if out is not sys.stdout:
+                out.close()
+        print_batch_report(counts, stage_times, elapsed, agent.executor.counters, sys.stderr)
+        return
+
+    agent = MotivAgent(user_id=args.user, offline=args.offline, stub_latency=args.stub_latency)
+
     # Check for API key
-    if not os.getenv("GEMINI_API_KEY"):
+    if not agent.executor.api_key and not args.offline:
         print("⚠️  Warning: GEMINI_API_KEY not found in environment variables.")
         print("   MotivAgent will use fallback responses instead of Gemini API.")
         print("   Add your API key to .env file or environment variables for full functionality.\n")
     
-    agent = MotivAgent()
-    
     # Check for command line arguments
-    if len(sys.argv) > 1:
+    if args.reflection:
         # Direct input mode
-        user_input = " ".join(sys.argv[1:])
+        user_input = " ".join(args.reflection)
         agent.display_banner()
         agent.process_daily_reflection(user_input)
     else:
         # Interactive mode
         agent.interactive_mode()
 
+def run_profiled(args):
+    """Run with stage timers (and optionally cProfile) on, then print the breakdown"""
+    instruments.enabled = True
+    profiler = None
+    if args.profile_out:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    begin = time.perf_counter()
+    try:
+        run(args)
+    finally:
+        elapsed = time.perf_counter() - begin
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(args.profile_out)
+        print_profile(elapsed, args.profile_out, sys.stderr)
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="MotivAgent - Your Sarcastic Life Coach")
+    parser.add_argument("--user", help="user whose activity log to use (defaults to $MOTIVAGENT_USER or the shared log)")
+    parser.add_argument("--input", metavar="FILE", help="batch mode: JSONL or CSV file of reflections, or - for stdin")
+    parser.add_argument("--format", choices=["csv", "jsonl"],
+                        help="batch input format (default: inferred from the extension, jsonl for stdin)")
+    parser.add_argument("--output", metavar="FILE", help="batch mode: write JSONL results here instead of stdout")
+    parser.add_argument("--workers", type=int, default=8, help="batch mode: threads scoring reflections (Gemini calls)")
+    parser.add_argument("--parse-workers", type=int, default=1,
+                        help="batch mode: processes parsing reflections (1 parses in-process)")
+    parser.add_argument("--queue-size", type=int, default=64, help="batch mode: reflections queued between stages")
+    parser.add_argument("--store-batch", type=int, default=256, help="batch mode: most sessions per storage write")
+    parser.add_argument("--offline", action="store_true", help="never call Gemini; use fallback messages")
+    parser.add_argument("--stub-latency", type=float, default=None,
+                        help="simulate Gemini with this many seconds per call (for load tests)")
+    parser.add_argument("--streak", action="store_true", help="print streak stats and exit")
+    parser.add_argument("--profile", action="store_true",
+                        help="time the planner, executor and memory stages and print a breakdown on exit")
+    parser.add_argument("--profile-out", metavar="FILE",
+                        help="with --profile, also write cProfile stats here (read with python -m pstats)")
+    parser.add_argument("--metrics-out", metavar="FILE",
+                        help="write Prometheus text-format metrics here on exit (e.g. for a textfile collector)")
+    parser.add_argument("reflection", nargs="*", help="what you did today; omit for interactive mode")
+    args = parser.parse_args()
+
+    try:
+        if args.profile:
+            run_profiled(args)
+        else:
+            run(args)
+    finally:
+        if args.metrics_out:
+            from src.metrics import registry
+            registry.write_textfile(args.metrics_out)
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,448 @@
+#!/usr/bin/env python3
+"""
+MotivAgent HTTP API - the reflection pipeline behind a plain JSON service
+
+Stdlib asyncio only: every connection is its own task, connections are
+kept alive between requests, activity parsing (pure CPU) runs on a process
+pool, Gemini scoring (network I/O) on a bounded thread pool, and storage
+goes through AsyncMemory so the event loop never blocks on disk.
+
+Endpoints:
+    GET  /health                      liveness and in-flight counters
+    POST /parse     {"text"}          activities only
+    POST /score     {"text"} or {"activities": [{"text", "category", "duration", "intensity"}, ...]}
+                                      activities with calories, productivity and a roast
+    POST /pipeline  {"text", "user"}  Planner -> Executor -> Memory, returns the session
+    POST /batch     {"items": [{"text", "user"}, ...], "store": true}
+                                      many reflections per request, processed concurrently
+    GET  /insights?user=              weekly trends and suggestions
+    GET  /streaks?user=               streak info and weekly summary
+    GET  /metrics                     Prometheus text-format metrics
+
+Usage: python server.py [--port 8080] [--offline | --stub-latency 0.2]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import signal
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Iterator, List, Dict, Any, Optional, Tuple
+from urllib.parse import urlsplit, parse_qs
+from src.planner import Planner
+from src.executor import Executor, StubExecutor
+from src.async_memory import AsyncMemory
+from src.insight import Insight
+from src.instrumentation import instruments
+from src.metrics import registry, CONTENT_TYPE as METRICS_CONTENT_TYPE
+
+HTTP_REQUESTS = registry.counter(
+    'motivagent_http_requests_total', "HTTP requests served, by route and status", ('route', 'status'))
+HTTP_LATENCY = registry.histogram(
+    'motivagent_http_request_duration_seconds', "Time to handle an HTTP request, by route", ('route',))
+
+MAX_BODY = 1024 * 1024
+MAX_HEADERS = 100
+MAX_BATCH = 1000
+KEEP_ALIVE_TIMEOUT = 15.0
+# Each open user holds a writer, reader and flusher threads; past this many
+# the least recently used idle store is closed
+MAX_OPEN_USERS = 256
+
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+           408: 'Request Timeout', 413: 'Payload Too Large', 500: 'Internal Server Error',
+           503: 'Service Unavailable'}
+
+# One Planner per parse worker process
+_planner: Optional[Planner] = None
+
+def _init_parser():
+    global _planner
+    # Ctrl-C goes to the whole process group; let the server decide when workers stop
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _planner = Planner()
+
+def _parse(text: str) -> List[Dict[str, Any]]:
+    return _planner.parse_input(text)
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+class MotivAgentServer:
+    """Asyncio HTTP/1.1 server for the MotivAgent pipeline with graceful shutdown"""
+
+    def __init__(self, executor: Executor, data_dir: str = "data", parse_workers: int = 2,
+                 score_workers: int = 16, batch_concurrency: int = 32, shutdown_grace: float = 10.0,
+                 max_open_users: int = MAX_OPEN_USERS):
+        self.executor = executor
+        self.data_dir = data_dir
+        self.parse_pool = ProcessPoolExecutor(max_workers=parse_workers, initializer=_init_parser)
+        self.score_pool = ThreadPoolExecutor(max_workers=score_workers, thread_name_prefix="score")
+        self.batch_concurrency = batch_concurrency
+        self.shutdown_grace = shutdown_grace
+
+        # Per-user storage and insights, opened on first use, least recently used first
+        self.stores: 'OrderedDict[Optional[str], Tuple[AsyncMemory, Insight]]' = OrderedDict()
+        self.max_open_users = max_open_users
+        self._closing = set()
+        # Requests currently holding each user's store
+        self._in_use: Dict[Optional[str], int] = {}
+
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._idle: Dict[asyncio.StreamWriter, bool] = {}
+        self._in_flight = 0
+        self._served = 0
+        self._stopping = False
+        self._stopped = asyncio.Event()
+
+        self.routes = {
+            ('GET', '/health'): self.health,
+            ('POST', '/parse'): self.parse,
+            ('POST', '/score'): self.score,
+            ('POST', '/pipeline'): self.pipeline,
+            ('POST', '/batch'): self.batch,
+            ('GET', '/insights'): self.insights,
+            ('GET', '/streaks'): self.streaks,
+            ('GET', '/metrics'): self.metrics,
+        }
+
+        registry.gauge('motivagent_http_requests_in_flight',
+                       "HTTP requests being handled").set_function(lambda: self._in_flight)
+        registry.gauge('motivagent_http_connections', "Open client connections").set_function(lambda: len(self._idle))
+        registry.gauge('motivagent_open_users', "Users with an open Memory").set_function(lambda: len(self.stores))
+
+    # --- pipeline stages ---
+
+    @contextmanager
+    def _store(self, user: Optional[str]) -> Iterator[Tuple[AsyncMemory, Insight]]:
+        """A user's store, held open for the block: eviction never closes a store a request is using"""
+        if user in self.stores:
+            self.stores.move_to_end(user)
+        else:
+            memory = AsyncMemory(user_id=user, data_dir=self.data_dir, write_behind=True)
+            self.stores[user] = (memory, Insight(memory.memory))
+
+        self._in_use[user] = self._in_use.get(user, 0) + 1
+        try:
+            self._evict_idle()
+            yield self.stores[user]
+        finally:
+            self._in_use[user] -= 1
+            if not self._in_use[user]:
+                del self._in_use[user]
+                self._evict_idle()
+
+    def _evict_idle(self):
+        """Close the least recently used idle stores beyond max_open_users"""
+        excess = len(self.stores) - self.max_open_users
+        if excess <= 0:
+            return
+        # Stores in use stay open past the cap; they are evicted once released
+        for user in [user for user in self.stores if user not in self._in_use][:excess]:
+            # Writes already queued on the evicted store still run before it closes
+            evicted, _ = self.stores.pop(user)
+            task = asyncio.ensure_future(evicted.close())
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+
+    async def _parse_text(self, text: str) -> List[Dict[str, Any]]:
+        # Timed here, since timings recorded inside the worker processes never reach /metrics
+        begin = time.perf_counter()
+        activities = await asyncio.get_running_loop().run_in_executor(self.parse_pool, _parse, text)
+        instruments.observe('planner.parse', time.perf_counter() - begin)
+        return activities
+
+    async def _score(self, activities: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return await asyncio.get_running_loop().run_in_executor(
+            self.score_pool, self.executor.process_activities, activities)
+
+    async def _run_pipeline(self, text: str, user: Optional[str], store: bool = True) -> Dict[str, Any]:
+        activities = await self._score(await self._parse_text(text))
+        if store:
+            with self._store(user) as (memory, _):
+                await memory.store_session(activities)
+        return {
+            'user': user,
+            'activities': activities,
+            'total_calories': sum(a['calories_burned'] for a in activities),
+            'avg_productivity': round(sum(a['productivity_score'] for a in activities) / len(activities), 1)
+                                if activities else 0
+        }
+
+    # --- handlers ---
+
+    async def health(self, query, body):
+        return {'status': 'stopping' if self._stopping else 'ok', 'in_flight': self._in_flight,
+                'served': self._served, 'connections': len(self._idle), 'users': len(self.stores)}
+
+    async def parse(self, query, body):
+        return {'activities': await self._parse_text(_text(body))}
+
+    async def score(self, query, body):
+        if 'activities' in body:
+            activities = _activities(body['activities'])
+        else:
+            activities = await self._parse_text(_text(body))
+        return {'activities': await self._score(activities)}
+
+    async def pipeline(self, query, body):
+        return await self._run_pipeline(_text(body), _user_id(body.get('user')))
+
+    async def batch(self, query, body):
+        items = body.get('items')
+        if not isinstance(items, list) or not items:
+            raise HTTPError(400, "'items' must be a non-empty list")
+        if len(items) > MAX_BATCH:
+            raise HTTPError(413, f"at most {MAX_BATCH} items per batch")
+        store = body.get('store', True)
+
+        slots = asyncio.Semaphore(self.batch_concurrency)
+
+        async def run(item):
+            async with slots:
+                try:
+                    return await self._run_pipeline(_text(item), _user_id(item.get('user')), store)
+                except HTTPError as e:
+                    return {'error': str(e)}
+
+        return {'results': await asyncio.gather(*(run(item if isinstance(item, dict) else {}) for item in items))}
+
+    async def insights(self, query, body):
+        loop = asyncio.get_running_loop()
+        with self._store(_user(query)) as (_, insight):
+            trends = await loop.run_in_executor(None, insight.analyze_weekly_trends)
+            suggestions = await loop.run_in_executor(None, insight.suggest_improvements)
+        return {**trends, 'suggestions': suggestions}
+
+    async def streaks(self, query, body):
+        with self._store(_user(query)) as (memory, _):
+            streak_info, weekly_summary = await asyncio.gather(memory.get_streak_info(), memory.get_weekly_summary())
+        return {**streak_info, 'weekly_summary': weekly_summary}
+
+    async def metrics(self, query, body):
+        return registry.render()
+
+    # --- HTTP ---
+
+    async def _read_request(self, reader: asyncio.StreamReader):
+        """(method, target, headers, body), or None when the client closed the connection"""
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), KEEP_ALIVE_TIMEOUT)
+        except asyncio.TimeoutError:
+            return None
+        if not request_line.strip():
+            return None
+
+        try:
+            method, target, version = request_line.decode('latin-1').split()
+        except ValueError:
+            raise HTTPError(400, "malformed request line")
+
+        headers = {}
+        while True:
+            line = await asyncio.wait_for(reader.readline(), KEEP_ALIVE_TIMEOUT)
+            if line in (b'\r\n', b'\n', b''):
+                break
+            if len(headers) >= MAX_HEADERS:
+                raise HTTPError(400, "too many headers")
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        headers[':version'] = version
+
+        length = int(headers.get('content-length', 0) or 0)
+        if length > MAX_BODY:
+            raise HTTPError(413, f"body larger than {MAX_BODY} bytes")
+        body = await asyncio.wait_for(reader.readexactly(length), KEEP_ALIVE_TIMEOUT) if length else b''
+        return method, target, headers, body
+
+    async def _dispatch(self, method: str, target: str, body: bytes) -> Tuple[int, Any]:
+        url = urlsplit(target)
+        handler = self.routes.get((method, url.path))
+        if handler is None:
+            if any(path == url.path for _, path in self.routes):
+                return 405, {'error': f"{method} not allowed on {url.path}"}
+            return 404, {'error': f"no route for {url.path}"}
+
+        begin = time.perf_counter()
+        status, payload = await self._call(handler, method, url, body)
+        HTTP_LATENCY.labels(route=url.path).observe(time.perf_counter() - begin)
+        return status, payload
+
+    async def _call(self, handler, method: str, url, body: bytes) -> Tuple[int, Any]:
+        try:
+            payload = json.loads(body) if body else {}
+        except ValueError:
+            return 400, {'error': "body is not valid JSON"}
+        if not isinstance(payload, dict):
+            return 400, {'error': "body must be a JSON object"}
+
+        try:
+            return 200, await handler(parse_qs(url.query), payload)
+        except HTTPError as e:
+            return e.status, {'error': str(e)}
+        except Exception as e:
+            print(f"❌ {method} {url.path} failed: {e}")
+            return 500, {'error': "internal error"}
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._idle[writer] = True
+        try:
+            while not self._stopping:
+                keep_alive = False
+                try:
+                    request = await self._read_request(reader)
+                    if request is None:
+                        break
+                    method, target, headers, body = request
+
+                    self._idle[writer] = False
+                    self._in_flight += 1
+                    try:
+                        status, payload = await self._dispatch(method, target, body)
+                    finally:
+                        self._in_flight -= 1
+                        self._served += 1
+                    # Unknown paths share one label so scanners can't blow up the series count
+                    route = urlsplit(target).path if status != 404 else 'unmatched'
+                    HTTP_REQUESTS.labels(route=route, status=status).inc()
+
+                    connection = headers.get('connection', '').lower()
+                    keep_alive = (connection != 'close' if headers[':version'] == 'HTTP/1.1'
+                                  else connection == 'keep-alive')
+                except HTTPError as e:
+                    status, payload = e.status, {'error': str(e)}
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError):
+                    status, payload = 408, {'error': "request timed out"}
+                except ValueError:
+                    status, payload = 400, {'error': "malformed headers"}
+
+                keep_alive = keep_alive and not self._stopping
+                # Handlers return text (the metrics page) or JSON-able objects
+                if isinstance(payload, str):
+                    data, content_type = payload.encode(), METRICS_CONTENT_TYPE
+                else:
+                    data, content_type = json.dumps(payload, default=str).encode(), 'application/json'
+                writer.write(
+                    f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                    f"Content-Type: {content_type}\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1') + data)
+                await writer.drain()
+                self._idle[writer] = True
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self._idle.pop(writer, None)
+            writer.close()
+
+    # --- lifecycle ---
+
+    async def serve(self, host: str, port: int):
+        self._server = await asyncio.start_server(self._handle_connection, host, port)
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, lambda: asyncio.ensure_future(self.shutdown()))
+
+        mode = "stub" if isinstance(self.executor, StubExecutor) else "gemini" if self.executor.api_key else "offline"
+        print(f"🚀 MotivAgent API listening on http://{host}:{port} (scoring: {mode})")
+        await self._stopped.wait()
+
+    async def shutdown(self):
+        """Stop accepting, let in-flight requests finish (up to the grace period), then flush storage"""
+        if self._stopping:
+            return
+        self._stopping = True
+        print("🛑 Shutting down: draining in-flight requests...")
+        self._server.close()
+
+        # Idle keep-alive connections are only waiting for a next request
+        for writer, idle in list(self._idle.items()):
+            if idle:
+                writer.close()
+
+        deadline = time.monotonic() + self.shutdown_grace
+        while self._in_flight and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+        if self._in_flight:
+            print(f"⚠️  {self._in_flight} request(s) still running after {self.shutdown_grace}s")
+
+        for memory, _ in self.stores.values():
+            await memory.close()
+        if self._closing:
+            await asyncio.gather(*self._closing)
+        self.score_pool.shutdown(wait=False)
+        self.parse_pool.shutdown(wait=True)
+        print(f"👋 Served {self._served} requests")
+        self._stopped.set()
+
+def _text(body: Dict[str, Any]) -> str:
+    text = body.get('text')
+    if not isinstance(text, str) or not text.strip():
+        raise HTTPError(400, "'text' must be a non-empty string")
+    return text
+
+def _activities(activities: Any) -> List[Dict[str, Any]]:
+    """Client-supplied activities, checked for the fields the Executor scores on"""
+    if not isinstance(activities, list) or not activities:
+        raise HTTPError(400, "'activities' must be a non-empty list")
+    if len(activities) > MAX_BATCH:
+        raise HTTPError(413, f"at most {MAX_BATCH} activities per request")
+    for i, activity in enumerate(activities):
+        if not isinstance(activity, dict):
+            raise HTTPError(400, f"activities[{i}] must be an object")
+        for field in ('text', 'category', 'intensity'):
+            if not isinstance(activity.get(field), str):
+                raise HTTPError(400, f"activities[{i}].{field} must be a string")
+        duration = activity.get('duration')
+        if isinstance(duration, bool) or not isinstance(duration, (int, float)) or duration < 0:
+            raise HTTPError(400, f"activities[{i}].duration must be a non-negative number of minutes")
+        if not isinstance(activity.get('context', {}), dict):
+            raise HTTPError(400, f"activities[{i}].context must be an object")
+    return activities
+
+def _user_id(user: Any) -> Optional[str]:
+    """A request's user id; None means the shared single-user log"""
+    if user is not None and (not isinstance(user, str) or not user):
+        raise HTTPError(400, "'user' must be a non-empty string")
+    return user
+
+def _user(query: Dict[str, List[str]]) -> Optional[str]:
+    return _user_id(query.get('user', [None])[0])
+
+def main():
+    parser = argparse.ArgumentParser(description="MotivAgent HTTP API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", 8080)))
+    parser.add_argument("--data-dir", default="data")
+    parser.add_argument("--parse-workers", type=int, default=os.cpu_count() or 2,
+                        help="processes for activity parsing")
+    parser.add_argument("--score-workers", type=int, default=16, help="threads for Gemini calls")
+    parser.add_argument("--batch-concurrency", type=int, default=32,
+                        help="reflections of one /batch request processed at once")
+    parser.add_argument("--max-open-users", type=int, default=MAX_OPEN_USERS,
+                        help="user stores kept open at once; the least recently used is closed beyond this")
+    parser.add_argument("--offline", action="store_true", help="never call Gemini; use fallback messages")
+    parser.add_argument("--stub-latency", type=float, default=None,
+                        help="simulate Gemini with this many seconds per call (for load tests)")
+    args = parser.parse_args()
+
+    if args.stub_latency is not None:
+        executor = StubExecutor(latency=args.stub_latency)
+    else:
+        executor = Executor(offline=args.offline)
+
+    server = MotivAgentServer(executor, data_dir=args.data_dir, parse_workers=args.parse_workers,
+                              score_workers=args.score_workers, batch_concurrency=args.batch_concurrency,
+                              max_open_users=args.max_open_users)
+    asyncio.run(server.serve(args.host, args.port))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+from typing import List, Dict, Any, Iterable, Optional
+
+# Activities longer than this count as "marathon" sessions
+LONG_ACTIVITY_MINUTES = 120
+
+class ActivityAggregate:
+    """Every statistic the insight and dashboard code needs, built in one pass over the sessions.
+
+    Counters are plain dicts keyed by label, so each activity costs a few
+    dict updates no matter how many categories there are.
+    """
+
+    def __init__(self):
+        self.sessions = 0
+        self.activities = 0
+        self.total_calories = 0
+
+        # Per-session average productivity, oldest first
+        self.productivity_series: List[float] = []
+        self.activity_productivity_sum = 0
+
+        self.categories: Dict[str, Dict[str, int]] = {}
+        self.subcategories: Dict[str, int] = {}
+        self.moods: Dict[str, int] = {}
+        self.intensities: Dict[str, int] = {}
+        # Activities flagged with_others True / False; unflagged ones count as neither
+        self.social = {'social': 0, 'solo': 0}
+
+        self.total_minutes = 0
+        self.max_duration = 0
+        self.long_activities = 0
+
+        self.confidence_sum = 0.0
+        self.high_confidence = 0
+
+    @classmethod
+    def from_sessions(cls, sessions: Iterable[Dict[str, Any]]) -> 'ActivityAggregate':
+        aggregate = cls()
+        for session in sessions:
+            aggregate.add_session(session)
+        return aggregate
+
+    @classmethod
+    def from_activities(cls, activities: Iterable[Dict[str, Any]]) -> 'ActivityAggregate':
+        aggregate = cls()
+        for activity in activities:
+            aggregate.add_activity(activity)
+        return aggregate
+
+    def add_session(self, session: Dict[str, Any]):
+        self.sessions += 1
+        self.total_calories += session.get('total_calories', 0)
+        self.productivity_series.append(session.get('avg_productivity', 0))
+
+        for activity in session.get('activities', []):
+            self.add_activity(activity)
+
+    def add_activity(self, activity: Dict[str, Any]):
+        self.activities += 1
+
+        duration = activity.get('duration', 0)
+        self.total_minutes += duration
+        self.max_duration = max(self.max_duration, duration)
+        if duration > LONG_ACTIVITY_MINUTES:
+            self.long_activities += 1
+
+        category = self.categories.setdefault(activity.get('category', 'other'), {'count': 0, 'total_time': 0})
+        category['count'] += 1
+        category['total_time'] += duration
+
+        subcategory = activity.get('subcategory')
+        if subcategory:
+            self.subcategories[subcategory] = self.subcategories.get(subcategory, 0) + 1
+
+        mood = activity.get('mood', 'neutral')
+        self.moods[mood] = self.moods.get(mood, 0) + 1
+        intensity = activity.get('intensity', 'medium')
+        self.intensities[intensity] = self.intensities.get(intensity, 0) + 1
+
+        with_others = activity.get('context', {}).get('with_others')
+        if with_others:
+            self.social['social'] += 1
+        elif with_others is False:
+            self.social['solo'] += 1
+
+        self.activity_productivity_sum += activity.get('productivity_score', 5)
+
+        confidence = activity.get('confidence', 0)
+        self.confidence_sum += confidence
+        if confidence > 0.7:
+            self.high_confidence += 1
+
+    def category_count(self, category: str) -> int:
+        return self.categories.get(category, {}).get('count', 0)
+
+    @property
+    def most_common_category(self) -> Optional[str]:
+        if not self.categories:
+            return None
+        return max(self.categories, key=lambda c: self.categories[c]['count'])
+
+    @property
+    def avg_productivity(self) -> float:
+        """Mean of the per-session averages"""
+        return sum(self.productivity_series) / len(self.productivity_series) if self.productivity_series else 0
+
+    @property
+    def avg_activity_productivity(self) -> float:
+        return self.activity_productivity_sum / self.activities if self.activities else 0
+
+    @property
+    def avg_duration(self) -> float:
+        return self.total_minutes / self.activities if self.activities else 0
+
+    @property
+    def avg_confidence(self) -> float:
+        return self.confidence_sum / self.activities if self.activities else 0
+
+    def summary(self) -> Dict[str, Any]:
+        """Same shape as Memory.get_weekly_summary()"""
+        return {
+            'total_activities': self.activities,
+            'total_calories': self.total_calories,
+            'avg_productivity': round(self.avg_productivity, 1) if self.sessions else 0
+        }
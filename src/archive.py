@@ -0,0 +1,60 @@
+import gzip
+import io
+import json
+import os
+from typing import List, Dict, Any, Iterator
+
+try:
+    import zstandard
+except ImportError:  # zstd archives are optional
+    zstandard = None
+
+# Fields the Planner derives from the activity text; they're only useful while
+# a session is fresh and can be recomputed by re-parsing 'text'
+DERIVED_ACTIVITY_FIELDS = ('parsed_elements', 'is_first', 'is_last')
+
+ARCHIVE_EXTENSIONS = {'gzip': '.jsonl.gz', 'zstd': '.jsonl.zst'}
+
+def strip_session(session: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of a session without recomputable per-activity fields"""
+    return {
+        **session,
+        'activities': [
+            {k: v for k, v in activity.items() if k not in DERIVED_ACTIVITY_FIELDS}
+            for activity in session.get('activities', [])
+        ]
+    }
+
+def write_archive(path: str, sessions: List[Dict[str, Any]], codec: str = 'gzip'):
+    """Write sessions as compact JSON lines into a new compressed archive, atomically"""
+    if os.path.exists(path):
+        # Archives are immutable; replacing one would lose the sessions in it
+        raise FileExistsError(f"archive {path} already exists")
+    if codec == 'zstd' and zstandard is None:
+        raise ImportError("zstd archives require the zstandard package")
+
+    payload = "".join(json.dumps(session, separators=(',', ':')) + "\n" for session in sessions).encode('utf-8')
+    tmp_path = path + ".tmp"
+
+    with open(tmp_path, 'wb') as f:
+        if codec == 'zstd':
+            f.write(zstandard.ZstdCompressor(level=10).compress(payload))
+        else:
+            with gzip.GzipFile(fileobj=f, mode='wb', compresslevel=9, mtime=0) as gz:
+                gz.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+
+    os.replace(tmp_path, path)
+
+def iter_archive_lines(path: str) -> Iterator[bytes]:
+    """Stream the JSON lines of an archive without decompressing it all at once"""
+    if path.endswith(ARCHIVE_EXTENSIONS['zstd']):
+        if zstandard is None:
+            raise ImportError("reading zstd archives requires the zstandard package")
+        with open(path, 'rb') as f:
+            reader = io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(f))
+            yield from reader
+    else:
+        with gzip.open(path, 'rb') as f:
+            yield from f
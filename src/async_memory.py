@@ -0,0 +1,91 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, date
+from typing import List, Dict, Any, Optional
+
+from .memory import Memory
+
+class AsyncMemory:
+    """Awaitable facade over Memory for asyncio servers.
+
+    Every call runs on dedicated I/O threads instead of the event loop: writes
+    on a single writer thread, so they commit in the order they were awaited,
+    and reads on a small pool. At most max_pending writes may be queued;
+    further store_session() calls wait for room, which pushes back on callers
+    instead of letting the queue grow without bound.
+
+    With a write-behind Memory a write only enqueues the session, so it
+    releases its slot almost at once and the slots rarely fill. Back-pressure
+    then comes from the Memory's own max_pending: once that many sessions are
+    queued, store_session flushes synchronously on the writer thread, and
+    later writes wait behind it for slots here.
+    """
+
+    def __init__(self, memory: Optional[Memory] = None, max_pending: int = 1024, read_workers: int = 4, **memory_kwargs):
+        self.memory = memory if memory is not None else Memory(**memory_kwargs)
+        self.max_pending = max_pending
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="memory-writer")
+        self._readers = ThreadPoolExecutor(max_workers=read_workers, thread_name_prefix="memory-reader")
+        self._write_slots = asyncio.Semaphore(max_pending)
+        self._pending_writes = 0
+
+    @property
+    def pending_writes(self) -> int:
+        """Writes accepted but not yet committed"""
+        return self._pending_writes
+
+    async def _run(self, pool: ThreadPoolExecutor, fn, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(pool, functools.partial(fn, *args, **kwargs))
+
+    async def store_session(self, activities: List[Dict[str, Any]], timestamp: Optional[datetime] = None):
+        """Store a session of activities, waiting for queue room when max_pending writes are in flight"""
+        async with self._write_slots:
+            self._pending_writes += 1
+            try:
+                await self._run(self._writer, self.memory.store_session, activities, timestamp)
+            finally:
+                self._pending_writes -= 1
+
+    async def import_sessions(self, sessions: List[Dict[str, Any]], batch_size: int = 5000) -> int:
+        async with self._write_slots:
+            return await self._run(self._writer, self.memory.import_sessions, sessions, batch_size)
+
+    async def flush(self):
+        await self._run(self._writer, self.memory.flush)
+
+    async def query(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Sessions dated within [start, end], oldest first"""
+        return await self._run(self._readers, self.memory.get_sessions, start, end)
+
+    async def get_streak_info(self) -> Dict[str, Any]:
+        return await self._run(self._readers, self.memory.get_streak_info)
+
+    async def get_daily_rollups(self, start: Optional[date] = None, end: Optional[date] = None) -> Dict[str, Dict[str, Any]]:
+        return await self._run(self._readers, self.memory.get_daily_rollups, start, end)
+
+    async def get_weekly_data(self) -> List[Dict[str, Any]]:
+        return await self._run(self._readers, self.memory.get_weekly_data)
+
+    async def get_recent_activities(self, days: int = 7) -> List[Dict[str, Any]]:
+        return await self._run(self._readers, self.memory.get_recent_activities, days)
+
+    async def get_weekly_summary(self) -> Dict[str, Any]:
+        return await self._run(self._readers, self.memory.get_weekly_summary)
+
+    async def close(self):
+        """Let queued writes finish, flush write-behind sessions and stop the I/O threads"""
+        await self._run(self._writer, self.memory.close)
+        # Joining the threads waits out in-flight reads, so keep it off the event loop
+        await asyncio.get_running_loop().run_in_executor(None, self._shutdown_pools)
+
+    def _shutdown_pools(self):
+        self._writer.shutdown(wait=True)
+        self._readers.shutdown(wait=True)
+
+    async def __aenter__(self) -> 'AsyncMemory':
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
@@ -0,0 +1,113 @@
+from datetime import date, timedelta
+from typing import List, Dict, Any, Optional
+
+try:
+    import numpy as np
+except ImportError:  # downsampling needs numpy; bucketing works without it
+    np = None
+
+# Most points any one chart series is allowed to ship to the browser
+POINT_BUDGET = 400
+
+# Coarsest-last bucket sizes for timelines, in days
+BUCKETS = [('day', 1), ('week', 7), ('month', 30), ('quarter', 91)]
+
+def lttb(x, y, threshold: int) -> List[int]:
+    """Indices of the points kept by Largest-Triangle-Three-Buckets downsampling.
+
+    Keeps the first and last point and, from each of threshold - 2 equal
+    buckets in between, the point forming the largest triangle with the
+    previously kept point and the next bucket's average, which preserves
+    peaks and troughs far better than striding.
+    """
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return list(range(n))
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+
+    kept = [0]
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        next_lo, next_hi = edges[i + 1], edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[next_lo:next_hi].mean()
+        avg_y = y[next_lo:next_hi].mean()
+
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = int(lo + np.argmax(area))
+        kept.append(a)
+
+    kept.append(n - 1)
+    return kept
+
+def downsample_series(series: Dict[str, List[Any]], x_key: str = 'date', shape_key: Optional[str] = None,
+                      max_points: int = POINT_BUDGET) -> Dict[str, List[Any]]:
+    """Cut a dict of parallel columns down to max_points rows with LTTB on one column.
+
+    All columns keep the same rows, so multi-line charts stay aligned; gaps
+    (None) in the shape column are bridged by carrying the last value forward.
+    """
+    rows = len(series[x_key])
+    if rows <= max_points or np is None:
+        return series
+
+    shape_key = shape_key or next(key for key in series if key != x_key)
+    values = np.array([np.nan if v is None else v for v in series[shape_key]], dtype=float)
+    # Carry values forward (then backward for a leading gap) so the triangles are defined
+    valid = ~np.isnan(values)
+    if not valid.any():
+        values = np.zeros(rows)
+    else:
+        last = np.maximum.accumulate(np.where(valid, np.arange(rows), 0))
+        values = values[last]
+        values[:np.argmax(valid)] = values[np.argmax(valid)]
+
+    kept = lttb(np.arange(rows), values, max_points)
+    return {key: [column[i] for i in kept] for key, column in series.items()}
+
+def bucket_rollups(rollups: Dict[str, Dict[str, Any]], max_points: int = POINT_BUDGET,
+                   end: Optional[date] = None) -> Dict[str, Any]:
+    """Timeline columns from daily rollups, in the finest buckets that fit the point budget.
+
+    Sums sessions, activities, minutes and calories per bucket; productivity
+    is the activity-weighted mean. Buckets are aligned to the first day.
+    """
+    if not rollups:
+        return {'bucket': 'day', 'date': [], 'sessions': [], 'activities': [], 'minutes': [], 'calories': [],
+                'productivity': []}
+
+    start = date.fromisoformat(min(rollups))
+    end = end or date.fromisoformat(max(rollups))
+    span = (end - start).days + 1
+    name, size = next(((name, size) for name, size in BUCKETS if -(-span // size) <= max_points), BUCKETS[-1])
+    count = -(-span // size)
+
+    totals = {key: [0] * count for key in ('sessions', 'activities', 'minutes', 'calories', 'productivity_sum')}
+    for day, rollup in rollups.items():
+        i = (date.fromisoformat(day) - start).days // size
+        if 0 <= i < count:
+            for key in totals:
+                totals[key][i] += rollup.get(key, 0)
+
+    return {
+        'bucket': name,
+        'date': [(start + timedelta(days=i * size)).isoformat() for i in range(count)],
+        'sessions': totals['sessions'],
+        'activities': totals['activities'],
+        'minutes': totals['minutes'],
+        'calories': totals['calories'],
+        'productivity': [round(p / a, 2) if a else None
+                         for p, a in zip(totals['productivity_sum'], totals['activities'])]
+    }
+
+def category_columns(breakdown: Dict[str, Dict[str, Any]]) -> Dict[str, List[Any]]:
+    """Column-oriented category table (bounded by the number of categories) for bar/pie charts"""
+    categories = sorted(breakdown, key=lambda c: breakdown[c]['count'], reverse=True)
+    return {
+        'Category': [c.title() for c in categories],
+        'Count': [breakdown[c]['count'] for c in categories],
+        'Time (min)': [breakdown[c]['total_time'] for c in categories]
+    }
@@ -1,17 +1,51 @@
 
 import os
-import requests
 import json
+import threading
+import time
+from collections import OrderedDict
 from typing import List, Dict, Any
-from dotenv import load_dotenv
+from .instrumentation import instruments
+from .metrics import MOTIVATIONS, GEMINI_ERRORS, FALLBACKS
 
-# Load environment variables from .env file
-load_dotenv()
+_env_loaded = False
+
+class GeminiError(Exception):
+    """A failed Gemini call; kind is the error class counted in metrics"""
+
+    def __init__(self, kind: str, message: str):
+        super().__init__(message)
+        self.kind = kind
+
+def load_env():
+    """Load environment variables from the .env file, once per process"""
+    global _env_loaded
+    if not _env_loaded:
+        from dotenv import load_dotenv
+        load_dotenv()
+        _env_loaded = True
 
 class Executor:
-    def __init__(self):
-        self.api_key = os.getenv("GEMINI_API_KEY")
+    def __init__(self, offline: bool = False):
+        # Offline mode never calls Gemini and always uses the fallback messages
+        if not offline:
+            load_env()
+        self.api_key = None if offline else os.getenv("GEMINI_API_KEY")
         self.base_url = "https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-flash-latest:generateContent"
+
+        # Keep-alive connection pool, shareable between threads/sessions.
+        # Built on the first API call, so fallback-only runs never import requests
+        self._session = None
+        self._session_lock = threading.Lock()
+
+        # LRU of generated messages by prompt; prompts are deterministic, so
+        # identical activities don't pay for a second API round trip
+        self.message_cache_size = 512
+        self._message_cache = OrderedDict()
+        self._message_cache_lock = threading.Lock()
+
+        # How each motivation message was produced, for throughput reports
+        self.counters = {'api_calls': 0, 'cache_hits': 0, 'fallbacks': 0, 'api_errors': 0}
         
         # Calorie estimates per minute by activity category
         self.calorie_rates = {
@@ -44,13 +78,26 @@ class Executor:
             'sitting': 0.2
         }
         
+    @property
+    def session(self):
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    import requests
+                    from requests.adapters import HTTPAdapter
+                    session = requests.Session()
+                    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+                    self._session = session
+        return self._session
+
     def process_activities(self, activities: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Process each activity to generate motivation and calculate calories"""
         results = []
         
         for activity in activities:
             # Calculate calories
-            calories = self._calculate_calories(activity)
+            with instruments.timer('executor.calories'):
+                calories = self._calculate_calories(activity)
             
             # Generate motivational response
             motivation = self._generate_motivation(activity)
@@ -114,15 +161,45 @@ class Executor:
     def _generate_motivation(self, activity: Dict[str, Any]) -> str:
         """Generate motivational or sarcastic response using Gemini API"""
         if not self.api_key:
-            return self._get_fallback_motivation(activity)
+            self._count('fallbacks')
+            FALLBACKS.labels(reason='no_api_key').inc()
+            return self._fallback(activity)
         
         try:
-            prompt = self._create_prompt(activity)
-            response = self._call_gemini_api(prompt)
+            with instruments.timer('executor.prompt'):
+                prompt = self._create_prompt(activity)
+            with self._message_cache_lock:
+                if prompt in self._message_cache:
+                    self._message_cache.move_to_end(prompt)
+                    self.counters['cache_hits'] += 1
+                    MOTIVATIONS.labels(source='cache').inc()
+                    return self._message_cache[prompt]
+
+            self._count('api_calls')
+            with instruments.timer('executor.http'):
+                response = self._call_gemini_api(prompt)
+
+            with self._message_cache_lock:
+                self._message_cache[prompt] = response
+                if len(self._message_cache) > self.message_cache_size:
+                    self._message_cache.popitem(last=False)
+            MOTIVATIONS.labels(source='api').inc()
             return response
         except Exception as e:
-            print(f"API Error: {e}")
+            GEMINI_ERRORS.labels(error=getattr(e, 'kind', 'other')).inc()
+            FALLBACKS.labels(reason='api_error').inc()
+            self._count('api_errors')
+            self._count('fallbacks')
+            return self._fallback(activity)
+
+    def _fallback(self, activity: Dict[str, Any]) -> str:
+        MOTIVATIONS.labels(source='fallback').inc()
+        with instruments.timer('executor.fallback'):
             return self._get_fallback_motivation(activity)
+
+    def _count(self, name: str):
+        with self._message_cache_lock:
+            self.counters[name] += 1
     
     def _create_prompt(self, activity: Dict[str, Any]) -> str:
         """Create enhanced prompt for Gemini API with context awareness"""
@@ -199,30 +276,28 @@ Generate your roast/motivation response:
         }
         
         url = f"{self.base_url}?key={self.api_key}"
+        session = self.session
+        import requests  # already loaded by the session; for the exception types below
         
         try:
-            response = requests.post(url, headers=headers, json=data, timeout=10)
-            
-            if response.status_code == 200:
-                result = response.json()
-                if 'candidates' in result and len(result['candidates']) > 0:
-                    return result['candidates'][0]['content']['parts'][0]['text'].strip()
-                else:
-                    raise Exception("No candidates in API response")
-            elif response.status_code == 429:
-                raise Exception("API rate limit exceeded - try again later")
-            elif response.status_code == 400:
-                raise Exception("Invalid API request - check your prompt")
-            else:
-                raise Exception(f"API call failed: {response.status_code} - {response.text}")
-                
+            response = session.post(url, headers=headers, json=data, timeout=10)
         except requests.exceptions.Timeout:
-            raise Exception("API request timed out")
+            raise GeminiError('timeout', "API request timed out")
         except requests.exceptions.ConnectionError:
-            raise Exception("Failed to connect to Gemini API")
-        except Exception as e:
-            print(f"⚠️ Gemini API Error: {e}")
-            raise e
+            raise GeminiError('connection', "Failed to connect to Gemini API")
+
+        if response.status_code == 200:
+            try:
+                result = response.json()
+                return result['candidates'][0]['content']['parts'][0]['text'].strip()
+            except (ValueError, KeyError, IndexError, TypeError):
+                raise GeminiError('bad_response', "No candidates in API response")
+        elif response.status_code == 429:
+            raise GeminiError('rate_limited', "API rate limit exceeded - try again later")
+        elif response.status_code == 400:
+            raise GeminiError('bad_request', "Invalid API request - check your prompt")
+        else:
+            raise GeminiError('http_error', f"API call failed: {response.status_code} - {response.text}")
     
     def _get_fallback_motivation(self, activity: Dict[str, Any]) -> str:
         """Fallback motivational messages when API is unavailable"""
@@ -336,3 +411,16 @@ Generate your roast/motivation response:
             base_score += 1  # Consistency bonus
             
         return max(1, min(10, base_score))
+
+class StubExecutor(Executor):
+    """Executor whose Gemini calls are simulated with a fixed latency, for local load tests without an API key"""
+
+    def __init__(self, latency: float = 0.2):
+        super().__init__(offline=True)
+        # Any non-empty key sends activities down the API (and message cache) path
+        self.api_key = "stub"
+        self.latency = latency
+
+    def _call_gemini_api(self, prompt: str) -> str:
+        time.sleep(self.latency)
+        return f"RoastBot (stub) has {len(prompt)} characters of opinions about that. Do better tomorrow!"
@@ -0,0 +1,85 @@
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import Any, Optional
+from .instrumentation import instruments
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Read once at import: os.umask can only be read by setting it, which races with other threads
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+def _replacement_mode(path: str) -> int:
+    """Permissions for a file about to replace path: its current mode, or what open() would give a new file"""
+    try:
+        return os.stat(path).st_mode & 0o7777
+    except FileNotFoundError:
+        return 0o666 & ~_UMASK
+
+@contextmanager
+def file_lock(path: str, shared: bool = False):
+    """Hold an advisory lock on path + '.lock' for the duration of the block"""
+    lock_file = open(path + ".lock", 'a+')
+    try:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        else:
+            # msvcrt has no shared locks; lock the first byte exclusively
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+        yield
+    finally:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+        else:
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+        lock_file.close()
+
+def atomic_write_json(path: str, data: Any, indent: Optional[int] = None):
+    """Write JSON to a temp file and rename it over path, so readers never see a partial file"""
+    directory = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=os.path.basename(path) + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w') as f:
+            with instruments.timer('memory.write'):
+                json.dump(data, f, indent=indent, separators=None if indent else (',', ':'))
+                f.flush()
+            if hasattr(os, 'fchmod'):
+                # mkstemp creates the file 0600, and the rename would carry that over to path
+                os.fchmod(f.fileno(), _replacement_mode(path))
+            with instruments.timer('memory.fsync'):
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def read_json(path: str) -> Any:
+    with instruments.timer('memory.read'):
+        with open(path, 'rb') as f:
+            raw = f.read()
+    with instruments.timer('memory.parse'):
+        return json.loads(raw)
+
+def append_bytes(path: str, payload: bytes):
+    """Append already-framed records with a single O_APPEND write.
+
+    The kernel positions every O_APPEND write at the current end of file, so
+    concurrent writers can append without rewriting the file.
+    """
+    with instruments.timer('memory.write'):
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            written = 0
+            while written < len(payload):
+                written += os.write(fd, payload[written:])
+        finally:
+            os.close(fd)
@@ -1,17 +1,90 @@
 import json
-from datetime import datetime, timedelta
-from typing import List, Dict, Any
+import threading
+from datetime import date, datetime, timedelta
+from typing import List, Dict, Any, Optional
 from .memory import Memory
+from .aggregate import ActivityAggregate
+from . import trends
+from .chart_data import POINT_BUDGET, downsample_series, bucket_rollups
+
+# Percentile insights only kick in once a distribution has this many activities behind it
+MIN_PERCENTILE_HISTORY = 20
 
 class Insight:
     def __init__(self, memory: Memory):
         self.memory = memory
 
-    def analyze_weekly_trends(self) -> Dict[str, Any]:
+        # Results memoized against (Memory data version, day); any write or a
+        # new day invalidates all of them at once
+        self._cache = {}
+        self._cache_key = None
+        self._cache_hits = 0
+        self._cache_misses = 0
+        # One Insight may serve several threads (e.g. Streamlit sessions)
+        self._cache_lock = threading.Lock()
+
+    def _memoized(self, name: str, compute):
+        key = (self.memory.data_version(), date.today())
+        with self._cache_lock:
+            if key != self._cache_key:
+                self._cache = {}
+                self._cache_key = key
+
+            if name in self._cache:
+                self._cache_hits += 1
+                return self._cache[name]
+            self._cache_misses += 1
+
+        # Computed outside the lock, since results can nest (trends use the aggregate)
+        result = compute()
+        with self._cache_lock:
+            # Don't file a result under a version that changed while computing it
+            if self._cache_key == key:
+                self._cache[name] = result
+        return result
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for memoized insight results"""
+        lookups = self._cache_hits + self._cache_misses
+        return {
+            'hits': self._cache_hits,
+            'misses': self._cache_misses,
+            'hit_rate': round(self._cache_hits / lookups, 3) if lookups else 0.0,
+            'entries': len(self._cache)
+        }
+
+    def weekly_aggregate(self) -> ActivityAggregate:
+        """One pass over the last 7 days, shared by every weekly insight and dashboard view"""
+        return self._memoized('weekly_aggregate', lambda: ActivityAggregate.from_sessions(
+            self.memory.iter_sessions(start=datetime.now() - timedelta(days=7))))
+
+    def long_term_trends(self, days: int = 365) -> Optional[Dict[str, Any]]:
+        """Rolling 7/30/90-day means, EWMA and per-category slopes over daily rollups (None without numpy)"""
+        if trends.np is None:
+            return None
+        return self._memoized(f'long_term_trends:{days}', lambda: trends.analyze(
+            self.memory.get_daily_rollups(start=date.today() - timedelta(days=days - 1))))
+
+    def trend_chart(self, days: int = 365, max_points: int = POINT_BUDGET) -> Optional[Dict[str, List[Any]]]:
+        """Daily productivity, rolling means and EWMA, LTTB-downsampled to at most max_points rows"""
+        long_term = self.long_term_trends(days)
+        if not long_term or 'series' not in long_term:
+            return None
+        return self._memoized(f'trend_chart:{days}:{max_points}', lambda: downsample_series(
+            long_term['series'], shape_key='ewma', max_points=max_points))
+
+    def activity_timeline(self, days: Optional[int] = None, max_points: int = POINT_BUDGET) -> Dict[str, Any]:
+        """Per-bucket sessions/activities/minutes/calories/productivity from rollups, never more than max_points buckets"""
+        start = date.today() - timedelta(days=days - 1) if days else None
+        return self._memoized(f'activity_timeline:{days}:{max_points}', lambda: bucket_rollups(
+            self.memory.get_daily_rollups(start=start), max_points, end=date.today()))
+
+    def analyze_weekly_trends(self, aggregate: Optional[ActivityAggregate] = None) -> Dict[str, Any]:
         """Analyze weekly trends and generate insights"""
-        weekly_data = self.memory.get_weekly_data()
+        if aggregate is None:
+            return self._memoized('weekly_trends', lambda: self.analyze_weekly_trends(self.weekly_aggregate()))
 
-        if not weekly_data:
+        if not aggregate.sessions:
             return {
                 'trend': 'no data',
                 'trend_strength': 'none',
@@ -20,10 +93,15 @@ class Insight:
                 'category_analysis': {'breakdown': {}}
             }
 
-        # Calculate trends
-        productivity_scores = [session.get('avg_productivity', 0) for session in weekly_data]
+        # Calculate trends: the 7-day against the 30-day rolling mean when
+        # there's enough history, otherwise the last two sessions
+        long_term = self.long_term_trends()
+        productivity_scores = aggregate.productivity_series
 
-        if len(productivity_scores) >= 2:
+        if long_term and long_term['trend'] != 'unknown':
+            trend = long_term['trend']
+            trend_strength = long_term['trend_strength']
+        elif len(productivity_scores) >= 2:
             if productivity_scores[-1] > productivity_scores[-2]:
                 trend = 'improving'
                 trend_strength = 'strong' if productivity_scores[-1] - productivity_scores[-2] > 2 else 'moderate'
@@ -38,7 +116,7 @@ class Insight:
             trend_strength = 'insufficient data'
 
         # Generate roast summary
-        avg_productivity = sum(productivity_scores) / len(productivity_scores) if productivity_scores else 0
+        avg_productivity = aggregate.avg_productivity
 
         if avg_productivity >= 7:
             roast_summary = "You're actually doing well. Suspicious. Are you cheating?"
@@ -47,36 +125,23 @@ class Insight:
         else:
             roast_summary = "Your productivity is as consistent as your motivation - barely there."
 
-        # Category analysis
-        category_breakdown = self._analyze_categories(weekly_data)
-
         # Generate insights
-        insights = self._generate_insights(weekly_data, trend, avg_productivity)
+        insights = self._generate_insights(aggregate, trend, avg_productivity)
+        if long_term:
+            insights.extend(self._trend_insights(long_term))
+        insights.extend(self.percentile_insights(aggregate))
+        if not insights:
+            insights.append("You exist. That's... something.")
 
         return {
             'trend': trend,
             'trend_strength': trend_strength,
             'roast_summary': roast_summary,
             'insights': insights,
-            'category_analysis': {'breakdown': category_breakdown}
+            'category_analysis': {'breakdown': aggregate.categories}
         }
 
-    def _analyze_categories(self, weekly_data: List[Dict]) -> Dict[str, Dict]:
-        """Analyze activity categories"""
-        category_stats = {}
-
-        for session in weekly_data:
-            for activity in session.get('activities', []):
-                category = activity.get('category', 'other')
-                if category not in category_stats:
-                    category_stats[category] = {'count': 0, 'total_time': 0}
-
-                category_stats[category]['count'] += 1
-                category_stats[category]['total_time'] += activity.get('duration', 0)
-
-        return category_stats
-
-    def _generate_insights(self, weekly_data: List[Dict], trend: str, avg_productivity: float) -> List[str]:
+    def _generate_insights(self, aggregate: ActivityAggregate, trend: str, avg_productivity: float) -> List[str]:
         """Generate actionable insights"""
         insights = []
 
@@ -89,41 +154,84 @@ class Insight:
             insights.append("Your productivity score suggests you excel at creative procrastination.")
 
         # Activity-specific insights
-        all_activities = []
-        for session in weekly_data:
-            all_activities.extend(session.get('activities', []))
-
-        if all_activities:
-            categories = [a.get('category') for a in all_activities]
-            most_common = max(set(categories), key=categories.count) if categories else None
+        if aggregate.activities:
+            most_common = aggregate.most_common_category
 
             if most_common == 'entertainment':
                 insights.append("You're a professional binge-watcher. Netflix should sponsor you.")
             elif most_common == 'exercise':
                 insights.append("All that exercise and you're still not perfect. Shocking!")
 
-        return insights if insights else ["You exist. That's... something."]
+        return insights
+
+    def _trend_insights(self, long_term: Dict[str, Any]) -> List[str]:
+        """Call out the categories whose daily minutes moved the most over the last month.
 
-    def suggest_improvements(self) -> List[str]:
-        """Suggest improvements based on recent activity"""
-        recent_data = self.memory.get_recent_activities(days=7)
+        Only slopes that stand out from the category's own day-to-day noise
+        count, so a random scatter of sessions doesn't read as a trend.
+        """
+        insights = []
+        slopes = long_term.get('significant_slopes', {})
+
+        rising = max(slopes, key=slopes.get, default=None)
+        if rising and slopes[rising] >= 15:
+            insights.append(f"Your {rising} time is up {slopes[rising]:.0f} min/day per week. Who are you?")
+
+        falling = min(slopes, key=slopes.get, default=None)
+        if falling and slopes[falling] <= -15:
+            insights.append(f"Your {falling} time is dropping {-slopes[falling]:.0f} min/day per week. We noticed.")
+
+        return insights
+
+    def metric_percentiles(self, category: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """All-time mean/stddev/min/max/p10..p90 of productivity, duration and calories"""
+        return {name: stats.summary() for name, stats in self.memory.get_metric_stats(category).items()}
+
+    def percentile_insights(self, aggregate: Optional[ActivityAggregate] = None) -> List[str]:
+        """Rank this week's averages within the user's all-time distributions, without rescanning history"""
+        if aggregate is None:
+            return self._memoized('percentile_insights', lambda: self.percentile_insights(self.weekly_aggregate()))
+
+        insights = []
+
+        overall = self.memory.get_metric_stats()['productivity']
+        if overall.count >= MIN_PERCENTILE_HISTORY and aggregate.activities:
+            rank = overall.percentile_rank(aggregate.avg_activity_productivity)
+            if rank <= 0.1:
+                insights.append("This week's productivity is in your bottom 10%. Even by your standards, that's low.")
+            elif rank >= 0.9:
+                insights.append("This week's productivity is in your top 10%. Screenshot it, it won't last.")
+
+        for category, stats in aggregate.categories.items():
+            history = self.memory.get_metric_stats(category).get('duration')
+            if not history or history.count < MIN_PERCENTILE_HISTORY or stats['count'] < 2:
+                continue
+
+            rank = history.percentile_rank(stats['total_time'] / stats['count'])
+            if rank <= 0.1:
+                insights.append(f"Your {category} sessions this week are in your bottom 10% for length.")
+            elif rank >= 0.9:
+                insights.append(f"Your {category} sessions this week are in your top 10% for length.")
+
+        return insights
+
+    def suggest_improvements(self, aggregate: Optional[ActivityAggregate] = None) -> List[str]:
+        """Suggest improvements based on the last 7 days of activity"""
+        if aggregate is None:
+            return self._memoized('suggestions', lambda: self.suggest_improvements(self.weekly_aggregate()))
         suggestions = []
 
-        if not recent_data:
+        if not aggregate.activities:
             return ["Start by actually doing something worth logging!"]
 
-        # Analyze recent patterns
-        categories = [activity.get('category') for activity in recent_data]
-        category_counts = {cat: categories.count(cat) for cat in set(categories)}
-
         # Suggest based on missing or low categories
-        if category_counts.get('exercise', 0) < 3:
+        if aggregate.category_count('exercise') < 3:
             suggestions.append("More exercise wouldn't kill you. Probably.")
 
-        if category_counts.get('study', 0) < 2:
+        if aggregate.category_count('study') < 2:
             suggestions.append("Learning something new might prevent brain rot.")
 
-        if category_counts.get('entertainment', 0) > 5:
+        if aggregate.category_count('entertainment') > 5:
             suggestions.append("Maybe watch less TV and do something productive? Revolutionary idea!")
 
         return suggestions if suggestions else ["You're doing fine! Keep being awesome! 🌟"]
\ No newline at end of file
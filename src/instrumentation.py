@@ -0,0 +1,134 @@
+import bisect
+import threading
+import time
+from typing import List, Dict, Any, Optional
+
+# Latency bucket upper bounds in seconds: 50µs doubling up to ~6.5s
+LATENCY_BUCKETS = tuple(0.00005 * 2 ** i for i in range(18))
+
+class Histogram:
+    """Fixed-bucket histogram with exact count, sum, min and max; quantiles interpolate within a bucket"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        # One slot per bucket plus the overflow (+Inf) bucket
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[i] += 1
+            self.count += 1
+            self.sum += value
+            self.min = value if self.min is None or value < self.min else self.min
+            self.max = value if self.max is None or value > self.max else self.max
+
+    def quantile(self, p: float) -> Optional[float]:
+        if not self.count:
+            return None
+        rank = p * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                lo = self.buckets[i - 1] if i else 0.0
+                hi = self.buckets[i] if i < len(self.buckets) else self.max
+                estimate = lo + (hi - lo) * (rank - seen) / n
+                # Never report past what was actually observed
+                return min(max(estimate, self.min), self.max)
+            seen += n
+        return self.max
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'mean': self.sum / self.count if self.count else 0.0,
+            'min': self.min,
+            'max': self.max,
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95),
+            'p99': self.quantile(0.99)
+        }
+
+class _Timer:
+    __slots__ = ('histogram', 'begin')
+
+    def __init__(self, histogram: Histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.begin = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.histogram.observe(time.perf_counter() - self.begin)
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+_NULL_TIMER = _NullTimer()
+
+class Instrumentation:
+    """Named latency histograms fed by timers placed around the pipeline's hot spots.
+
+    Off by default: a disabled timer is a shared no-op, so the timers can
+    stay in hot loops. Names in always_on (the ones exported as metrics)
+    are recorded regardless. Names are dotted, component first ('planner.split').
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.always_on = set()
+        self.histograms: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, name: str) -> Histogram:
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self.histograms.setdefault(name, Histogram())
+        return histogram
+
+    def timer(self, name: str):
+        """Context manager recording the block's wall time under name"""
+        if not self.enabled and name not in self.always_on:
+            return _NULL_TIMER
+        return _Timer(self.histogram(name))
+
+    def observe(self, name: str, seconds: float):
+        if self.enabled or name in self.always_on:
+            self.histogram(name).observe(seconds)
+
+    def reset(self):
+        with self._lock:
+            self.histograms = {}
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {name: self.histograms[name].summary() for name in sorted(self.histograms)}
+
+    def report(self) -> List[str]:
+        """Per-stage breakdown as printable lines, grouped by component"""
+        lines = [f"   {'stage':<24}{'count':>8}{'total':>11}{'mean':>10}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}"]
+        component = None
+        for name, stats in self.snapshot().items():
+            if name.split('.')[0] != component:
+                component = name.split('.')[0]
+                lines.append(f"   {component.upper()}")
+            ms = lambda seconds: f"{seconds * 1000:>8.2f}ms"
+            lines.append(f"   {'  ' + name:<24}{stats['count']:>8,}{stats['sum'] * 1000:>9.1f}ms{ms(stats['mean'])}"
+                         f"{ms(stats['p50'])}{ms(stats['p95'])}{ms(stats['p99'])}{ms(stats['max'])}")
+        return lines
+
+# Process-wide instance every module records into
+instruments = Instrumentation()
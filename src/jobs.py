@@ -0,0 +1,95 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional
+
+class Job:
+    """A background pipeline run whose results can be read while it's still producing them"""
+
+    def __init__(self, owner: Optional[str] = None):
+        self.id = uuid.uuid4().hex
+        self.owner = owner
+        self.status = 'queued'
+        self.total: Optional[int] = None
+        self.error: Optional[str] = None
+        self.created = time.time()
+        self.finished_at: Optional[float] = None
+        self._results: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ('done', 'failed')
+
+    def add_result(self, result: Dict[str, Any]):
+        with self._lock:
+            self._results.append(result)
+
+    def results(self) -> List[Dict[str, Any]]:
+        """Snapshot of the results produced so far"""
+        with self._lock:
+            return self._results[:]
+
+class JobRunner:
+    """Bounded thread pool for pipeline jobs, with a registry to poll them by id.
+
+    The pool is shared by every caller, so max_workers caps the threads a
+    burst of submissions can tie up, and each owner may only have
+    max_active_per_owner jobs in flight.
+    """
+
+    def __init__(self, max_workers: int = 4, max_active_per_owner: int = 1, keep: int = 256):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="motivagent-job")
+        self._jobs: 'OrderedDict[str, Job]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.max_active_per_owner = max_active_per_owner
+        self.keep = keep
+
+    def submit(self, fn, *args, owner: Optional[str] = None) -> Job:
+        """Run fn(job, *args) in the background; fn reports progress through the job"""
+        with self._lock:
+            active = sum(1 for job in self._jobs.values() if job.owner == owner and not job.finished)
+            if owner is not None and active >= self.max_active_per_owner:
+                raise RuntimeError(f"{owner} already has {active} job(s) running")
+
+            job = Job(owner)
+            self._jobs[job.id] = job
+            # Forget the oldest finished jobs once the registry is full
+            while len(self._jobs) > self.keep:
+                oldest = next((job_id for job_id, old in self._jobs.items() if old.finished), None)
+                if oldest is None:
+                    break
+                del self._jobs[oldest]
+
+        self._pool.submit(self._run, job, fn, args)
+        return job
+
+    def _run(self, job: Job, fn, args):
+        job.status = 'running'
+        try:
+            fn(job, *args)
+            job.status = 'done'
+        except Exception as e:
+            job.error = str(e)
+            job.status = 'failed'
+        finally:
+            job.finished_at = time.time()
+
+    def get(self, job_id: Optional[str]) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def shutdown(self):
+        self._pool.shutdown(wait=True)
+
+def run_reflection_job(job: Job, planner, executor, memory, user_input: str):
+    """Parse, score and store one reflection, publishing each scored activity as soon as it's ready"""
+    activities = planner.parse_input(user_input)
+    job.total = len(activities)
+
+    for activity in activities:
+        job.add_result(executor.process_activities([activity])[0])
+
+    memory.store_session(job.results())
@@ -1,110 +1,788 @@
-import json
+import atexit
+import copy
+import hashlib
 import os
-from datetime import datetime, timedelta
-from typing import List, Dict, Any
+import re
+import signal
+import threading
+import weakref
+from datetime import date, datetime, timedelta
+from typing import List, Dict, Any, Iterable, Iterator, Optional
+from .fileio import file_lock, atomic_write_json, read_json, append_bytes
+from .instrumentation import instruments
+from .metrics import registry, ACTIVITIES_PER_SESSION, SESSIONS_WRITTEN
+from .stats_view import StatsView
+from .online_stats import RunningStats
+from .archive import ARCHIVE_EXTENSIONS, strip_session, write_archive, iter_archive_lines
+from .serializers import JsonCodec, get_codec, codec_for_file
+
+# Write-behind instances that still need flushing at interpreter exit
+_write_behind_instances = weakref.WeakSet()
+
+# Longest wait between retries of a failing write-behind flush, in seconds
+MAX_FLUSH_BACKOFF = 30.0
+_previous_signal_handlers = {}
+
+# Bytes on disk of every log opened in this process, keyed by data dir, for
+# the log-size gauge. Measured once on open and then kept up to date by this
+# process's appends and compactions, so a scrape never walks the filesystem.
+_log_sizes: Dict[str, int] = {}
+_log_sizes_lock = threading.Lock()
+
+def _dir_size(directory: str) -> int:
+    total = 0
+    if not os.path.isdir(directory):
+        return 0
+    for entry in os.scandir(directory):
+        try:
+            if entry.is_file() and not entry.name.endswith('.lock'):
+                total += entry.stat().st_size
+        except FileNotFoundError:
+            # Compacted away while we were looking
+            continue
+    return total
+
+def _total_log_size() -> int:
+    with _log_sizes_lock:
+        return sum(_log_sizes.values())
+
+registry.gauge('motivagent_log_size_bytes',
+               "Bytes of hot shards and archives across the activity logs this process opened").set_function(_total_log_size)
+
+def _flush_all_write_behind():
+    for memory in list(_write_behind_instances):
+        memory.close()
+
+def _flush_on_signal(signum, frame):
+    # Don't flush here: the interrupted thread may hold a Memory's locks.
+    # Turning the signal into SystemExit unwinds those locks and runs the
+    # atexit flush; a handler that keeps the process alive leaves the
+    # queue to the flusher threads.
+    previous = _previous_signal_handlers.get(signum)
+    if callable(previous):
+        previous(signum, frame)
+    elif previous == signal.SIG_IGN:
+        return
+    else:
+        raise SystemExit(128 + signum)
+
+def _install_shutdown_hooks():
+    if _previous_signal_handlers or threading.current_thread() is not threading.main_thread():
+        return
+
+    atexit.register(_flush_all_write_behind)
+    for signum in (signal.SIGTERM, getattr(signal, 'SIGHUP', None)):
+        if signum is not None:
+            _previous_signal_handlers[signum] = signal.getsignal(signum)
+            signal.signal(signum, _flush_on_signal)
 
 class Memory:
-    def __init__(self):
-        self.data_dir = "data"
+    def __init__(self, user_id: Optional[str] = None, data_dir: str = "data", shard_by: str = "month",
+                 write_behind: bool = False, flush_size: int = 256, flush_interval: float = 1.0,
+                 max_pending: int = 4096, checkpoint_every: int = 100, codec: Optional[str] = None):
+        self.user_id = user_id
+        self.root_dir = data_dir
+        self.shard_by = shard_by
+        # Encoding for new shards; existing shards keep whatever they were written with
+        self.codec = get_codec(codec)
+
+        # Each user gets an independent partition, so one user's reads and
+        # writes never touch another user's files. Without a user id we keep
+        # the original single-user layout directly under data_dir.
+        if user_id is None:
+            self.data_dir = data_dir
+        else:
+            self.data_dir = os.path.join(data_dir, "users", self._partition_name(user_id))
+            if not os.path.isdir(self.data_dir):
+                os.makedirs(self.data_dir, exist_ok=True)
+                self._register_user(data_dir, user_id, self.data_dir)
+
         self.activity_log_file = os.path.join(self.data_dir, "activity_log.json")
+        self.shard_dir = os.path.join(self.data_dir, "activity_log")
+        self.archive_dir = os.path.join(self.data_dir, "archive")
+        self.manifest_file = os.path.join(self.data_dir, "manifest.json")
         self.user_stats_file = os.path.join(self.data_dir, "user_stats.json")
 
-        # Ensure data directory exists
-        os.makedirs(self.data_dir, exist_ok=True)
+        # Ensure data directories exist
+        os.makedirs(self.shard_dir, exist_ok=True)
 
         # Initialize files if they don't exist
         self._init_files()
+        with _log_sizes_lock:
+            _log_sizes[self.data_dir] = self.log_size()
+
+        # User stats are a view over the session log, checkpointed to
+        # user_stats.json every checkpoint_every sessions
+        self.checkpoint_every = checkpoint_every
+        self._view = None
+        self._view_lock = threading.RLock()
+        self._uncheckpointed = 0
+
+        # Write-behind mode queues sessions in memory and group-commits them
+        # from a background thread once flush_size or flush_interval is hit.
+        # Past max_pending queued sessions (say the flusher keeps failing),
+        # store_session() flushes in the caller's thread instead.
+        self.write_behind = write_behind
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._pending = []
+        self._writes = 0
+        self._pending_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._flush_requested = threading.Event()
+        self._closed = False
+        self._flusher = None
+
+        if write_behind:
+            _install_shutdown_hooks()
+            _write_behind_instances.add(self)
+            self._flusher = threading.Thread(target=self._flush_loop, name="memory-flusher", daemon=True)
+            self._flusher.start()
+
+    @staticmethod
+    def _partition_name(user_id: str) -> str:
+        """Filesystem-safe directory name for a user id"""
+        if not isinstance(user_id, str) or not user_id:
+            # '' would map to the users/ directory itself
+            raise ValueError(f"user id must be a non-empty string, got {user_id!r}")
+        safe = re.sub(r'[^A-Za-z0-9_.-]', '_', user_id)[:64]
+        if safe != user_id or safe.startswith('.'):
+            # Keep sanitized ids from colliding with each other
+            safe = f"{safe.lstrip('.')}-{hashlib.sha1(user_id.encode()).hexdigest()[:8]}"
+        return safe
+
+    @staticmethod
+    def _user_index_file(data_dir: str) -> str:
+        return os.path.join(data_dir, "users", "index.json")
+
+    @classmethod
+    def _register_user(cls, data_dir: str, user_id: str, user_dir: str):
+        """Add a newly created user partition to the user index"""
+        index_file = cls._user_index_file(data_dir)
+        with file_lock(index_file):
+            index = cls.list_users(data_dir)
+            index.setdefault(user_id, {
+                'dir': os.path.relpath(user_dir, data_dir),
+                'created': datetime.now().isoformat()
+            })
+            atomic_write_json(index_file, index)
+
+    @classmethod
+    def list_users(cls, data_dir: str = "data") -> Dict[str, Dict[str, Any]]:
+        """Get the index of users that have a partition under data_dir"""
+        index_file = cls._user_index_file(data_dir)
+        if not os.path.exists(index_file):
+            return {}
+
+        return read_json(index_file)
 
     def _init_files(self):
         """Initialize data files if they don't exist"""
-        if not os.path.exists(self.activity_log_file):
-            with open(self.activity_log_file, 'w') as f:
-                json.dump([], f)
-
-        if not os.path.exists(self.user_stats_file):
-            default_stats = {
-                'total_sessions': 0,
-                'current_streak': 0,
-                'longest_streak': 0,
-                'last_active_date': None,
-                'total_activities': 0,
-                'total_calories': 0
+        if not os.path.exists(self.manifest_file):
+            with file_lock(self.manifest_file):
+                # Another process may have initialized it while we waited
+                if not os.path.exists(self.manifest_file):
+                    # Older installs kept everything in one activity_log.json
+                    if os.path.exists(self.activity_log_file):
+                        self._migrate_legacy_log_locked()
+                    else:
+                        self._save_manifest({'shard_by': self.shard_by, 'shards': {}})
+
+        with file_lock(self.user_stats_file):
+            if os.path.exists(self.user_stats_file):
+                return
+
+            atomic_write_json(self.user_stats_file, StatsView().to_dict())
+
+    def _shard_key(self, date: datetime, shard_by: Optional[str] = None) -> str:
+        """Name of the shard a session timestamp belongs to"""
+        if (shard_by or self.shard_by) == 'week':
+            year, week, _ = date.isocalendar()
+            return f"{year}-W{week:02d}"
+        return date.strftime("%Y-%m")
+
+    def _load_manifest(self) -> Dict[str, Any]:
+        # Snapshots are replaced atomically, so readers need no lock
+        return read_json(self.manifest_file)
+
+    def _save_manifest(self, manifest: Dict[str, Any]):
+        atomic_write_json(self.manifest_file, manifest)
+
+    def data_version(self) -> tuple:
+        """Token that changes whenever the stored sessions may have changed.
+
+        Every append, migration and compaction atomically replaces the
+        manifest, so its inode and mtime cover writes from other processes;
+        the local write counter and queue length cover this one.
+        """
+        stat = os.stat(self.manifest_file)
+        with self._pending_lock:
+            pending = len(self._pending)
+        return (stat.st_ino, stat.st_mtime_ns, self._writes, pending)
+
+    def _append_to_shards(self, sessions: List[Dict[str, Any]]):
+        """Append sessions to their shard files and record them in the manifest"""
+        shard_by = self._load_manifest().get('shard_by', self.shard_by)
+
+        by_shard = {}
+        for session in sessions:
+            key = self._shard_key(datetime.fromisoformat(session['date']), shard_by)
+            by_shard.setdefault(key, []).append(session)
+
+        payloads = {key: b"".join(self.codec.dumps(session) for session in shard_sessions)
+                    for key, shard_sessions in by_shard.items()}
+
+        # Shard appends are single O_APPEND writes of just the new records, so
+        # the critical section stays tiny however large the history grows.
+        # Appending under the manifest lock keeps each shard's 'sorted' flag exact.
+        with file_lock(self.manifest_file):
+            manifest = self._load_manifest()
+            shards = manifest['shards']
+            # Pre-append sizes, to undo a partial group if anything fails
+            appended = {}
+            written = 0
+
+            try:
+                for key, shard_sessions in by_shard.items():
+                    entry = shards.setdefault(key, {
+                        'file': self._new_shard_file(manifest, key, self.codec.extension),
+                        'start': shard_sessions[0]['date'],
+                        'end': shard_sessions[0]['date'],
+                        'rows': 0,
+                        'sorted': True
+                    })
+
+                    dates = [s['date'] for s in shard_sessions]
+                    in_order = entry['rows'] == 0 or dates[0] >= entry['end']
+                    in_order = in_order and all(a <= b for a, b in zip(dates, dates[1:]))
+                    entry['sorted'] = entry.get('sorted', False) and in_order
+
+                    entry['start'] = min(entry['start'], *dates)
+                    entry['end'] = max(entry['end'], *dates)
+                    entry['rows'] += len(shard_sessions)
+
+                    # An existing shard keeps its original encoding
+                    payload = payloads[key]
+                    codec = codec_for_file(entry['file'], self.codec)
+                    if codec.name != self.codec.name and codec.extension != self.codec.extension:
+                        payload = b"".join(codec.dumps(session) for session in shard_sessions)
+                    path = os.path.join(self.shard_dir, entry['file'])
+                    appended[path] = os.path.getsize(path) if os.path.exists(path) else None
+                    append_bytes(path, payload)
+                    written += len(payload)
+
+                self._save_manifest(manifest)
+            except BaseException:
+                # Without the manifest update the appended records would be
+                # orphans, and a retry would write them a second time
+                for path, size in appended.items():
+                    if size is not None:
+                        os.truncate(path, size)
+                    elif os.path.exists(path):
+                        os.remove(path)
+                raise
+
+        with _log_sizes_lock:
+            _log_sizes[self.data_dir] = _log_sizes.get(self.data_dir, 0) + written
+        SESSIONS_WRITTEN.inc(len(sessions))
+        for session in sessions:
+            ACTIVITIES_PER_SESSION.observe(len(session['activities']))
+
+    def log_size(self) -> int:
+        """Bytes on disk of this log's hot shards and archives"""
+        return _dir_size(self.shard_dir) + _dir_size(self.archive_dir)
+
+    @staticmethod
+    def _new_shard_file(manifest: Dict[str, Any], key: str, extension: str = JsonCodec.extension) -> str:
+        """File name for a new hot shard, never reusing one that has been archived.
+
+        Views track progress by file name, so a late session for an archived
+        month must not land in a file with the old name.
+        """
+        archived = manifest.get('archive', {})
+        name, generation = f"{key}{extension}", 1
+        while name in archived:
+            generation += 1
+            name = f"{key}.{generation}{extension}"
+        return name
+
+    def _new_archive_file(self, archive: Dict[str, Any], stem: str, extension: str) -> str:
+        """Archive name for a hot shard that no existing archive uses.
+
+        Hot shards of different codecs can share a stem ('2024-01.jsonl' and
+        a later '2024-01.msgpack'), so the name alone isn't unique.
+        """
+        taken = {entry['file'] for entry in archive.values()}
+        name, generation = f"{stem}{extension}", 1
+        while name in taken or os.path.exists(os.path.join(self.archive_dir, name)):
+            generation += 1
+            name = f"{stem}.{generation}{extension}"
+        return name
+
+    @staticmethod
+    def _seek_to_date(f, codec, start_iso: str, size: int):
+        """Position a sorted line-framed shard at its first record dated at or after start_iso"""
+        lo, hi = 0, size
+        while lo < hi:
+            mid = (lo + hi) // 2
+
+            # Align to the first line that starts at or after mid
+            f.seek(mid - 1 if mid else 0)
+            if mid:
+                f.readline()
+            line_start = f.tell()
+            line = f.readline()
+
+            if not line.endswith(b"\n") or codec.record_date(line) >= start_iso:
+                hi = mid
+            else:
+                lo = line_start + len(line)
+
+        f.seek(lo)
+
+    def _iter_shard(self, entry: Dict[str, Any], start_iso: Optional[str], end_iso: Optional[str],
+                    limit: int) -> Iterator[Dict[str, Any]]:
+        """Stream sessions in the window from one shard, reading at most limit bytes"""
+        path = os.path.join(self.shard_dir, entry['file'])
+        if not os.path.exists(path):
+            return
+
+        codec = codec_for_file(entry['file'], self.codec)
+        is_sorted = entry.get('sorted', False)
+        with open(path, 'rb') as f:
+            # Sorted shards are binary-searched instead of scanned up to the window
+            if codec.line_framed and is_sorted and start_iso and entry['start'] < start_iso:
+                self._seek_to_date(f, codec, start_iso, limit)
+
+            for _, record in codec.iter_raw(f, limit):
+                record_date = codec.record_date(record)
+                if end_iso and record_date > end_iso:
+                    if is_sorted:
+                        break
+                    continue
+                if start_iso and record_date < start_iso:
+                    continue
+
+                with instruments.timer('memory.parse'):
+                    session = codec.loads(record)
+                yield session
+
+    def _iter_archive(self, entry: Dict[str, Any], start_iso: Optional[str],
+                      end_iso: Optional[str]) -> Iterator[Dict[str, Any]]:
+        """Stream sessions in the window from a compressed (always sorted) archive"""
+        codec = codec_for_file(JsonCodec.extension, self.codec)
+        for line in iter_archive_lines(os.path.join(self.archive_dir, entry['file'])):
+            if not line.strip():
+                continue
+
+            record_date = codec.record_date(line)
+            if end_iso and record_date > end_iso:
+                break
+            if start_iso and record_date < start_iso:
+                continue
+
+            yield codec.loads(line)
+
+    def compact(self, older_than_days: int = 90, codec: str = 'gzip') -> Dict[str, Any]:
+        """Move hot shards whose sessions are all older than the cutoff into compressed archives.
+
+        Archived sessions lose their recomputable per-activity fields but stay
+        readable through iter_sessions/get_sessions; daily rollups and stats
+        are untouched. Returns a report of what was archived and the disk saved.
+        """
+        cutoff_iso = (datetime.now() - timedelta(days=older_than_days)).isoformat()
+        os.makedirs(self.archive_dir, exist_ok=True)
+
+        # Make sure the views have folded in everything we're about to archive
+        self._refresh_view()
+
+        report = {'shards': [], 'sessions': 0, 'raw_bytes': 0, 'archived_bytes': 0}
+        with self._flush_lock, file_lock(self.manifest_file):
+            manifest = self._load_manifest()
+            archive = manifest.setdefault('archive', {})
+            removed = []
+
+            for key in sorted(manifest['shards']):
+                entry = manifest['shards'][key]
+                if entry['end'] >= cutoff_iso:
+                    continue
+
+                path = os.path.join(self.shard_dir, entry['file'])
+                shard_codec = codec_for_file(entry['file'], self.codec)
+                raw_size = os.path.getsize(path)
+                with open(path, 'rb') as f:
+                    sessions = sorted((strip_session(shard_codec.loads(record))
+                                       for _, record in shard_codec.iter_raw(f, raw_size)),
+                                      key=lambda s: s['date'])
+
+                archive_file = self._new_archive_file(archive, entry['file'][:-len(shard_codec.extension)],
+                                                      ARCHIVE_EXTENSIONS[codec])
+                write_archive(os.path.join(self.archive_dir, archive_file), sessions, codec)
+                archived_bytes = os.path.getsize(os.path.join(self.archive_dir, archive_file))
+
+                archive[entry['file']] = {
+                    'file': archive_file,
+                    'codec': codec,
+                    'start': entry['start'],
+                    'end': entry['end'],
+                    'rows': len(sessions),
+                    'hot_bytes': raw_size,
+                    'archived_bytes': archived_bytes
+                }
+                del manifest['shards'][key]
+                removed.append(path)
+
+                report['shards'].append(key)
+                report['sessions'] += len(sessions)
+                report['raw_bytes'] += raw_size
+                report['archived_bytes'] += archived_bytes
+
+            if removed:
+                self._save_manifest(manifest)
+                for path in removed:
+                    os.remove(path)
+
+        if report['shards']:
+            with _log_sizes_lock:
+                _log_sizes[self.data_dir] = self.log_size()
+
+        saved = report['raw_bytes'] - report['archived_bytes']
+        report['saved_bytes'] = saved
+        report['saved_pct'] = round(100 * saved / report['raw_bytes'], 1) if report['raw_bytes'] else 0
+        return report
+
+    def migrate_legacy_log(self, remove_legacy: bool = False, force: bool = False) -> int:
+        """Split the single-file activity log into time-partitioned shards.
+
+        Refuses (ValueError) once the log already has shards or archives,
+        since rebuilding them from the legacy file would drop everything
+        stored since. With force, the legacy sessions are appended to the
+        live log instead; sessions already in it are not deduplicated.
+        """
+        with file_lock(self.manifest_file):
+            manifest = self._load_manifest() if os.path.exists(self.manifest_file) else None
+            if not manifest or not (manifest['shards'] or manifest.get('archive')):
+                return self._migrate_legacy_log_locked(remove_legacy)
+            if not force:
+                raise ValueError(f"{self.manifest_file} already has shards or archives; "
+                                 "migrating again would replace them (use force to merge instead)")
+
+        logs = read_json(self.activity_log_file)
+        imported = self.import_sessions(sorted(logs, key=lambda s: s['date']))
+        self._retire_legacy_log(remove_legacy)
+        return imported
+
+    def _migrate_legacy_log_locked(self, remove_legacy: bool = False) -> int:
+        """Build the shards from activity_log.json; only for a log with no shards or archives yet"""
+        logs = read_json(self.activity_log_file)
+        manifest = self._load_manifest() if os.path.exists(self.manifest_file) else {}
+
+        by_shard = {}
+        for session in sorted(logs, key=lambda s: s['date']):
+            key = self._shard_key(datetime.fromisoformat(session['date']))
+            by_shard.setdefault(key, []).append(session)
+
+        shards = {}
+        for key, shard_sessions in by_shard.items():
+            # Start from a clean file in case an earlier migration died halfway
+            path = os.path.join(self.shard_dir, f"{key}{self.codec.extension}")
+            if os.path.exists(path):
+                os.remove(path)
+            append_bytes(path, b"".join(self.codec.dumps(session) for session in shard_sessions))
+            shards[key] = {
+                'file': f"{key}{self.codec.extension}",
+                'start': shard_sessions[0]['date'],
+                'end': shard_sessions[-1]['date'],
+                'rows': len(shard_sessions),
+                'sorted': True
             }
-            with open(self.user_stats_file, 'w') as f:
-                json.dump(default_stats, f)
+        manifest.update({'shard_by': self.shard_by, 'shards': shards})
+        self._save_manifest(manifest)
 
-    def store_session(self, activities: List[Dict[str, Any]]):
-        """Store a session of activities"""
-        if not activities:
-            return
+        self._retire_legacy_log(remove_legacy)
+        return len(logs)
 
-        # Load existing logs
-        with open(self.activity_log_file, 'r') as f:
-            logs = json.load(f)
+    def _retire_legacy_log(self, remove_legacy: bool):
+        if remove_legacy:
+            os.remove(self.activity_log_file)
+        else:
+            os.replace(self.activity_log_file, self.activity_log_file + ".migrated")
 
-        # Create session entry
-        session = {
-            'date': datetime.now().isoformat(),
+    @staticmethod
+    def build_session(activities: List[Dict[str, Any]], timestamp: Optional[datetime] = None) -> Dict[str, Any]:
+        """Session record for a non-empty list of activities, dated now unless timestamp is given"""
+        return {
+            'date': (timestamp or datetime.now()).isoformat(),
             'activities': activities,
             'total_calories': sum(a.get('calories_burned', 0) for a in activities),
             'avg_productivity': sum(a.get('productivity_score', 0) for a in activities) / len(activities)
         }
 
-        # Add to logs
-        logs.append(session)
-
-        # Save logs
-        with open(self.activity_log_file, 'w') as f:
-            json.dump(logs, f, indent=2)
-
-        # Update user stats
-        self._update_user_stats(activities)
+    def store_session(self, activities: List[Dict[str, Any]], timestamp: Optional[datetime] = None):
+        """Store a session of activities"""
+        if not activities:
+            return
 
-    def _update_user_stats(self, activities: List[Dict[str, Any]]):
-        """Update user statistics"""
-        with open(self.user_stats_file, 'r') as f:
-            stats = json.load(f)
+        self.store_sessions([self.build_session(activities, timestamp)])
 
-        today = datetime.now().date().isoformat()
-        last_active = stats.get('last_active_date')
+    def store_sessions(self, sessions: List[Dict[str, Any]]):
+        """Store a group of built sessions with one shard append (or one write-behind enqueue).
 
-        # Update basic stats
-        stats['total_sessions'] += 1
-        stats['total_activities'] += len(activities)
-        stats['total_calories'] += sum(a.get('calories_burned', 0) for a in activities)
+        Unlike import_sessions, stats are checkpointed on the usual
+        checkpoint_every schedule, and close() writes out the remainder.
+        """
+        if not sessions:
+            return
+        self._writes += 1
+
+        if self.write_behind and not self._closed:
+            with self._pending_lock:
+                self._pending.extend(sessions)
+                queued = len(self._pending)
+            if queued >= self.max_pending:
+                # The flusher is falling behind or failing; commit here so the
+                # queue stays bounded and a persistent error reaches the caller
+                self.flush()
+            elif queued >= self.flush_size:
+                self._flush_requested.set()
+            return
 
-        # Update streak
-        if last_active:
-            last_date = datetime.fromisoformat(last_active).date()
-            today_date = datetime.now().date()
-            days_diff = (today_date - last_date).days
-
-            if days_diff == 1:
-                # Consecutive day
-                stats['current_streak'] += 1
-            elif days_diff > 1:
-                # Streak broken
-                stats['current_streak'] = 1
-            # Same day, don't change streak
-        else:
-            # First session
-            stats['current_streak'] = 1
+        self._commit(sessions)
+
+    def _commit(self, sessions: List[Dict[str, Any]]):
+        """Durably write a group of sessions and fold them into user stats"""
+        # Append to the current shard
+        self._append_to_shards(sessions)
+        self._fold_log_tail()
+
+    def _fold_log_tail(self):
+        """Fold the new log tail into the stats view"""
+        self._refresh_view()
+
+    def import_sessions(self, sessions: Iterable[Dict[str, Any]], batch_size: int = 5000) -> int:
+        """Bulk-append already-dated sessions, e.g. a historical import; returns sessions written.
+
+        Sessions go to the shards in batch_size appends, and stats and rollups
+        are folded in once at the end instead of after every batch.
+        """
+        imported = 0
+        batch = []
+
+        # Keeps write-behind group commits from interleaving with the import
+        with self._flush_lock:
+            for session in sessions:
+                batch.append(session)
+                if len(batch) >= batch_size:
+                    self._append_to_shards(batch)
+                    imported += len(batch)
+                    batch = []
+            if batch:
+                self._append_to_shards(batch)
+                imported += len(batch)
+            self._writes += 1
+
+            self._refresh_view()
+            self.checkpoint_stats()
+
+        return imported
+
+    def _flush_loop(self):
+        delay = self.flush_interval
+        while not self._closed:
+            self._flush_requested.wait(delay)
+            self._flush_requested.clear()
+            try:
+                self.flush()
+                delay = self.flush_interval
+            except Exception as e:
+                # The queue is kept, so back off and try again rather than
+                # letting the thread die with sessions still pending
+                delay = min(max(delay, 0.1) * 2, MAX_FLUSH_BACKOFF)
+                print(f"⚠️  Write-behind flush failed, retrying in {delay:.1f}s: {e}")
+
+    def flush(self):
+        """Group-commit every queued write-behind session"""
+        with self._flush_lock:
+            with self._pending_lock:
+                sessions = self._pending[:]
+
+            if not sessions:
+                return
+
+            self._append_to_shards(sessions)
+
+            # Only drop sessions once they're on disk, so reads keep seeing them;
+            # from here on a failure must not lead to them being appended again
+            with self._pending_lock:
+                del self._pending[:len(sessions)]
+
+            self._fold_log_tail()
+
+    def close(self):
+        """Stop the background flusher and write out anything still queued"""
+        if self._closed:
+            return
 
-        # Update longest streak
-        if stats['current_streak'] > stats['longest_streak']:
-            stats['longest_streak'] = stats['current_streak']
+        self._closed = True
+        self._flush_requested.set()
+        if self._flusher is not None and self._flusher is not threading.current_thread():
+            self._flusher.join()
+        self.flush()
+        _write_behind_instances.discard(self)
+
+        if self._uncheckpointed:
+            self.checkpoint_stats()
+
+    def _pending_sessions(self) -> List[Dict[str, Any]]:
+        with self._pending_lock:
+            return self._pending[:]
+
+    def _replay_log(self, view) -> int:
+        """Fold every log record past the view's offsets into it; returns records applied.
+
+        view is anything with an 'offsets' dict and an apply(session) method.
+        """
+        manifest = self._load_manifest()
+        archive_codec = codec_for_file(JsonCodec.extension, self.codec)
+        applied = 0
+
+        # Archives are immutable: fold one in only if the view never saw its hot shard
+        for name, entry in manifest.get('archive', {}).items():
+            if view.offsets.get(name, 0) >= entry['hot_bytes']:
+                continue
+            for line in iter_archive_lines(os.path.join(self.archive_dir, entry['file'])):
+                if line.strip():
+                    view.apply(archive_codec.loads(line))
+                    applied += 1
+            view.offsets[name] = entry['hot_bytes']
+
+        for key in sorted(manifest['shards']):
+            name = manifest['shards'][key]['file']
+            path = os.path.join(self.shard_dir, name)
+            if not os.path.exists(path):
+                continue
+
+            offset = view.offsets.get(name, 0)
+            size = os.path.getsize(path)
+            if size <= offset:
+                continue
+
+            codec = codec_for_file(name, self.codec)
+            with open(path, 'rb') as f:
+                f.seek(offset)
+                for offset, record in codec.iter_raw(f, size):
+                    with instruments.timer('memory.parse'):
+                        session = codec.loads(record)
+                    view.apply(session)
+                    applied += 1
+                    view.offsets[name] = offset
+
+        return applied
+
+    def _shards_rewritten(self, offsets: Dict[str, int]) -> bool:
+        """Whether a view's offsets no longer line up with the log, so it must be rebuilt.
+
+        That happens when a shard shrank (e.g. re-migrated) or was archived
+        while the view had only folded in part of it.
+        """
+        archived = self._load_manifest().get('archive', {})
+        for name, offset in offsets.items():
+            if name in archived:
+                if offset < archived[name]['hot_bytes']:
+                    return True
+                continue
+
+            path = os.path.join(self.shard_dir, name)
+            if os.path.exists(path) and os.path.getsize(path) < offset:
+                return True
+        return False
+
+    def _refresh_view(self) -> StatsView:
+        """Bring the in-memory stats view up to date with the log"""
+        with self._view_lock:
+            if self._view is None:
+                checkpoint = read_json(self.user_stats_file)
+                # Stats files from before the view existed are rebuilt from the log
+                self._view = StatsView.from_dict(checkpoint) if StatsView.is_checkpoint(checkpoint) else StatsView()
+                self._uncheckpointed = 0
+
+            if self._shards_rewritten(self._view.offsets):
+                self._view = StatsView()
+
+            with instruments.timer('memory.replay'):
+                self._uncheckpointed += self._replay_log(self._view)
+            if self._uncheckpointed >= self.checkpoint_every:
+                self.checkpoint_stats()
+
+            return self._view
+
+    def checkpoint_stats(self, force: bool = False) -> bool:
+        """Persist the stats view so the next startup only replays the log tail.
+
+        Returns whether the checkpoint was written. force overwrites even a
+        checkpoint that claims more sessions, e.g. to repair a corrupt one.
+        """
+        with self._view_lock:
+            if self._view is None:
+                return False
+
+            with file_lock(self.user_stats_file):
+                # Don't overwrite a checkpoint another process has moved further along
+                current = read_json(self.user_stats_file)
+                if (not force and StatsView.is_checkpoint(current)
+                        and current['total_sessions'] > self._view.total_sessions):
+                    return False
+                atomic_write_json(self.user_stats_file, self._view.to_dict())
+
+            self._uncheckpointed = 0
+            return True
+
+    def rebuild_stats(self) -> StatsView:
+        """Recompute user stats from scratch by replaying the whole log"""
+        view = StatsView()
+        self._replay_log(view)
+        return view
+
+    def _current_view(self) -> StatsView:
+        """Stats view including sessions still waiting in the write-behind queue"""
+        # Holding the flush lock keeps a group commit from being counted twice
+        with self._flush_lock:
+            view = self._refresh_view()
+
+            pending = self._pending_sessions()
+            if pending:
+                view = view.copy()
+                for session in pending:
+                    view.apply(session)
+
+        return view
+
+    def get_daily_rollups(self, start: Optional[date] = None, end: Optional[date] = None) -> Dict[str, Dict[str, Any]]:
+        """Get per-day rollups (sessions, activities, calories, minutes, productivity, categories) keyed by ISO date"""
+        if isinstance(start, datetime):
+            start = start.date()
+        if isinstance(end, datetime):
+            end = end.date()
+
+        start_iso = start.isoformat() if start else None
+        end_iso = end.isoformat() if end else None
+        daily = self._current_view().daily
 
-        stats['last_active_date'] = today
+        return {
+            day: daily[day] for day in sorted(daily)
+            if (not start_iso or day >= start_iso) and (not end_iso or day <= end_iso)
+        }
 
-        # Save stats
-        with open(self.user_stats_file, 'w') as f:
-            json.dump(stats, f, indent=2)
+    def get_metric_stats(self, category: Optional[str] = None) -> Dict[str, RunningStats]:
+        """Streaming productivity/duration/calories stats over all history, overall or for one category"""
+        view = self._current_view()
+        metrics = view.metrics if category is None else view.category_metrics.get(category, {})
+        return copy.deepcopy(metrics)
 
     def get_streak_info(self) -> Dict[str, Any]:
         """Get current streak information"""
-        with open(self.user_stats_file, 'r') as f:
-            stats = json.load(f)
-
+        stats = self._current_view().to_dict()
         today = datetime.now().date()
         last_active = stats.get('last_active_date')
 
@@ -127,50 +805,96 @@ class Memory:
             'is_streak_broken': is_streak_broken
         }
 
+    def iter_sessions(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> Iterator[Dict[str, Any]]:
+        """Yield sessions in [start, end] one at a time, in shard order.
+
+        Only shards overlapping the window are opened, sorted shards are
+        binary-searched to the window's lower bound and reading stops at its
+        upper bound, so memory stays flat however long the history is.
+        """
+        start_iso = start.isoformat() if start else None
+        end_iso = end.isoformat() if end else None
+
+        # Pin the on-disk extent and the write-behind queue together, so a
+        # group commit during iteration can't make a session appear twice
+        with self._flush_lock:
+            manifest = self._load_manifest()
+            extents = []
+
+            # Cold (archived) and hot shards together, in time order
+            entries = [(entry, 'archive') for entry in manifest.get('archive', {}).values()]
+            entries += [(entry, 'hot') for entry in manifest['shards'].values()]
+            for entry, tier in sorted(entries, key=lambda e: e[0]['start']):
+                # Skip shards entirely outside the window without opening them
+                if start_iso and entry['end'] < start_iso:
+                    continue
+                if end_iso and entry['start'] > end_iso:
+                    continue
+
+                if tier == 'archive':
+                    extents.append((entry, None))
+                    continue
+
+                path = os.path.join(self.shard_dir, entry['file'])
+                if os.path.exists(path):
+                    extents.append((entry, os.path.getsize(path)))
+            pending = self._pending_sessions()
+
+        for entry, limit in extents:
+            if limit is None:
+                yield from self._iter_archive(entry, start_iso, end_iso)
+            else:
+                yield from self._iter_shard(entry, start_iso, end_iso, limit)
+
+        # Unflushed write-behind sessions are always newer than what's on disk
+        for session in pending:
+            if start_iso and session['date'] < start_iso:
+                continue
+            if end_iso and session['date'] > end_iso:
+                continue
+            yield session
+
+    def get_sessions(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Get sessions in [start, end], opening only the shards that overlap the window"""
+        return list(self.iter_sessions(start, end))
+
     def get_weekly_data(self) -> List[Dict[str, Any]]:
         """Get data from the last 7 days"""
-        with open(self.activity_log_file, 'r') as f:
-            logs = json.load(f)
-
         week_ago = datetime.now() - timedelta(days=7)
-        weekly_logs = []
-
-        for log in logs:
-            log_date = datetime.fromisoformat(log['date'])
-            if log_date >= week_ago:
-                weekly_logs.append(log)
-
-        return weekly_logs
+        return self.get_sessions(start=week_ago)
 
     def get_recent_activities(self, days: int = 7) -> List[Dict[str, Any]]:
         """Get recent activities"""
-        weekly_data = self.get_weekly_data()
         activities = []
 
-        for session in weekly_data:
+        for session in self.iter_sessions(start=datetime.now() - timedelta(days=days)):
             activities.extend(session.get('activities', []))
 
         return activities
 
     def get_weekly_summary(self) -> Dict[str, Any]:
         """Get weekly summary statistics"""
-        weekly_data = self.get_weekly_data()
-
-        if not weekly_data:
+        sessions = 0
+        total_activities = 0
+        total_calories = 0
+        productivity_sum = 0
+
+        # Single streaming pass; the week is never materialized as a list
+        for session in self.iter_sessions(start=datetime.now() - timedelta(days=7)):
+            sessions += 1
+            total_activities += len(session.get('activities', []))
+            total_calories += session.get('total_calories', 0)
+            productivity_sum += session.get('avg_productivity', 0)
+
+        if not sessions:
             return {
                 'total_activities': 0,
                 'total_calories': 0,
                 'avg_productivity': 0
             }
 
-        total_activities = sum(len(session.get('activities', [])) for session in weekly_data)
-        total_calories = sum(session.get('total_calories', 0) for session in weekly_data)
-
-        productivities = [session.get('avg_productivity', 0) for session in weekly_data]
-        avg_productivity = sum(productivities) / len(productivities) if productivities else 0
-
         return {
             'total_activities': total_activities,
             'total_calories': total_calories,
-            'avg_productivity': round(avg_productivity, 1)
-        }
\ No newline at end of file
+            'avg_productivity': round(productivity_sum / sessions, 1)
+        }
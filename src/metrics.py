@@ -0,0 +1,244 @@
+import math
+import os
+import threading
+from typing import List, Dict, Any, Tuple
+
+from .instrumentation import Histogram, LATENCY_BUCKETS, instruments
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Instrumentation stages that are always timed and exported under their own
+# metric name; any other stage is exported as motivagent_stage_duration_seconds
+# while profiling is on
+STAGE_METRICS = {
+    'planner.parse': ('motivagent_parse_duration_seconds', "Time to parse one reflection into activities"),
+    'executor.http': ('motivagent_gemini_request_duration_seconds', "Gemini API round-trip time"),
+    'memory.read': ('motivagent_memory_read_duration_seconds', "Time to read a Memory file"),
+    'memory.write': ('motivagent_memory_write_duration_seconds', "Time to write or append to a Memory file"),
+    'memory.fsync': ('motivagent_memory_fsync_duration_seconds', "Time to fsync a Memory file"),
+}
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + '}'
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+class _Metric:
+    kind = 'untyped'
+
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def _samples(self) -> List[Tuple[str, Dict[str, str], float]]:
+        samples = []
+        for key, child in list(self._children.items()):
+            samples.extend(self._child_samples(dict(zip(self.labelnames, key)), child))
+        return samples
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        lines += [f"{name}{_format_labels(labels)} {_format_value(value)}" for name, labels, value in self._samples()]
+        return lines
+
+class _Value:
+    __slots__ = ('value', '_lock')
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1):
+        self.inc(-amount)
+
+    def set(self, value: float):
+        self.value = value
+
+class Counter(_Metric):
+    """Monotonic count, optionally split by labels"""
+
+    kind = 'counter'
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount: float = 1):
+        self.labels().inc(amount)
+
+    def value(self, **labels) -> float:
+        return self.labels(**labels).value
+
+    def _child_samples(self, labels, child):
+        return [(self.name, labels, child.value)]
+
+class Gauge(_Metric):
+    """Value that can go up and down, or be computed at scrape time with set_function()"""
+
+    kind = 'gauge'
+
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...] = ()):
+        super().__init__(name, help, labelnames)
+        self._function = None
+
+    def _new_child(self):
+        return _Value()
+
+    def set(self, value: float):
+        self.labels().set(value)
+
+    def set_function(self, function):
+        self._function = function
+
+    def _samples(self):
+        if self._function is not None:
+            return [(self.name, {}, float(self._function()))]
+        return super()._samples()
+
+    def _child_samples(self, labels, child):
+        return [(self.name, labels, child.value)]
+
+class HistogramMetric(_Metric):
+    """Bucketed distribution, rendered as cumulative _bucket/_sum/_count series"""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...] = (), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(buckets)
+
+    def _new_child(self):
+        return Histogram(self.buckets)
+
+    def observe(self, value: float):
+        self.labels().observe(value)
+
+    def _child_samples(self, labels, histogram: Histogram):
+        return histogram_samples(self.name, labels, histogram)
+
+def histogram_samples(name: str, labels: Dict[str, str], histogram: Histogram):
+    samples = []
+    cumulative = 0
+    for bound, count in zip(histogram.buckets + (math.inf,), histogram.counts):
+        cumulative += count
+        samples.append((f"{name}_bucket", {**labels, 'le': _format_value(float(bound))}, cumulative))
+    samples.append((f"{name}_sum", labels, histogram.sum))
+    samples.append((f"{name}_count", labels, histogram.count))
+    return samples
+
+class _StageHistograms:
+    """Exports the instrumentation histograms, the headline stages under their own names"""
+
+    def render(self) -> List[str]:
+        lines = []
+        histograms = dict(instruments.histograms)
+        for stage, (name, help) in STAGE_METRICS.items():
+            lines += [f"# HELP {name} {help}", f"# TYPE {name} histogram"]
+            if stage in histograms:
+                lines += [f"{n}{_format_labels(l)} {_format_value(v)}"
+                          for n, l, v in histogram_samples(name, {}, histograms[stage])]
+
+        others = sorted(stage for stage in histograms if stage not in STAGE_METRICS)
+        if others:
+            name = 'motivagent_stage_duration_seconds'
+            lines += [f"# HELP {name} Time spent in each instrumented stage (main.py --profile)",
+                      f"# TYPE {name} histogram"]
+            for stage in others:
+                lines += [f"{n}{_format_labels(l)} {_format_value(v)}"
+                          for n, l, v in histogram_samples(name, {'stage': stage}, histograms[stage])]
+        return lines
+
+class Registry:
+    """Named metrics rendered together in the Prometheus text exposition format"""
+
+    def __init__(self):
+        self._metrics: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            # Re-registering returns the existing metric, so modules can declare theirs idempotently
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, help: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, help, labelnames))
+
+    def gauge(self, name: str, help: str, labelnames: Tuple[str, ...] = ()) -> Gauge:
+        return self._register(Gauge(name, help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames: Tuple[str, ...] = (), buckets=LATENCY_BUCKETS) -> HistogramMetric:
+        return self._register(HistogramMetric(name, help, labelnames, buckets))
+
+    def render(self) -> str:
+        lines = []
+        for name in sorted(self._metrics):
+            lines += self._metrics[name].render()
+        lines += _StageHistograms().render()
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: str):
+        """Atomically write the metrics for a node_exporter textfile collector (or a later look)"""
+        directory = os.path.dirname(path) or "."
+        tmp_path = os.path.join(directory, f".{os.path.basename(path)}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.render())
+        os.replace(tmp_path, path)
+
+# Process-wide registry every module declares its metrics in
+registry = Registry()
+instruments.always_on.update(STAGE_METRICS)
+
+# Metrics shared by several modules
+MOTIVATIONS = registry.counter(
+    'motivagent_motivations_total', "Motivation messages produced, by source", ('source',))
+GEMINI_ERRORS = registry.counter(
+    'motivagent_gemini_errors_total', "Failed Gemini API calls, by error class", ('error',))
+FALLBACKS = registry.counter(
+    'motivagent_fallbacks_total', "Fallback messages used instead of Gemini, by reason", ('reason',))
+ACTIVITIES_PER_SESSION = registry.histogram(
+    'motivagent_activities_per_session', "Activities in each stored session",
+    buckets=(1, 2, 3, 4, 5, 6, 8, 10, 15, 20))
+SESSIONS_WRITTEN = registry.counter(
+    'motivagent_sessions_written_total', "Sessions appended to the activity log")
+
+def _cache_hit_ratio() -> float:
+    hits = MOTIVATIONS.value(source='cache')
+    lookups = hits + MOTIVATIONS.value(source='api')
+    return hits / lookups if lookups else 0.0
+
+def _fallback_ratio() -> float:
+    fallbacks = MOTIVATIONS.value(source='fallback')
+    total = fallbacks + MOTIVATIONS.value(source='cache') + MOTIVATIONS.value(source='api')
+    return fallbacks / total if total else 0.0
+
+registry.gauge('motivagent_message_cache_hit_ratio',
+               "Share of Gemini-eligible messages served from the message cache").set_function(_cache_hit_ratio)
+registry.gauge('motivagent_fallback_ratio',
+               "Share of motivation messages that were fallbacks").set_function(_fallback_ratio)
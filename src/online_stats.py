@@ -0,0 +1,163 @@
+import bisect
+import math
+from typing import List, Dict, Any, Optional
+
+# Quantiles tracked for every metric; percentile ranks interpolate between them
+QUANTILES = (0.1, 0.25, 0.5, 0.75, 0.9)
+
+class P2Sketch:
+    """Streaming estimates of several quantiles in O(1) time and space (extended P² algorithm).
+
+    Jain & Chlamtac's P² keeps five markers per quantile; the extended form
+    shares 2m + 3 markers between m quantiles: the minimum, each quantile,
+    the midpoints between neighbours and the maximum. Every observation
+    nudges the interior markers toward their target ranks with a
+    piecewise-parabolic fit, and markers can never cross.
+    """
+
+    def __init__(self, quantiles=QUANTILES):
+        self.quantiles = tuple(quantiles)
+        bounds = (0.0,) + self.quantiles + (1.0,)
+        targets = [0.0]
+        for lo, hi in zip(bounds, bounds[1:]):
+            targets += [(lo + hi) / 2, hi]
+        self._targets = targets
+        markers = len(self._targets)
+
+        # Marker heights; until every marker has an observation, just the sorted values
+        self.heights: List[float] = []
+        self.positions = list(range(markers))
+        self.desired = [(markers - 1) * t for t in self._targets]
+
+    def add(self, x: float):
+        q = self.heights
+        markers = len(self._targets)
+        if len(q) < markers:
+            bisect.insort(q, x)
+            return
+
+        n = self.positions
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[-1]:
+            q[-1] = x
+            k = markers - 2
+        else:
+            k = bisect.bisect_right(q, x) - 1
+
+        for i in range(k + 1, markers):
+            n[i] += 1
+        desired = self.desired = [d + t for d, t in zip(self.desired, self._targets)]
+
+        for i in range(1, markers - 1):
+            d = desired[i] - n[i]
+            if -1 < d < 1:
+                continue
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                candidate = q[i] + d / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i]) +
+                    (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1]))
+                if not q[i - 1] < candidate < q[i + 1]:
+                    # Parabola overshot a neighbour; fall back to linear
+                    candidate = q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+                q[i] = candidate
+                n[i] += d
+
+    def value(self, p: float) -> Optional[float]:
+        q = self.heights
+        if not q:
+            return None
+        if len(q) < len(self._targets):
+            # Exact quantile of the few values seen so far
+            return q[min(int(p * len(q)), len(q) - 1)]
+        return q[self._targets.index(p)]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'quantiles': list(self.quantiles), 'heights': self.heights,
+                'positions': self.positions, 'desired': self.desired}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'P2Sketch':
+        sketch = cls(data['quantiles'])
+        sketch.heights = list(data['heights'])
+        sketch.positions = list(data['positions'])
+        sketch.desired = list(data['desired'])
+        return sketch
+
+class RunningStats:
+    """Count, mean, variance (Welford), min/max and P² quantiles of a stream of numbers"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self.sketch = P2Sketch(QUANTILES)
+
+    def add(self, x: float):
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+
+        self.min = x if self.min is None else min(self.min, x)
+        self.max = x if self.max is None else max(self.max, x)
+        self.sketch.add(x)
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stddev(self) -> float:
+        return math.sqrt(self.variance)
+
+    def quantile(self, p: float) -> Optional[float]:
+        return self.sketch.value(p)
+
+    def percentile_rank(self, x: float) -> Optional[float]:
+        """Approximate share (0-1) of observations at or below x, interpolated between the tracked quantiles"""
+        if not self.count:
+            return None
+
+        points = [(0.0, self.min)] + [(p, self.quantile(p)) for p in QUANTILES] + [(1.0, self.max)]
+        if x <= points[0][1]:
+            return 0.0
+        for (p_lo, v_lo), (p_hi, v_hi) in zip(points, points[1:]):
+            if x <= v_hi:
+                return p_hi if v_hi == v_lo else p_lo + (p_hi - p_lo) * (x - v_lo) / (v_hi - v_lo)
+        return 1.0
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'mean': round(self.mean, 2),
+            'stddev': round(self.stddev, 2),
+            'min': self.min,
+            'max': self.max,
+            **{f"p{int(p * 100)}": round(self.quantile(p), 2) for p in QUANTILES if self.quantile(p) is not None}
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'mean': self.mean,
+            'm2': self.m2,
+            'min': self.min,
+            'max': self.max,
+            'sketch': self.sketch.to_dict()
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'RunningStats':
+        stats = cls()
+        stats.count = data['count']
+        stats.mean = data['mean']
+        stats.m2 = data['m2']
+        stats.min = data['min']
+        stats.max = data['max']
+        stats.sketch = P2Sketch.from_dict(data['sketch'])
+        return stats
@@ -0,0 +1,217 @@
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Iterable, Iterator
+
+from .memory import Memory
+
+# Marks the end of the stream on a stage's input queue
+_DONE = object()
+
+# One Planner per parse process
+_planner = None
+
+def _init_parser():
+    global _planner
+    from .planner import Planner
+    _planner = Planner()
+
+def _parse(text: str) -> List[Dict[str, Any]]:
+    return _planner.parse_input(text)
+
+class Pipeline:
+    """Planner -> Executor -> Memory as concurrent stages joined by bounded queues.
+
+    Each stage has its own workers: parse_workers threads for the Planner
+    (handing the CPU-bound parsing to as many processes when
+    parse_processes is set), score_workers threads for the Executor, whose
+    Gemini calls are I/O-bound, and one store thread that writes whatever
+    has queued up as a single Memory.store_sessions() group of up to
+    store_batch sessions; stats checkpoint on the Memory's own schedule. Queues hold at most queue_size reflections, so a
+    slow stage blocks the ones before it instead of letting work pile up.
+
+    run() yields one result per input, in input order by default:
+    {'input', 'activities', 'timings'} or {'input', 'error'}. stop()
+    stops reading input; everything already read still drains through.
+    """
+
+    STAGES = ('parse', 'score', 'store', 'total')
+
+    def __init__(self, planner, executor, memory: Memory, parse_workers: int = 2, score_workers: int = 8,
+                 store_batch: int = 256, queue_size: int = 64, parse_processes: bool = False, store: bool = True):
+        self.planner = planner
+        self.executor = executor
+        self.memory = memory
+        self.parse_workers = parse_workers
+        self.score_workers = score_workers
+        self.store_batch = store_batch
+        self.queue_size = queue_size
+        self.parse_processes = parse_processes
+        self.store = store
+
+        self.counts = {'read': 0, 'parsed': 0, 'scored': 0, 'stored': 0, 'errors': 0, 'store_batches': 0}
+        self._counts_lock = threading.Lock()
+        self._stopping = threading.Event()
+
+    def stop(self):
+        """Stop reading input and let in-flight reflections drain"""
+        self._stopping.set()
+
+    def _count(self, name: str, n: int = 1):
+        with self._counts_lock:
+            self.counts[name] += n
+
+    def run(self, texts: Iterable[str], ordered: bool = True) -> Iterator[Dict[str, Any]]:
+        parse_q = queue.Queue(self.queue_size)
+        score_q = queue.Queue(self.queue_size)
+        store_q = queue.Queue(self.queue_size)
+        out_q = queue.Queue(self.queue_size)
+        self._stopping.clear()
+
+        pool = None
+        parse = self.planner.parse_input
+        if self.parse_processes:
+            pool = ProcessPoolExecutor(max_workers=self.parse_workers, initializer=_init_parser)
+            parse = lambda text: pool.submit(_parse, text).result()
+
+        def feed():
+            try:
+                for seq, text in enumerate(texts):
+                    if self._stopping.is_set():
+                        break
+                    parse_q.put({'seq': seq, 'input': text})
+                    self._count('read')
+            except Exception as e:
+                # A broken input stream ends the run; what was read still drains
+                print(f"❌ Pipeline input failed: {e}")
+            finally:
+                for _ in range(self.parse_workers):
+                    parse_q.put(_DONE)
+
+        threads = [threading.Thread(target=feed, name="pipeline-feed", daemon=True)]
+        threads += self._stage("parse", self.parse_workers, parse_q, score_q, self.score_workers,
+                               lambda item: self._parse_item(parse, item))
+        threads += self._stage("score", self.score_workers, score_q, store_q, 1, self._score_item)
+        threads.append(threading.Thread(target=self._store_loop, args=(store_q, out_q),
+                                        name="pipeline-store", daemon=True))
+        for thread in threads:
+            thread.start()
+
+        finished = False
+        try:
+            yield from self._collect(out_q, ordered)
+            finished = True
+        finally:
+            if not finished:
+                # The consumer stopped early: stop reading and discard what drains out
+                self.stop()
+                while out_q.get() is not _DONE:
+                    pass
+            for thread in threads:
+                thread.join()
+            if pool is not None:
+                pool.shutdown()
+
+    def _stage(self, name: str, workers: int, inbox: queue.Queue, outbox: queue.Queue, next_workers: int, work):
+        """Start workers that apply work() to each item; the last one out ends the next stage's input"""
+        remaining = [workers]
+        lock = threading.Lock()
+
+        def loop():
+            while True:
+                item = inbox.get()
+                if item is _DONE:
+                    break
+                if 'error' not in item:
+                    try:
+                        work(item)
+                    except Exception as e:
+                        item['error'] = str(e)
+                outbox.put(item)
+
+            with lock:
+                remaining[0] -= 1
+                last = remaining[0] == 0
+            if last:
+                for _ in range(next_workers):
+                    outbox.put(_DONE)
+
+        return [threading.Thread(target=loop, name=f"pipeline-{name}-{i}", daemon=True) for i in range(workers)]
+
+    def _parse_item(self, parse, item: Dict[str, Any]):
+        item['started'] = time.perf_counter()
+        if not item['input'] or not item['input'].strip():
+            raise ValueError("empty reflection")
+        item['activities'] = parse(item['input'])
+        item['parsed'] = time.perf_counter()
+        self._count('parsed')
+
+    def _score_item(self, item: Dict[str, Any]):
+        begin = time.perf_counter()
+        item['activities'] = self.executor.process_activities(item['activities'])
+        item['score_time'] = time.perf_counter() - begin
+        self._count('scored')
+
+    def _store_loop(self, inbox: queue.Queue, outbox: queue.Queue):
+        done = False
+        while not done:
+            # Block for the first item, then take whatever else is already waiting
+            batch = [inbox.get()]
+            while len(batch) < self.store_batch:
+                try:
+                    batch.append(inbox.get_nowait())
+                except queue.Empty:
+                    break
+            if batch[-1] is _DONE:
+                batch.pop()
+                done = True
+
+            begin = time.perf_counter()
+            sessions = [item for item in batch if 'error' not in item and item['activities']]
+            if self.store and sessions:
+                try:
+                    self.memory.store_sessions([Memory.build_session(item['activities']) for item in sessions])
+                    self._count('stored', len(sessions))
+                    self._count('store_batches')
+                except Exception as e:
+                    for item in sessions:
+                        item['error'] = f"store failed: {e}"
+            stored = time.perf_counter()
+
+            for item in batch:
+                if 'error' not in item:
+                    item['timings'] = {
+                        'parse': item['parsed'] - item['started'],
+                        'score': item['score_time'],
+                        'store': stored - begin,
+                        # Includes time spent waiting in queues
+                        'total': stored - item['started']
+                    }
+                outbox.put(item)
+        outbox.put(_DONE)
+
+    def _collect(self, out_q: queue.Queue, ordered: bool) -> Iterator[Dict[str, Any]]:
+        # Out-of-order results wait here; bounded by what can be in flight at once
+        waiting = {}
+        next_seq = 0
+        while True:
+            item = out_q.get()
+            if item is _DONE:
+                break
+            if not ordered:
+                yield self._result(item)
+                continue
+            waiting[item['seq']] = item
+            while next_seq in waiting:
+                yield self._result(waiting.pop(next_seq))
+                next_seq += 1
+
+        for seq in sorted(waiting):
+            yield self._result(waiting[seq])
+
+    def _result(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        if 'error' in item:
+            self._count('errors')
+            return {'input': item['input'], 'error': item['error']}
+        return {'input': item['input'], 'activities': item['activities'], 'timings': item['timings']}
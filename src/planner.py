@@ -1,6 +1,7 @@
 import re
 from typing import List, Dict, Any
 from datetime import datetime, timedelta
+from .instrumentation import instruments
 
 class Planner:
     def __init__(self):
@@ -55,16 +56,22 @@ class Planner:
 
     def parse_input(self, user_input: str) -> List[Dict[str, Any]]:
         """Parse user input into structured activity entries with enhanced NLP"""
+        with instruments.timer('planner.parse'):
+            return self._parse_input(user_input)
+
+    def _parse_input(self, user_input: str) -> List[Dict[str, Any]]:
         activities = []
         
-        # Preprocess input
-        processed_input = self._preprocess_input(user_input)
-        
-        # Split input by common separators with improved logic
-        sentences = self._smart_split(processed_input)
+        with instruments.timer('planner.split'):
+            # Preprocess input
+            processed_input = self._preprocess_input(user_input)
+            
+            # Split input by common separators with improved logic
+            sentences = self._smart_split(processed_input)
         
         # Extract global context (affects all activities)
-        global_context = self._extract_global_context(user_input)
+        with instruments.timer('planner.context'):
+            global_context = self._extract_global_context(user_input)
         
         for sentence in sentences:
             sentence = sentence.strip()
@@ -72,11 +79,15 @@ class Planner:
                 continue
 
             # Enhanced activity classification
-            activity = self._classify_activity_advanced(sentence.lower())
-            duration = self._extract_duration_advanced(sentence)
-            intensity = self._estimate_intensity_advanced(sentence.lower(), activity['category'])
-            mood = self._detect_mood(sentence.lower())
-            context = self._extract_local_context(sentence.lower())
+            with instruments.timer('planner.classify'):
+                activity = self._classify_activity_advanced(sentence.lower())
+            with instruments.timer('planner.duration'):
+                duration = self._extract_duration_advanced(sentence)
+            with instruments.timer('planner.intensity'):
+                intensity = self._estimate_intensity_advanced(sentence.lower(), activity['category'])
+            with instruments.timer('planner.context'):
+                mood = self._detect_mood(sentence.lower())
+                context = self._extract_local_context(sentence.lower())
             
             # Merge global and local context
             merged_context = {**global_context, **context}
@@ -102,7 +113,8 @@ class Planner:
             activities.append(activity_entry)
 
         # Post-process activities for consistency
-        activities = self._post_process_activities(activities)
+        with instruments.timer('planner.post_process'):
+            activities = self._post_process_activities(activities)
         
         return activities if activities else [self._create_default_activity(user_input)]
 
@@ -0,0 +1,118 @@
+import importlib
+import json
+import os
+import re
+from typing import Any, Dict, Iterator, Tuple
+
+def _require(package: str, codec: str):
+    """Import an optional codec package when that codec is first used, not at startup"""
+    try:
+        return importlib.import_module(package)
+    except ImportError:
+        raise ImportError(f"the {codec} codec requires the {package} package") from None
+
+# Sessions are serialized with 'date' as the first key, which lets readers
+# check a JSON record's timestamp without parsing the whole line
+_LINE_DATE = re.compile(rb'^\{"date": ?"([^"]+)"')
+
+class JsonCodec:
+    """Compact line-delimited JSON (stdlib); the default shard encoding"""
+
+    name = 'json'
+    extension = '.jsonl'
+    # Records are newline-framed, so a reader can resynchronize at any byte
+    # offset; that's what lets sorted shards be binary-searched
+    line_framed = True
+
+    def dumps(self, record: Dict[str, Any]) -> bytes:
+        return json.dumps(record, separators=(',', ':')).encode('utf-8') + b"\n"
+
+    def loads(self, raw: bytes) -> Dict[str, Any]:
+        return json.loads(raw)
+
+    def iter_raw(self, f, limit: int) -> Iterator[Tuple[int, bytes]]:
+        """Yield (offset after record, undecoded record) up to limit bytes, skipping a torn tail"""
+        position = f.tell()
+        for line in f:
+            position += len(line)
+            if position > limit or not line.endswith(b"\n"):
+                return
+            if line.strip():
+                yield position, line
+
+    def record_date(self, raw: bytes) -> str:
+        match = _LINE_DATE.match(raw)
+        return match.group(1).decode() if match else self.loads(raw)['date']
+
+class OrjsonCodec(JsonCodec):
+    """Same on-disk format as JsonCodec, encoded/decoded with orjson"""
+
+    name = 'orjson'
+
+    def __init__(self):
+        self._orjson = _require('orjson', self.name)
+
+    def dumps(self, record: Dict[str, Any]) -> bytes:
+        return self._orjson.dumps(record) + b"\n"
+
+    def loads(self, raw: bytes) -> Dict[str, Any]:
+        return self._orjson.loads(raw)
+
+class MsgpackCodec:
+    """Self-delimiting MessagePack records; smallest files, no mid-file resync"""
+
+    name = 'msgpack'
+    extension = '.msgpack'
+    line_framed = False
+
+    def __init__(self):
+        self._msgpack = _require('msgpack', self.name)
+
+    def dumps(self, record: Dict[str, Any]) -> bytes:
+        return self._msgpack.packb(record, use_bin_type=True)
+
+    def loads(self, raw: Dict[str, Any]) -> Dict[str, Any]:
+        # iter_raw already yields decoded records
+        return raw
+
+    def iter_raw(self, f, limit: int) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        start = f.tell()
+        remaining = max(limit - start, 0)
+        unpacker = self._msgpack.Unpacker(raw=False)
+
+        # Feed in chunks so memory stays flat however large the shard is
+        while True:
+            chunk = f.read(min(65536, remaining)) if remaining else b""
+            remaining -= len(chunk)
+            if chunk:
+                unpacker.feed(chunk)
+
+            # Stops at the end of the fed data, including a record still being written
+            for record in unpacker:
+                yield start + unpacker.tell(), record
+
+            if not chunk:
+                return
+
+    def record_date(self, record: Dict[str, Any]) -> str:
+        return record['date']
+
+CODECS = {
+    'json': JsonCodec,
+    'orjson': OrjsonCodec,
+    'msgpack': MsgpackCodec
+}
+
+def get_codec(name: str = None):
+    """Codec by name, defaulting to $MOTIVAGENT_CODEC or compact JSON"""
+    name = name or os.getenv("MOTIVAGENT_CODEC", "json")
+    if name not in CODECS:
+        raise ValueError(f"Unknown codec '{name}' (choose from {', '.join(CODECS)})")
+    return CODECS[name]()
+
+def codec_for_file(file_name: str, preferred=None):
+    """Codec that can read a shard, judged by its extension so mixed-format histories stay readable"""
+    if file_name.endswith(MsgpackCodec.extension):
+        return preferred if isinstance(preferred, MsgpackCodec) else MsgpackCodec()
+    # Any JSON-family codec reads any .jsonl file
+    return preferred if isinstance(preferred, JsonCodec) else JsonCodec()
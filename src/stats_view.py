@@ -0,0 +1,167 @@
+import bisect
+import copy
+from datetime import date, datetime, timedelta
+from typing import List, Dict, Any, Optional
+
+from .online_stats import RunningStats
+
+# Per-activity metrics with streaming distribution stats, by activity field
+METRICS = {
+    'productivity': 'productivity_score',
+    'duration': 'duration',
+    'calories': 'calories_burned'
+}
+
+class StatsView:
+    """Materialized user stats folded incrementally from the session log.
+
+    Active days are kept as sorted runs of consecutive dates, so streaks don't
+    depend on the order sessions are applied in: replaying the log from a
+    checkpoint and recomputing it from scratch always agree.
+    """
+
+    def __init__(self):
+        self.total_sessions = 0
+        self.total_activities = 0
+        self.total_calories = 0
+        self.longest_streak = 0
+        self.runs: List[List[date]] = []
+        # Per-day rollups keyed by ISO date; these outlive archived raw sessions
+        self.daily: Dict[str, Dict[str, Any]] = {}
+        # Streaming stats per metric, overall and per category
+        self.metrics: Dict[str, RunningStats] = {name: RunningStats() for name in METRICS}
+        self.category_metrics: Dict[str, Dict[str, RunningStats]] = {}
+        # Bytes of each shard file already folded into the view
+        self.offsets: Dict[str, int] = {}
+
+    def apply(self, session: Dict[str, Any]):
+        """Fold one session into the view"""
+        activities = session.get('activities', [])
+
+        self.total_sessions += 1
+        self.total_activities += len(activities)
+        self.total_calories += sum(a.get('calories_burned', 0) for a in activities)
+
+        day = datetime.fromisoformat(session['date']).date()
+        self._add_active_day(day)
+        self._add_to_rollup(day.isoformat(), activities)
+        for activity in activities:
+            self._add_to_metrics(activity)
+
+    def _add_to_rollup(self, day: str, activities: List[Dict[str, Any]]):
+        rollup = self.daily.setdefault(day, {
+            'sessions': 0,
+            'activities': 0,
+            'calories': 0,
+            'minutes': 0,
+            'productivity_sum': 0,
+            'categories': {}
+        })
+
+        rollup['sessions'] += 1
+        rollup['activities'] += len(activities)
+        for activity in activities:
+            minutes = activity.get('duration', 0)
+            rollup['calories'] += activity.get('calories_burned', 0)
+            rollup['minutes'] += minutes
+            rollup['productivity_sum'] += activity.get('productivity_score', 0)
+
+            category = rollup['categories'].setdefault(activity.get('category', 'other'), {'count': 0, 'minutes': 0})
+            category['count'] += 1
+            category['minutes'] += minutes
+
+    def _add_to_metrics(self, activity: Dict[str, Any]):
+        category_name = activity.get('category', 'other')
+        if category_name not in self.category_metrics:
+            self.category_metrics[category_name] = {name: RunningStats() for name in METRICS}
+        category = self.category_metrics[category_name]
+
+        for name, field in METRICS.items():
+            value = activity.get(field)
+            if value is not None:
+                self.metrics[name].add(value)
+                category[name].add(value)
+
+    def _add_active_day(self, day: date):
+        runs = self.runs
+        i = bisect.bisect_right(runs, [day, date.max])
+
+        # Already inside the run that starts at or before this day
+        if i > 0 and runs[i - 1][0] <= day <= runs[i - 1][1]:
+            return
+
+        joins_left = i > 0 and runs[i - 1][1] == day - timedelta(days=1)
+        joins_right = i < len(runs) and runs[i][0] == day + timedelta(days=1)
+
+        if joins_left and joins_right:
+            runs[i - 1][1] = runs[i][1]
+            del runs[i]
+            run = runs[i - 1]
+        elif joins_left:
+            runs[i - 1][1] = day
+            run = runs[i - 1]
+        elif joins_right:
+            runs[i][0] = day
+            run = runs[i]
+        else:
+            run = [day, day]
+            runs.insert(i, run)
+
+        # Runs only ever grow, so the longest streak never has to be rescanned
+        self.longest_streak = max(self.longest_streak, (run[1] - run[0]).days + 1)
+
+    @property
+    def last_active_date(self) -> Optional[date]:
+        return self.runs[-1][1] if self.runs else None
+
+    @property
+    def current_streak(self) -> int:
+        """Length of the run ending on the last active day"""
+        if not self.runs:
+            return 0
+        return (self.runs[-1][1] - self.runs[-1][0]).days + 1
+
+    def copy(self) -> 'StatsView':
+        return copy.deepcopy(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        last_active = self.last_active_date
+        return {
+            'total_sessions': self.total_sessions,
+            'current_streak': self.current_streak,
+            'longest_streak': self.longest_streak,
+            'last_active_date': last_active.isoformat() if last_active else None,
+            'total_activities': self.total_activities,
+            'total_calories': self.total_calories,
+            'active_runs': [[start.isoformat(), end.isoformat()] for start, end in self.runs],
+            'daily_rollups': self.daily,
+            'metric_stats': {
+                'all': {name: stats.to_dict() for name, stats in self.metrics.items()},
+                'categories': {category: {name: stats.to_dict() for name, stats in metrics.items()}
+                               for category, metrics in self.category_metrics.items()}
+            },
+            'log_offsets': dict(self.offsets)
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'StatsView':
+        view = cls()
+        view.total_sessions = data.get('total_sessions', 0)
+        view.total_activities = data.get('total_activities', 0)
+        view.total_calories = data.get('total_calories', 0)
+        view.longest_streak = data.get('longest_streak', 0)
+        view.runs = [[date.fromisoformat(start), date.fromisoformat(end)]
+                     for start, end in data.get('active_runs', [])]
+        view.daily = data.get('daily_rollups', {})
+
+        metric_stats = data.get('metric_stats', {})
+        view.metrics.update({name: RunningStats.from_dict(stats) for name, stats in metric_stats.get('all', {}).items()})
+        view.category_metrics = {category: {name: RunningStats.from_dict(stats) for name, stats in metrics.items()}
+                                 for category, metrics in metric_stats.get('categories', {}).items()}
+        view.offsets = dict(data.get('log_offsets', {}))
+        return view
+
+    @staticmethod
+    def is_checkpoint(data: Dict[str, Any]) -> bool:
+        """Whether a stats file was written by the current view (older files get rebuilt from the log)"""
+        return 'log_offsets' in data and 'daily_rollups' in data and 'metric_stats' in data
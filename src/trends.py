@@ -0,0 +1,194 @@
+from datetime import date, timedelta
+from typing import List, Dict, Any, Optional
+
+try:
+    import numpy as np
+except ImportError:  # trend analytics are optional
+    np = None
+
+ROLLING_WINDOWS = (7, 30, 90)
+EWMA_SPAN = 14
+SLOPE_WINDOW = 30
+
+# A 7-day mean this far above/below the 30-day mean counts as a trend, and
+# as a strong one past STRONG_TREND_THRESHOLD
+TREND_THRESHOLD = 0.5
+STRONG_TREND_THRESHOLD = 2.0
+
+# A category slope only counts as a real change when it is at least this
+# many standard errors away from zero; day-to-day noise alone rarely gets there
+SIGNIFICANT_SLOPE_T = 3.0
+
+def daily_series(rollups: Dict[str, Dict[str, Any]], end: Optional[date] = None) -> Dict[str, Any]:
+    """Dense per-day arrays from Memory.get_daily_rollups(), one slot per calendar day.
+
+    Productivity is NaN on days without activities; counts and minutes are 0.
+    """
+    if np is None:
+        raise ImportError("trend analytics require numpy")
+
+    end = end or date.today()
+    if not rollups:
+        return {'start': end, 'days': 0, 'productivity': np.empty(0), 'minutes': np.empty(0),
+                'calories': np.empty(0), 'activities': np.empty(0), 'categories': {}}
+
+    start = date.fromisoformat(min(rollups))
+    days = max((end - start).days + 1, 1)
+
+    index = np.array([(date.fromisoformat(day) - start).days for day in rollups], dtype=np.int64)
+    keep = index < days
+    index = index[keep]
+    rows = [rollup for rollup, kept in zip(rollups.values(), keep) if kept]
+
+    def scatter(values):
+        out = np.zeros(days)
+        out[index] = values
+        return out
+
+    activities = scatter([r['activities'] for r in rows])
+    productivity_sum = scatter([r['productivity_sum'] for r in rows])
+    with np.errstate(invalid='ignore', divide='ignore'):
+        productivity = np.where(activities > 0, productivity_sum / activities, np.nan)
+
+    categories = {}
+    for i, rollup in zip(index, rows):
+        for category, stats in rollup.get('categories', {}).items():
+            categories.setdefault(category, np.zeros(days))[i] = stats['minutes']
+
+    return {
+        'start': start,
+        'days': days,
+        'productivity': productivity,
+        'minutes': scatter([r['minutes'] for r in rows]),
+        'calories': scatter([r['calories'] for r in rows]),
+        'activities': activities,
+        'categories': categories
+    }
+
+def rolling_mean(values, window: int):
+    """Trailing mean over the last window days, ignoring NaN days (NaN if the window has none)"""
+    valid = ~np.isnan(values)
+    sums = np.concatenate(([0.0], np.cumsum(np.where(valid, values, 0.0))))
+    counts = np.concatenate(([0], np.cumsum(valid)))
+
+    lo = np.maximum(np.arange(1, len(values) + 1) - window, 0)
+    hi = np.arange(1, len(values) + 1)
+    window_counts = counts[hi] - counts[lo]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(window_counts > 0, (sums[hi] - sums[lo]) / np.maximum(window_counts, 1), np.nan)
+
+def ewma(values, span: int = EWMA_SPAN):
+    """Exponentially weighted mean per day; NaN days add no weight but still decay older ones.
+
+    Evaluated in closed form as a scaled cumulative sum, in blocks short
+    enough that the decay factors can't overflow.
+    """
+    decay = 1 - 2 / (span + 1)
+    block = max(int(600 / -np.log(decay)), 1)
+    valid = ~np.isnan(values)
+    x = np.where(valid, values, 0.0)
+    w = valid.astype(float)
+
+    out = np.empty(len(values))
+    num = den = 0.0
+    for s in range(0, len(values), block):
+        k = np.arange(min(block, len(values) - s))
+        growth = decay ** -k
+        scale = decay ** k
+        nums = scale * (num * decay + np.cumsum(x[s:s + len(k)] * growth))
+        dens = scale * (den * decay + np.cumsum(w[s:s + len(k)] * growth))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            out[s:s + len(k)] = np.where(dens > 0, nums / dens, np.nan)
+        num, den = nums[-1], dens[-1]
+    return out
+
+def slopes(matrix, window: int = SLOPE_WINDOW, with_t: bool = False):
+    """Least-squares slope per row over the trailing window days (units per day), NaN days skipped.
+
+    With with_t, also returns each slope's t statistic (slope over its
+    standard error); 0 where there are too few days to tell.
+    """
+    y = matrix[:, -window:]
+    t = np.broadcast_to(np.arange(y.shape[1], dtype=float), y.shape)
+    valid = ~np.isnan(y)
+    n = valid.sum(axis=1)
+
+    t_mean = np.where(valid, t, 0).sum(axis=1) / np.maximum(n, 1)
+    y_mean = np.where(valid, y, 0).sum(axis=1) / np.maximum(n, 1)
+    dt = np.where(valid, t - t_mean[:, None], 0)
+    dy = np.where(valid, y - y_mean[:, None], 0)
+    var = (dt * dt).sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        slope = np.where((n >= 2) & (var > 0), (dt * dy).sum(axis=1) / var, 0.0)
+    if not with_t:
+        return slope
+
+    residuals = np.where(valid, dy - slope[:, None] * dt, 0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        stderr = np.sqrt((residuals * residuals).sum(axis=1) / (n - 2) / var)
+        t = np.where(stderr > 0, slope / stderr, np.where(slope != 0, np.inf, 0.0))
+    return slope, np.where((n > 2) & (var > 0), t, 0.0)
+
+def _last(values) -> Optional[float]:
+    if not len(values) or np.isnan(values[-1]):
+        return None
+    return round(float(values[-1]), 2)
+
+def analyze(rollups: Dict[str, Dict[str, Any]], end: Optional[date] = None) -> Dict[str, Any]:
+    """Rolling means, EWMA, slopes and an overall trend verdict from daily rollups"""
+    series = daily_series(rollups, end)
+    if not series['days']:
+        return {'days': 0, 'trend': 'no data', 'trend_strength': 'none'}
+
+    productivity = series['productivity']
+    rolling = {window: rolling_mean(productivity, window) for window in ROLLING_WINDOWS}
+    smoothed = ewma(productivity)
+
+    categories = sorted(series['categories'])
+    category_slopes, significant_slopes = {}, {}
+    if categories:
+        daily, t = slopes(np.vstack([series['categories'][c] for c in categories]), with_t=True)
+        category_slopes = {c: round(float(s) * 7, 1) for c, s in zip(categories, daily)}
+        significant_slopes = {c: category_slopes[c] for c, stat in zip(categories, t)
+                              if abs(stat) >= SIGNIFICANT_SLOPE_T}
+
+    # Recent week against the month it sits in
+    short, long = _last(rolling[7]), _last(rolling[30])
+    if short is None or long is None or series['days'] < 14:
+        trend, strength = 'unknown', 'insufficient data'
+    elif short - long > TREND_THRESHOLD:
+        trend, strength = 'improving', 'strong' if short - long > STRONG_TREND_THRESHOLD else 'moderate'
+    elif long - short > TREND_THRESHOLD:
+        trend, strength = 'declining', 'concerning' if long - short > STRONG_TREND_THRESHOLD else 'slight'
+    else:
+        trend, strength = 'stable', 'consistent'
+
+    days = [(series['start'] + timedelta(days=i)).isoformat() for i in range(series['days'])]
+
+    def as_list(values) -> List[Optional[float]]:
+        return [None if np.isnan(v) else round(float(v), 2) for v in values]
+
+    return {
+        'days': series['days'],
+        'trend': trend,
+        'trend_strength': strength,
+        'productivity': {
+            'rolling': {window: _last(values) for window, values in rolling.items()},
+            'ewma': _last(smoothed),
+            'slope_per_week': round(float(slopes(productivity[None, :])[0]) * 7, 2)
+        },
+        'minutes': {
+            'rolling': {window: _last(rolling_mean(series['minutes'], window)) for window in ROLLING_WINDOWS}
+        },
+        # Change in daily minutes per week, over the last SLOPE_WINDOW days
+        'category_slopes': category_slopes,
+        # The subset that stands out from the category's day-to-day noise
+        'significant_slopes': significant_slopes,
+        'series': {
+            'date': days,
+            'productivity': as_list(productivity),
+            'rolling_7': as_list(rolling[7]),
+            'rolling_30': as_list(rolling[30]),
+            'ewma': as_list(smoothed)
+        }
+    }
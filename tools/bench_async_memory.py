@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Measure event-loop latency while concurrent tasks write sessions, calling
+Memory directly (blocking the loop) versus through AsyncMemory.
+
+A heartbeat task sleeps for --tick ms in a loop; how late it wakes up is the
+time the loop spent blocked.
+
+Usage: python -m tools.bench_async_memory [--writers 50] [--sessions 40]
+"""
+
+import argparse
+import asyncio
+import shutil
+import statistics
+import tempfile
+import time
+from src.memory import Memory
+from src.async_memory import AsyncMemory
+
+ACTIVITY = {
+    'text': 'ran for 30 minutes',
+    'category': 'exercise',
+    'duration': 30,
+    'intensity': 'medium',
+    'calories_burned': 240,
+    'productivity_score': 8
+}
+
+async def heartbeat(tick: float, lags: list, stop: asyncio.Event):
+    while not stop.is_set():
+        begin = time.perf_counter()
+        await asyncio.sleep(tick)
+        lags.append(time.perf_counter() - begin - tick)
+
+async def run(store, writers: int, sessions: int, tick: float):
+    lags, stop = [], asyncio.Event()
+    beat = asyncio.create_task(heartbeat(tick, lags, stop))
+
+    async def writer():
+        for _ in range(sessions):
+            await store([ACTIVITY])
+
+    begin = time.perf_counter()
+    await asyncio.gather(*(writer() for _ in range(writers)))
+    elapsed = time.perf_counter() - begin
+
+    stop.set()
+    await beat
+    return elapsed, lags
+
+def report(label: str, elapsed: float, lags: list, total: int):
+    lags_ms = sorted(lag * 1000 for lag in lags) or [0.0]
+    p99 = lags_ms[min(len(lags_ms) - 1, int(len(lags_ms) * 0.99))]
+    print(f"{label:<22}{total / elapsed:>9,.0f} sessions/s   loop lag p50 {statistics.median(lags_ms):7.2f} ms"
+          f"   p99 {p99:7.2f} ms   max {lags_ms[-1]:7.2f} ms")
+
+async def main_async(args):
+    total = args.writers * args.sessions
+    tick = args.tick / 1000
+
+    data_dir = tempfile.mkdtemp(prefix="motivagent-async-")
+    try:
+        memory = Memory(data_dir=data_dir)
+
+        async def blocking_store(activities):
+            memory.store_session(activities)
+
+        elapsed, lags = await run(blocking_store, args.writers, args.sessions, tick)
+        report("Blocking Memory", elapsed, lags, total)
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+    data_dir = tempfile.mkdtemp(prefix="motivagent-async-")
+    try:
+        async with AsyncMemory(data_dir=data_dir, max_pending=args.max_pending) as memory:
+            elapsed, lags = await run(memory.store_session, args.writers, args.sessions, tick)
+            report("AsyncMemory", elapsed, lags, total)
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+def main():
+    parser = argparse.ArgumentParser(description="Event-loop latency under concurrent Memory writes")
+    parser.add_argument("--writers", type=int, default=50)
+    parser.add_argument("--sessions", type=int, default=40, help="sessions per writer task")
+    parser.add_argument("--max-pending", type=int, default=256)
+    parser.add_argument("--tick", type=float, default=5.0, help="heartbeat interval in ms")
+    args = parser.parse_args()
+
+    asyncio.run(main_async(args))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Compare store_session throughput with and without write-behind group commit.
+
+Usage: python -m tools.bench_group_commit [--sessions 2000] [--flush-size 256]
+"""
+
+import argparse
+import shutil
+import tempfile
+import time
+from src.memory import Memory
+
+SAMPLE_ACTIVITIES = [{
+    'text': 'walked 30 minutes',
+    'category': 'exercise',
+    'subcategory': 'cardio',
+    'duration': 30,
+    'intensity': 'medium',
+    'mood': 'positive',
+    'calories_burned': 150,
+    'productivity_score': 8
+}]
+
+def _run(sessions: int, **memory_options) -> float:
+    data_dir = tempfile.mkdtemp(prefix="motivagent-bench-")
+    try:
+        memory = Memory(user_id="bench", data_dir=data_dir, **memory_options)
+        start = time.perf_counter()
+        for _ in range(sessions):
+            memory.store_session(SAMPLE_ACTIVITIES)
+        memory.close()
+        elapsed = time.perf_counter() - start
+
+        stored = len(Memory(user_id="bench", data_dir=data_dir).get_sessions())
+        assert stored == sessions, f"expected {sessions} sessions, found {stored}"
+        return sessions / elapsed
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+def main():
+    parser = argparse.ArgumentParser(description="Write-behind group commit benchmark")
+    parser.add_argument("--sessions", type=int, default=2000)
+    parser.add_argument("--flush-size", type=int, default=256)
+    parser.add_argument("--flush-interval", type=float, default=1.0)
+    args = parser.parse_args()
+
+    sync_rate = _run(args.sessions)
+    batched_rate = _run(args.sessions, write_behind=True,
+                        flush_size=args.flush_size, flush_interval=args.flush_interval)
+
+    print(f"Sessions:            {args.sessions}")
+    print(f"Synchronous writes:  {sync_rate:,.0f} sessions/s")
+    print(f"Group commit:        {batched_rate:,.0f} sessions/s (flush every {args.flush_size} / {args.flush_interval}s)")
+    print(f"Speedup:             {batched_rate / sync_rate:.1f}x")
+
+if __name__ == "__main__":
+    main()
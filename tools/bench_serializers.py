@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Compare shard codecs on a synthetic activity history: encode and decode
+throughput, plus the resulting shard size. Codecs whose package isn't
+installed are skipped.
+
+Usage: python -m tools.bench_serializers [--activities 1000000]
+"""
+
+import argparse
+import gc
+import io
+import random
+import time
+from datetime import datetime, timedelta
+from src.serializers import CODECS
+
+CATEGORIES = ['exercise', 'study', 'work', 'entertainment', 'habits', 'social']
+
+def synthetic_sessions(activities: int, per_session: int):
+    sessions = activities // per_session
+    start_date = datetime.now() - timedelta(days=365)
+    step = timedelta(days=365) / sessions
+
+    return [{
+        'date': (start_date + step * i).isoformat(),
+        'activities': [{
+            'text': 'synthetic activity',
+            'category': random.choice(CATEGORIES),
+            'subcategory': 'general',
+            'duration': random.randint(5, 180),
+            'intensity': random.choice(['low', 'medium', 'high']),
+            'mood': random.choice(['positive', 'neutral', 'negative']),
+            'calories_burned': random.randint(1, 600),
+            'productivity_score': random.randint(1, 10),
+            'parsed_elements': {'has_duration': True},
+            'context': {}
+        } for _ in range(per_session)]
+    } for i in range(sessions)]
+
+def main():
+    parser = argparse.ArgumentParser(description="Shard serializer benchmark")
+    parser.add_argument("--activities", type=int, default=1000000)
+    parser.add_argument("--per-session", type=int, default=4)
+    args = parser.parse_args()
+
+    sessions = synthetic_sessions(args.activities, args.per_session)
+    print(f"📦 {len(sessions):,} sessions / {args.activities:,} activities\n")
+    print(f"{'codec':<10}{'encode':>14}{'decode':>14}{'size':>12}")
+
+    for name, codec_class in CODECS.items():
+        try:
+            codec = codec_class()
+        except ImportError as e:
+            print(f"{name:<10}  skipped ({e})")
+            continue
+
+        # The cyclic GC would otherwise dominate timings while building millions of dicts
+        gc.disable()
+        begin = time.perf_counter()
+        payload = b"".join(codec.dumps(session) for session in sessions)
+        encode = time.perf_counter() - begin
+
+        # Decode through the same framing path the shard readers use
+        begin = time.perf_counter()
+        decoded = [codec.loads(record) for _, record in codec.iter_raw(io.BytesIO(payload), len(payload))]
+        decode = time.perf_counter() - begin
+        gc.enable()
+
+        if decoded != sessions:
+            print(f"❌ {name} did not round-trip")
+            continue
+
+        print(f"{name:<10}{len(sessions) / encode:>10,.0f} s/s{len(sessions) / decode:>10,.0f} s/s"
+              f"{len(payload) / 1e6:>9.1f} MB")
+
+if __name__ == "__main__":
+    main()
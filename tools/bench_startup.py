@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Track CLI startup time: wall-clock per command over fresh interpreters,
+the slowest imports (python -X importtime) and whether any heavy module
+(numpy, requests, ...) gets loaded by a command that shouldn't need it.
+
+Usage: python -m tools.bench_startup [--runs 11] [--target-ms 100] [--top 10]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# (label, main.py arguments, modules that command must not import)
+COMMANDS = [
+    ("streak", ["--streak"], ["numpy", "requests", "dotenv", "src.executor", "src.insight"]),
+    ("help", ["--help"], ["numpy", "requests", "src.executor"]),
+    ("offline reflection", ["--offline", "read for 20 minutes"], ["numpy", "requests", "dotenv"]),
+]
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN = os.path.join(ROOT, "main.py")
+
+# Runs main.py in-process, then reports which of the given modules it loaded
+PROBE = """
+import runpy, sys, io, contextlib
+args, banned = sys.argv[1:-1], sys.argv[-1].split(',')
+sys.argv = ['main.py'] + args
+with contextlib.redirect_stdout(io.StringIO()):
+    try:
+        runpy.run_path({main!r}, run_name='__main__')
+    except SystemExit:
+        pass
+print(','.join(m for m in banned if m in sys.modules))
+"""
+
+def wall_times(argv, runs: int, env, cwd):
+    times = []
+    for _ in range(runs):
+        begin = time.perf_counter()
+        subprocess.run(argv, env=env, cwd=cwd, capture_output=True)
+        times.append(time.perf_counter() - begin)
+    return times
+
+def slowest_imports(args, env, cwd, top: int):
+    """(cumulative µs, module) of the top-level imports main.py makes, slowest first"""
+    result = subprocess.run([sys.executable, "-X", "importtime", MAIN] + args,
+                            env=env, cwd=cwd, capture_output=True, text=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Only direct imports; nested ones are already in their parent's cumulative time
+        if not name.startswith("  "):
+            rows.append((int(cumulative), name.strip()))
+    return sorted(rows, reverse=True)[:top]
+
+def main():
+    parser = argparse.ArgumentParser(description="CLI startup time and import regressions")
+    parser.add_argument("--runs", type=int, default=11)
+    parser.add_argument("--target-ms", type=float, default=100.0, help="budget for the streak command")
+    parser.add_argument("--top", type=int, default=10, help="slowest imports to list")
+    args = parser.parse_args()
+
+    # Fresh data dir so the numbers don't depend on how much history is lying around
+    cwd = tempfile.mkdtemp(prefix="motivagent-startup-")
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    env.pop("MOTIVAGENT_USER", None)
+
+    # Warm up the bytecode cache so we time startup, not compilation
+    subprocess.run([sys.executable, MAIN, "--streak"], env=env, cwd=cwd, capture_output=True)
+
+    bare = statistics.median(wall_times([sys.executable, "-c", "pass"], args.runs, env, cwd))
+    print(f"🐍 Bare interpreter: {bare * 1000:.1f} ms")
+    print(f"\n{'command':<22}{'median':>10}{'p90':>10}   unexpected imports")
+
+    failed = False
+    for label, cli_args, banned in COMMANDS:
+        times = sorted(wall_times([sys.executable, MAIN] + cli_args, args.runs, env, cwd))
+        median = statistics.median(times)
+        p90 = times[min(int(len(times) * 0.9), len(times) - 1)]
+
+        probe = subprocess.run([sys.executable, "-c", PROBE.format(main=MAIN)] + cli_args + [",".join(banned)],
+                               env=env, cwd=cwd, capture_output=True, text=True)
+        loaded = probe.stdout.strip().splitlines()[-1] if probe.stdout.strip() else ""
+        failed |= bool(loaded)
+        print(f"{label:<22}{median * 1000:>8.1f}ms{p90 * 1000:>8.1f}ms   {loaded or '-'}")
+
+        if label == "streak":
+            streak_median = median
+
+    print(f"\n🐢 Slowest imports for --streak:")
+    for cumulative, name in slowest_imports(["--streak"], env, cwd, args.top):
+        print(f"   {cumulative / 1000:>7.1f} ms  {name}")
+
+    verdict = streak_median * 1000 <= args.target_ms
+    print(f"\n{'✅' if verdict else '❌'} streak command: {streak_median * 1000:.1f} ms "
+          f"(target {args.target_ms:.0f} ms, {(streak_median - bare) * 1000:.1f} ms above a bare interpreter)")
+    if failed or not verdict:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Measure weekly-view read time and peak memory as the history grows.
+
+Usage: python -m tools.bench_streaming_reader [--sizes 1000,10000,100000]
+"""
+
+import argparse
+import shutil
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from src.memory import Memory
+
+def _synthetic_sessions(count: int, end: datetime):
+    """Sessions spaced evenly so the newest one lands at end"""
+    step = timedelta(minutes=30)
+    for i in range(count):
+        yield {
+            'date': (end - step * (count - i)).isoformat(),
+            'activities': [{
+                'text': 'studied for 45 minutes',
+                'category': 'study',
+                'duration': 45,
+                'intensity': 'medium',
+                'calories_burned': 54,
+                'productivity_score': 9
+            }],
+            'total_calories': 54,
+            'avg_productivity': 9
+        }
+
+def main():
+    parser = argparse.ArgumentParser(description="Streaming reader benchmark")
+    parser.add_argument("--sizes", default="1000,10000,100000", help="comma-separated history sizes (sessions)")
+    args = parser.parse_args()
+
+    print(f"{'sessions':>10} {'week rows':>10} {'read ms':>10} {'peak KiB':>10}")
+    for size in (int(n) for n in args.sizes.split(",")):
+        data_dir = tempfile.mkdtemp(prefix="motivagent-stream-")
+        try:
+            memory = Memory(data_dir=data_dir)
+            batch = []
+            for session in _synthetic_sessions(size, datetime.now()):
+                batch.append(session)
+                if len(batch) == 10000:
+                    memory._append_to_shards(batch)
+                    batch = []
+            if batch:
+                memory._append_to_shards(batch)
+
+            tracemalloc.start()
+            start = time.perf_counter()
+            rows = sum(1 for _ in memory.iter_sessions(start=datetime.now() - timedelta(days=7)))
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            print(f"{size:>10} {rows:>10} {elapsed * 1000:>10.1f} {peak / 1024:>10.0f}")
+        finally:
+            shutil.rmtree(data_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
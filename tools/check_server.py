@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+End-to-end checks for server.py: starts the API offline on a free port with
+a temporary data dir, sends real HTTP requests and checks the responses.
+
+    health       GET /health answers while serving
+    pipeline     POST /pipeline stores a session the user's /streaks then counts
+    validation   bad users, texts, activities and JSON bodies get a 400, not a 500
+    score        well-formed client activities are scored
+    eviction     with one open store, switching users closes the old store
+                 without losing its writes
+    metrics      /metrics exposes the request counters
+    shutdown     shutdown() flushes every open write-behind store to disk
+
+Usage: python -m tools.check_server
+"""
+
+import argparse
+import asyncio
+import json
+import shutil
+import tempfile
+from server import MotivAgentServer
+from src.executor import Executor
+from src.memory import Memory
+
+ACTIVITY = {'text': "ran for 30 minutes", 'category': 'exercise', 'duration': 30, 'intensity': 'high'}
+
+async def request(port: int, method: str, path: str, body=None):
+    """(status, payload) for one request on its own connection"""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        data = body if isinstance(body, bytes) else json.dumps(body).encode() if body is not None else b''
+        writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n"
+                     f"Content-Length: {len(data)}\r\n\r\n".encode() + data)
+        await writer.drain()
+
+        status = int((await reader.readline()).split()[1])
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b''):
+                break
+            name, _, value = line.decode().partition(':')
+            headers[name.strip().lower()] = value.strip()
+        raw = await reader.readexactly(int(headers.get('content-length', 0)))
+        return status, json.loads(raw) if headers.get('content-type') == 'application/json' else raw.decode()
+    finally:
+        writer.close()
+
+async def check_health(server, port):
+    status, payload = await request(port, 'GET', '/health')
+    assert status == 200 and payload['status'] == 'ok', f"/health: {status} {payload}"
+    return "ok"
+
+async def check_pipeline(server, port):
+    status, payload = await request(port, 'POST', '/pipeline', {'text': "ran for 30 minutes", 'user': 'alice'})
+    assert status == 200 and payload['activities'], f"/pipeline: {status} {payload}"
+    status, payload = await request(port, 'GET', '/streaks?user=alice')
+    assert status == 200 and payload['total_sessions'] == 1, f"/streaks: {status} {payload}"
+    return "session stored and counted"
+
+async def check_validation(server, port):
+    cases = [
+        ('/pipeline', {'text': "ran", 'user': ""}),
+        ('/pipeline', {'text': "ran", 'user': 7}),
+        ('/pipeline', {'text': "  "}),
+        ('/score', {'activities': []}),
+        ('/score', {'activities': [{'text': "x"}]}),
+        ('/score', {'activities': ["ran"]}),
+        ('/score', {'activities': [{**ACTIVITY, 'duration': "30"}]}),
+        ('/score', {'activities': [{**ACTIVITY, 'context': []}]}),
+        ('/batch', {'items': []}),
+        ('/pipeline', b'{not json'),
+        ('/pipeline', [1, 2]),
+    ]
+    for path, body in cases:
+        status, payload = await request(port, 'POST', path, body)
+        assert status == 400, f"{path} {body!r}: {status} {payload}"
+    return f"{len(cases)} bad requests rejected with 400"
+
+async def check_score(server, port):
+    status, payload = await request(port, 'POST', '/score', {'activities': [ACTIVITY]})
+    assert status == 200, f"/score: {status} {payload}"
+    scored = payload['activities'][0]
+    assert scored['calories_burned'] > 0 and scored['motivation_message'], f"/score: {scored}"
+    return f"{scored['calories_burned']} kcal, productivity {scored['productivity_score']}"
+
+async def check_eviction(server, port):
+    server.max_open_users = 1
+    for user in ('bob', 'carol', 'bob'):
+        status, payload = await request(port, 'POST', '/pipeline', {'text': "studied for 2 hours", 'user': user})
+        assert status == 200, f"/pipeline as {user}: {status} {payload}"
+    if server._closing:
+        await asyncio.gather(*server._closing)
+    assert list(server.stores) == ['bob'], f"open stores: {list(server.stores)}"
+    status, payload = await request(port, 'GET', '/streaks?user=carol')
+    assert payload['total_sessions'] == 1, f"carol's evicted write: {payload}"
+    status, payload = await request(port, 'GET', '/streaks?user=bob')
+    assert payload['total_sessions'] == 2, f"bob's writes across an eviction: {payload}"
+    return "evicted stores flushed and reopened intact"
+
+async def check_metrics(server, port):
+    status, text = await request(port, 'GET', '/metrics')
+    assert status == 200, f"/metrics: {status}"
+    for series in ('motivagent_http_requests_total{route="/pipeline",status="200"}',
+                   'motivagent_http_requests_total{route="/score",status="400"}'):
+        assert series in text, f"/metrics has no {series}"
+    return f"{len(text.splitlines())} lines"
+
+CHECKS = {
+    'health': check_health,
+    'pipeline': check_pipeline,
+    'validation': check_validation,
+    'score': check_score,
+    'eviction': check_eviction,
+    'metrics': check_metrics,
+}
+
+async def run(data_dir: str) -> int:
+    server = MotivAgentServer(Executor(offline=True), data_dir=data_dir, parse_workers=1, score_workers=2)
+    serving = asyncio.ensure_future(server.serve("127.0.0.1", 0))
+    while server._server is None:
+        await asyncio.sleep(0.01)
+    port = server._server.sockets[0].getsockname()[1]
+
+    failed = 0
+    try:
+        for name, check in CHECKS.items():
+            try:
+                print(f"✅ {name}: {await check(server, port)}")
+            except AssertionError as e:
+                failed += 1
+                print(f"❌ {name}: {e}")
+    finally:
+        await server.shutdown()
+        await serving
+
+    users = ('alice', 'bob', 'carol')
+    stored = [Memory(user_id=user, data_dir=data_dir).get_streak_info()['total_sessions'] for user in users]
+    if stored == [1, 2, 1]:
+        print(f"✅ shutdown: every store flushed ({sum(stored)} sessions)")
+    else:
+        failed += 1
+        print(f"❌ shutdown: {dict(zip(users, stored))} sessions on disk, expected alice 1, bob 2, carol 1")
+    return failed
+
+def main():
+    argparse.ArgumentParser(description="End-to-end checks for the HTTP API").parse_args()
+    data_dir = tempfile.mkdtemp(prefix="motivagent-check-server-")
+    try:
+        failed = asyncio.run(run(data_dir))
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Self-checks for the storage and analytics invariants: each check builds a
+small history in a temporary data dir and compares the fast path against a
+brute-force answer.
+
+    windows      sharded reads (binary search on sorted shards, scans on
+                 unsorted ones) return exactly the sessions in a window
+    runs         the StatsView's active-day runs and streaks match a recount
+    compaction   archived shards read back and replay into the same stats
+    codecs       a log mixing JSON and msgpack/orjson shards reads back whole
+    recompact    a month archived twice, from shards of different codecs,
+                 keeps both archives
+    writebehind  queued sessions stay readable, reach disk on close() and
+                 force a synchronous flush past max_pending
+    backpressure AsyncMemory never queues more than max_pending writes and
+                 loses none of them
+    insight      memoized insights are reused until a write, from this or
+                 another Memory, changes the data version
+    p2           P² quantile estimates land near the exact quantiles
+    lttb         downsampling keeps the endpoints, the budget and the extremes
+
+Usage: python -m tools.check_storage [--sessions 400] [--seed 7] [--only windows,p2]
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import random
+import shutil
+import tempfile
+from datetime import datetime, timedelta
+from src.async_memory import AsyncMemory
+from src.insight import Insight
+from src.memory import Memory
+from src.online_stats import P2Sketch
+from src.stats_view import StatsView
+from tools.verify_stats import FIELDS
+
+START = datetime(2024, 1, 1, 8, 0)
+
+def _activity(rng: random.Random):
+    return {
+        'category': rng.choice(['exercise', 'study', 'work', 'entertainment']),
+        'duration': rng.randint(5, 180),
+        'calories_burned': rng.randint(0, 400),
+        'productivity_score': rng.randint(1, 10)
+    }
+
+def _history(rng: random.Random, sessions: int):
+    """Session timestamps over ~14 months with gaps, a few of them out of order"""
+    stamps = sorted(START + timedelta(days=rng.randint(0, 420), minutes=rng.randint(0, 720))
+                    for _ in range(sessions))
+    # A few late arrivals leave some shards unsorted
+    for _ in range(3):
+        i = rng.randrange(sessions - 1)
+        stamps[i], stamps[i + 1] = stamps[i + 1], stamps[i]
+    return stamps
+
+def _fill(memory: Memory, rng: random.Random, stamps):
+    for stamp in stamps:
+        memory.store_session([_activity(rng) for _ in range(rng.randint(1, 3))], stamp)
+
+def check_windows(data_dir, rng, sessions):
+    memory = Memory(data_dir=data_dir)
+    stamps = _history(rng, sessions)
+    _fill(memory, rng, stamps)
+
+    manifest = memory._load_manifest()
+    unsorted = sum(not entry['sorted'] for entry in manifest['shards'].values())
+    every = [s['date'] for s in memory.iter_sessions()]
+    assert sorted(every) == sorted(stamp.isoformat() for stamp in stamps), "full scan lost sessions"
+
+    for _ in range(50):
+        lo = START + timedelta(days=rng.randint(-10, 430), hours=rng.randint(0, 23))
+        hi = lo + timedelta(days=rng.choice([0, 1, 7, 31, 120]), hours=rng.randint(0, 23))
+        got = sorted(s['date'] for s in memory.iter_sessions(lo, hi))
+        want = sorted(d for d in every if lo.isoformat() <= d <= hi.isoformat())
+        assert got == want, f"window {lo} → {hi}: {len(got)} sessions, expected {len(want)}"
+    return f"50 windows over {len(manifest['shards'])} shards ({unsorted} unsorted)"
+
+def check_runs(data_dir, rng, sessions):
+    memory = Memory(data_dir=data_dir, checkpoint_every=7)
+    stamps = _history(rng, sessions)
+    _fill(memory, rng, stamps)
+
+    days = sorted({stamp.date() for stamp in stamps})
+    longest = current = 1
+    for prev, day in zip(days, days[1:]):
+        current = current + 1 if (day - prev).days == 1 else 1
+        longest = max(longest, current)
+
+    # The live view, a fresh replay and a restart from the checkpoint must all agree
+    for label, view in (("view", memory._refresh_view()), ("rebuild", memory.rebuild_stats()),
+                        ("restart", Memory(data_dir=data_dir)._refresh_view())):
+        stats = view.to_dict()
+        assert stats['total_sessions'] == sessions, f"{label}: {stats['total_sessions']} sessions"
+        assert stats['longest_streak'] == longest, f"{label}: longest streak {stats['longest_streak']} != {longest}"
+        assert stats['last_active_date'][:10] == days[-1].isoformat(), f"{label}: last active {stats['last_active_date']}"
+    return f"{len(days)} active days, longest streak {longest}"
+
+def _exact_stats(view: StatsView):
+    stats = view.to_dict()
+    return [stats[field] for field in FIELDS], view.daily
+
+def check_compaction(data_dir, rng, sessions):
+    memory = Memory(data_dir=data_dir)
+    _fill(memory, rng, _history(rng, sessions))
+    recent = [datetime.now() - timedelta(days=d) for d in range(3)]
+    _fill(memory, rng, recent)
+
+    before = sorted(s['date'] for s in memory.iter_sessions())
+    # Archives replay in date order, so only order-independent stats must match exactly
+    stats_before = _exact_stats(memory.rebuild_stats())
+    report = memory.compact(older_than_days=30)
+    assert report['shards'], "nothing was archived"
+
+    after = sorted(s['date'] for s in memory.iter_sessions())
+    assert after == before, "archived sessions no longer read back"
+    assert _exact_stats(memory.rebuild_stats()) == stats_before, "replaying archives changed the stats"
+    fresh = Memory(data_dir=data_dir)
+    assert fresh._refresh_view().total_sessions == len(before), "restart after compaction lost sessions"
+    return f"{len(report['shards'])} shards archived, {report['saved_pct']}% smaller"
+
+def check_codecs(data_dir, rng, sessions):
+    codecs = [name for name, package in (('orjson', 'orjson'), ('msgpack', 'msgpack'))
+              if importlib.util.find_spec(package)]
+    stamps = _history(rng, sessions)
+    chunks = [stamps[i::len(codecs) + 1] for i in range(len(codecs) + 1)]
+
+    # Each codec appends to the shards the others started, and opens new ones of its own
+    for codec, chunk in zip(['json'] + codecs, chunks):
+        _fill(Memory(data_dir=data_dir, codec=codec), rng, sorted(chunk))
+
+    memory = Memory(data_dir=data_dir)
+    dates = sorted(s['date'] for s in memory.iter_sessions())
+    assert dates == sorted(stamp.isoformat() for stamp in stamps), "mixed-codec log lost sessions"
+    assert memory.rebuild_stats().total_sessions == sessions, "mixed-codec replay miscounted"
+    return f"json + {', '.join(codecs) or 'no optional codecs installed'}"
+
+def check_recompact(data_dir, rng, sessions):
+    late_codec = 'msgpack' if importlib.util.find_spec('msgpack') else 'json'
+    january = [START + timedelta(days=d) for d in range(3)]
+    _fill(Memory(data_dir=data_dir), rng, january)
+    Memory(data_dir=data_dir).compact(older_than_days=30)
+
+    # A late January session opens a new hot shard for the archived month
+    late = START + timedelta(days=20)
+    _fill(Memory(data_dir=data_dir, codec=late_codec), rng, [late])
+    memory = Memory(data_dir=data_dir)
+    memory.compact(older_than_days=30)
+
+    archive = memory._load_manifest()['archive']
+    files = [entry['file'] for entry in archive.values()]
+    assert len(set(files)) == len(files) == 2, f"archives collided: {files}"
+    dates = sorted(s['date'] for s in memory.iter_sessions())
+    assert dates == sorted(stamp.isoformat() for stamp in january + [late]), f"{len(dates)} of 4 sessions readable"
+    assert memory.rebuild_stats().total_sessions == 4, "replay after re-compaction miscounted"
+    return f"json + {late_codec} shards for one month → {', '.join(sorted(files))}"
+
+def _rows_on_disk(data_dir):
+    return sum(entry['rows'] for entry in Memory(data_dir=data_dir)._load_manifest()['shards'].values())
+
+def check_writebehind(data_dir, rng, sessions):
+    # Nothing would flush on its own before close()
+    memory = Memory(data_dir=data_dir, write_behind=True, flush_size=sessions + 1,
+                    flush_interval=3600, max_pending=sessions + 1)
+    stamps = _history(rng, sessions)
+    _fill(memory, rng, stamps)
+    assert _rows_on_disk(data_dir) == 0, "sessions were flushed before close()"
+    assert sum(1 for _ in memory.iter_sessions()) == sessions, "queued sessions not readable"
+
+    memory.close()
+    fresh = Memory(data_dir=data_dir)
+    assert sorted(s['date'] for s in fresh.iter_sessions()) == sorted(stamp.isoformat() for stamp in stamps), \
+        "close() lost queued sessions"
+    assert fresh._refresh_view().total_sessions == sessions, "close() left the stats behind"
+
+    # Past max_pending the caller commits synchronously instead of queueing more
+    shutil.rmtree(data_dir)
+    bounded = Memory(data_dir=data_dir, write_behind=True, flush_size=sessions + 1,
+                     flush_interval=3600, max_pending=10)
+    _fill(bounded, rng, _history(rng, 25))
+    on_disk = _rows_on_disk(data_dir)
+    bounded.close()
+    assert on_disk >= 20, f"{on_disk} of 25 sessions on disk with max_pending=10"
+    return f"{sessions} sessions flushed on close, {on_disk}/25 committed past max_pending"
+
+def check_backpressure(data_dir, rng, sessions):
+    limit = 4
+    async_memory = AsyncMemory(max_pending=limit, data_dir=data_dir)
+    stamps = sorted(_history(rng, min(sessions, 100)))
+    peaks = {'pending': 0, 'queued': 0}
+
+    async def run():
+        async def watch():
+            while True:
+                peaks['pending'] = max(peaks['pending'], async_memory.pending_writes)
+                peaks['queued'] = max(peaks['queued'], async_memory._writer._work_queue.qsize())
+                await asyncio.sleep(0)
+
+        watcher = asyncio.ensure_future(watch())
+        await asyncio.gather(*(async_memory.store_session([_activity(rng)], stamp) for stamp in stamps))
+        watcher.cancel()
+        await async_memory.close()
+
+    asyncio.run(run())
+    assert peaks['queued'] <= limit, f"{peaks['queued']} writes queued on the writer, max_pending {limit}"
+    assert peaks['pending'] == limit, f"writers never waited: at most {peaks['pending']} pending"
+    dates = [s['date'] for s in Memory(data_dir=data_dir).iter_sessions()]
+    assert dates == [stamp.isoformat() for stamp in stamps], "writes lost or committed out of order"
+    return f"{len(stamps)} concurrent writes, never more than {limit} pending"
+
+def check_insight(data_dir, rng, sessions):
+    memory = Memory(data_dir=data_dir)
+    insight = Insight(memory)
+    now = datetime.now()
+    _fill(memory, rng, [now - timedelta(hours=h) for h in range(1, 6)])
+
+    first = insight.weekly_aggregate()
+    assert insight.weekly_aggregate() is first, "unchanged data recomputed the aggregate"
+    memory.store_session([_activity(rng)])
+    local = insight.weekly_aggregate()
+    assert local is not first and local.sessions == first.sessions + 1, "a local write served a stale aggregate"
+
+    # Another Memory on the same log stands in for another process
+    Memory(data_dir=data_dir).store_session([_activity(rng)])
+    other = insight.weekly_aggregate()
+    assert other is not local and other.sessions == local.sessions + 1, "another writer's session served stale"
+
+    stats = insight.cache_stats()
+    assert (stats['hits'], stats['misses']) == (1, 3), f"{stats['hits']} hits, {stats['misses']} misses"
+    return "hit on unchanged data, recomputed after local and external writes"
+
+def check_p2(data_dir, rng, sessions):
+    for name, draw in (("uniform", lambda: rng.uniform(0, 100)), ("skewed", lambda: rng.expovariate(0.1))):
+        values = [draw() for _ in range(max(sessions * 10, 2000))]
+        sketch = P2Sketch()
+        for value in values:
+            sketch.add(value)
+
+        ordered = sorted(values)
+        spread = ordered[int(0.9 * len(ordered))] - ordered[int(0.1 * len(ordered))]
+        for p in sketch.quantiles:
+            exact = ordered[int(p * (len(ordered) - 1))]
+            assert abs(sketch.value(p) - exact) <= 0.05 * spread, \
+                f"{name} p{int(p * 100)}: estimate {sketch.value(p):.2f}, exact {exact:.2f}"
+    return "5 quantiles within 5% of the p10-p90 spread"
+
+def check_lttb(data_dir, rng, sessions):
+    from src.chart_data import downsample_series, POINT_BUDGET
+    if importlib.util.find_spec('numpy') is None:
+        return "skipped (numpy not installed)"
+
+    rows = max(sessions * 10, 2000)
+    values = [rng.gauss(0, 1) for _ in range(rows)]
+    peak, trough = rng.randrange(1, rows - 1), rng.randrange(1, rows - 1)
+    values[peak], values[trough] = 50.0, -50.0
+    series = {'date': list(range(rows)), 'value': values}
+
+    small = downsample_series(series, shape_key='value', max_points=POINT_BUDGET)
+    assert len(small['date']) == POINT_BUDGET, f"{len(small['date'])} points, budget {POINT_BUDGET}"
+    assert small['date'][0] == 0 and small['date'][-1] == rows - 1, "endpoints dropped"
+    assert small['date'] == sorted(small['date']), "points out of order"
+    assert 50.0 in small['value'] and -50.0 in small['value'], "peak or trough dropped"
+    return f"{rows} → {POINT_BUDGET} points, extremes kept"
+
+CHECKS = {
+    'windows': check_windows,
+    'runs': check_runs,
+    'compaction': check_compaction,
+    'codecs': check_codecs,
+    'recompact': check_recompact,
+    'writebehind': check_writebehind,
+    'backpressure': check_backpressure,
+    'insight': check_insight,
+    'p2': check_p2,
+    'lttb': check_lttb,
+}
+
+def main():
+    parser = argparse.ArgumentParser(description="Storage and analytics invariant checks")
+    parser.add_argument("--sessions", type=int, default=400, help="sessions per generated history")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--only", help="comma-separated checks to run (default: all)")
+    args = parser.parse_args()
+
+    names = args.only.split(",") if args.only else list(CHECKS)
+    failed = 0
+    for name in names:
+        data_dir = tempfile.mkdtemp(prefix=f"motivagent-check-{name}-")
+        try:
+            detail = CHECKS[name](data_dir, random.Random(args.seed), args.sessions)
+            print(f"✅ {name}: {detail}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {name}: {e}")
+        finally:
+            shutil.rmtree(data_dir, ignore_errors=True)
+
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Archive old activity-log shards into compressed files and report disk
+savings and cold-query latency.
+
+Usage: python -m tools.compact_archive [--user alice] [--older-than 90] [--codec gzip|zstd]
+"""
+
+import argparse
+import time
+from datetime import datetime, timedelta
+from src.memory import Memory
+
+def _timed_query(memory: Memory, start: str, end: str):
+    begin = time.perf_counter()
+    rows = sum(1 for _ in memory.iter_sessions(datetime.fromisoformat(start), datetime.fromisoformat(end)))
+    return rows, (time.perf_counter() - begin) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description="Compact old sessions into compressed archives")
+    parser.add_argument("--user", help="user partition to compact (defaults to the shared log)")
+    parser.add_argument("--data-dir", default="data")
+    parser.add_argument("--older-than", type=int, default=90, help="archive shards whose sessions are all older than this many days")
+    parser.add_argument("--codec", choices=["gzip", "zstd"], default="gzip")
+    args = parser.parse_args()
+
+    memory = Memory(user_id=args.user, data_dir=args.data_dir)
+
+    # Time a query over just the shards about to be archived, while they're
+    # still hot; same cutoff as Memory.compact()
+    cutoff = (datetime.now() - timedelta(days=args.older_than)).isoformat()
+    candidates = [e for e in memory._load_manifest()['shards'].values() if e['end'] < cutoff]
+    window = None
+    if candidates:
+        window = (min(e['start'] for e in candidates), max(e['end'] for e in candidates))
+        hot_rows, hot_ms = _timed_query(memory, *window)
+
+    report = memory.compact(older_than_days=args.older_than, codec=args.codec)
+
+    if not report['shards']:
+        print(f"Nothing older than {args.older_than} days to archive.")
+        return
+
+    print(f"📦 Archived {len(report['shards'])} shard(s), {report['sessions']} sessions: {', '.join(report['shards'])}")
+    print(f"   Raw size:      {report['raw_bytes'] / 1024:10.1f} KiB")
+    print(f"   Archived size: {report['archived_bytes'] / 1024:10.1f} KiB")
+    print(f"   Saved:         {report['saved_bytes'] / 1024:10.1f} KiB ({report['saved_pct']}%)")
+
+    cold_rows, cold_ms = _timed_query(memory, *window)
+    print(f"\n⏱️  Range query over the same window ({window[0][:10]} → {window[1][:10]}):")
+    print(f"   Before (hot):  {hot_rows} sessions in {hot_ms:.1f} ms")
+    print(f"   After (cold):  {cold_rows} sessions in {cold_ms:.1f} ms")
+
+if __name__ == "__main__":
+    main()
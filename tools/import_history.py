@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Bulk-import historical reflections from a CSV or JSONL file.
+
+Each row needs a timestamp ('timestamp' or 'date', ISO 8601) and the
+reflection ('text' or 'reflection'). Rows are parsed in parallel with the
+Planner, scored by the Executor in offline mode (fallback messages, no API
+calls) and written to Memory in large batches under their original
+timestamps. Stats and rollups are computed once, at the end.
+
+Usage: python -m tools.import_history FILE [--user ID] [--workers N] [--batch-size 5000]
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from multiprocessing import Pool
+from src.planner import Planner
+from src.executor import Executor
+from src.memory import Memory
+
+# Per-process pipeline, built once by each worker
+_planner = None
+_executor = None
+
+def _init_worker():
+    global _planner, _executor
+    _planner = Planner()
+    _executor = Executor(offline=True)
+
+def _score_row(row):
+    """Turn one (timestamp, text) row into a session, or None if it can't be imported"""
+    timestamp, text = row
+    try:
+        when = datetime.fromisoformat(timestamp.strip())
+    except (AttributeError, TypeError, ValueError):
+        return None
+    if when.tzinfo is not None:
+        # Stored dates are naive local time and compared as strings, so an offset would misorder them
+        when = when.astimezone().replace(tzinfo=None)
+    if not isinstance(text, str) or not text or not text.strip():
+        return None
+
+    activities = _executor.process_activities(_planner.parse_input(text))
+    return Memory.build_session(activities, when) if activities else None
+
+def _json_records(f):
+    """Parsed JSONL rows; a line that isn't a JSON object comes through as None"""
+    for line in f:
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            record = None
+        yield record if isinstance(record, dict) else None
+
+def read_rows(path: str, fmt: str):
+    """Stream (timestamp, text) pairs from a CSV or JSONL file ('-' reads stdin).
+
+    Malformed rows come through as (None, None) and are skipped like any other
+    unusable row, rather than aborting an import that has already appended batches.
+    """
+    f = sys.stdin if path == "-" else open(path, newline='', encoding='utf-8')
+    try:
+        records = csv.DictReader(f) if fmt == "csv" else _json_records(f)
+        for record in records:
+            if record is None:
+                yield None, None
+                continue
+            yield (record.get('timestamp') or record.get('date'),
+                   record.get('text') or record.get('reflection'))
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk-import historical reflections into Memory")
+    parser.add_argument("file", help="CSV or JSONL file of (timestamp, text) rows, or - for stdin")
+    parser.add_argument("--format", choices=["csv", "jsonl"],
+                        help="input format (default: inferred from the file extension, jsonl for stdin)")
+    parser.add_argument("--user", default=os.getenv("MOTIVAGENT_USER"))
+    parser.add_argument("--data-dir", default="data")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--batch-size", type=int, default=5000, help="sessions per shard append")
+    args = parser.parse_args()
+
+    fmt = args.format or ("csv" if args.file.lower().endswith(".csv") else "jsonl")
+    memory = Memory(user_id=args.user, data_dir=args.data_dir)
+    counts = {'rows': 0, 'skipped': 0}
+
+    def sessions(scored):
+        for session in scored:
+            counts['rows'] += 1
+            if session is None:
+                counts['skipped'] += 1
+                continue
+            yield session
+
+    print(f"📥 Importing {args.file} ({fmt}) with {args.workers} worker(s)...")
+    begin = time.perf_counter()
+
+    rows = read_rows(args.file, fmt)
+    if args.workers > 1:
+        # imap keeps input order, so mostly-chronological files land in sorted shards
+        with Pool(args.workers, initializer=_init_worker) as pool:
+            scored = pool.imap(_score_row, rows, chunksize=256)
+            imported = memory.import_sessions(sessions(scored), batch_size=args.batch_size)
+    else:
+        # Not worth the IPC overhead on a single core
+        _init_worker()
+        imported = memory.import_sessions(sessions(map(_score_row, rows)), batch_size=args.batch_size)
+
+    elapsed = time.perf_counter() - begin
+    streak_info = memory.get_streak_info()
+
+    print(f"✅ Imported {imported:,} sessions from {counts['rows']:,} rows ({counts['skipped']:,} skipped)")
+    print(f"⚡ {elapsed:.2f}s — {counts['rows'] / elapsed if elapsed else 0:,.0f} rows/s")
+    print(f"🔥 Current streak: {streak_info['current_streak']} days | "
+          f"🏆 Longest: {streak_info['longest_streak']} days | 📝 Sessions: {streak_info['total_sessions']}")
+
+if __name__ == "__main__":
+    main()
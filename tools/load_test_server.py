@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Load-test a running MotivAgent API server (python server.py --stub-latency 0.2)
+with N concurrent keep-alive clients, each posting reflections in a loop.
+
+Reports throughput, the latency distribution and any non-200 responses.
+
+Usage: python -m tools.load_test_server [--port 8080] [--clients 50] [--requests 20] [--endpoint /pipeline]
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from collections import Counter
+
+TEXTS = ["ran for 30 minutes and studied python for 2 hours",
+         "watched netflix for 3 hours",
+         "worked on the project for 4 hours with the team",
+         "walked the dog for 20 minutes and read for an hour"]
+
+async def client(host: str, port: int, endpoint: str, requests: int, index: int, latencies: list, statuses: Counter):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for i in range(requests):
+            body = json.dumps({'text': TEXTS[(index + i) % len(TEXTS)], 'user': f"load-{index % 8}"}).encode()
+            begin = time.perf_counter()
+            writer.write(f"POST {endpoint} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                         f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+            await writer.drain()
+
+            status = int((await reader.readline()).split()[1])
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b''):
+                    break
+                name, _, value = line.decode().partition(':')
+                if name.lower() == 'content-length':
+                    length = int(value)
+            await reader.readexactly(length)
+
+            latencies.append(time.perf_counter() - begin)
+            statuses[status] += 1
+    finally:
+        writer.close()
+
+async def run(args):
+    latencies, statuses = [], Counter()
+    begin = time.perf_counter()
+    await asyncio.gather(*(client(args.host, args.port, args.endpoint, args.requests, i, latencies, statuses)
+                           for i in range(args.clients)))
+    elapsed = time.perf_counter() - begin
+
+    latencies.sort()
+    cuts = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    print(f"📊 {len(latencies)} requests to {args.endpoint} from {args.clients} clients in {elapsed:.2f}s")
+    print(f"   Throughput: {len(latencies) / elapsed:.1f} req/s")
+    print(f"   Latency p50 {cuts[49] * 1000:.1f} ms | p95 {cuts[94] * 1000:.1f} ms | "
+          f"p99 {cuts[98] * 1000:.1f} ms | max {latencies[-1] * 1000:.1f} ms")
+    print(f"   Status codes: {dict(statuses)}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent keep-alive load test for server.py")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=20, help="requests per client")
+    parser.add_argument("--endpoint", default="/pipeline")
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Simulate N dashboard sessions against one user's history and compare
+per-session engines (every session builds its own Planner, Executor,
+Memory and Insight) with the process-wide shared engines and
+version-keyed caches the Streamlit app uses.
+
+Each simulated rerun renders the sidebar stats, the weekly insights and the
+smart analytics; every --log-every-th rerun also logs an activity.
+
+Usage: python -m tools.load_test_sessions [--sessions 1 10 50] [--reruns 5]
+"""
+
+import argparse
+import shutil
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from src.planner import Planner
+from src.executor import Executor
+from src.memory import Memory
+from src.insight import Insight
+
+def seed_history(data_dir: str, days: int):
+    planner, executor = Planner(), Executor(offline=True)
+    memory = Memory(user_id="loadtest", data_dir=data_dir)
+    texts = ["ran for 30 minutes and studied python for 2 hours",
+             "watched netflix for 3 hours", "worked on the project for 4 hours with the team"]
+    now = datetime.now()
+    memory.import_sessions(
+        Memory.build_session(executor.process_activities(planner.parse_input(texts[day % len(texts)])),
+                             now - timedelta(days=day))
+        for day in range(days, 0, -1))
+
+class PerSessionApp:
+    """The old model: a full engine stack per browser session, nothing cached across reruns"""
+
+    def __init__(self, data_dir: str):
+        self.planner = Planner()
+        self.executor = Executor(offline=True)
+        self.memory = Memory(user_id="loadtest", data_dir=data_dir)
+        self.insight = Insight(self.memory)
+
+    def rerun(self, log: bool):
+        if log:
+            self.memory.store_session(self.executor.process_activities(self.planner.parse_input("walked 20 minutes")))
+        self.memory.get_streak_info()
+        # Without shared memoization every rerun recomputes from disk
+        self.insight._cache_key = None
+        self.insight.analyze_weekly_trends()
+        self.insight.suggest_improvements()
+        self.insight.weekly_aggregate()
+
+class SharedApp:
+    """The cached model: engines and the user's Memory/Insight are process-wide singletons"""
+
+    engines = None
+    stores = {}
+    streak_cache = {}
+
+    def __init__(self, data_dir: str):
+        if SharedApp.engines is None:
+            SharedApp.engines = (Planner(), Executor(offline=True))
+        if data_dir not in SharedApp.stores:
+            memory = Memory(user_id="loadtest", data_dir=data_dir)
+            SharedApp.stores[data_dir] = (memory, Insight(memory))
+        self.memory, self.insight = SharedApp.stores[data_dir]
+
+    def rerun(self, log: bool):
+        planner, executor = SharedApp.engines
+        if log:
+            self.memory.store_session(executor.process_activities(planner.parse_input("walked 20 minutes")))
+
+        # Mirrors st.cache_data keyed on (data version, day)
+        key = (self.memory.data_version(), datetime.now().date())
+        if key not in SharedApp.streak_cache:
+            SharedApp.streak_cache = {key: self.memory.get_streak_info()}
+
+        self.insight.analyze_weekly_trends()
+        self.insight.suggest_improvements()
+        self.insight.weekly_aggregate()
+
+def run(app_class, data_dir: str, sessions: int, reruns: int, log_every: int):
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+
+    apps = [app_class(data_dir) for _ in range(sessions)]
+    begin = time.process_time()
+    count = 0
+    for _ in range(reruns):
+        for app in apps:
+            count += 1
+            app.rerun(log=count % log_every == 0)
+    cpu = time.process_time() - begin
+
+    held = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    return held, cpu / count
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-session vs shared engine load test")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--reruns", type=int, default=5, help="reruns per session")
+    parser.add_argument("--log-every", type=int, default=10, help="log an activity every Nth rerun")
+    parser.add_argument("--history-days", type=int, default=180)
+    args = parser.parse_args()
+
+    print(f"{'model':<14}{'sessions':>9}{'memory held':>14}{'per session':>14}{'CPU/rerun':>12}")
+    for label, app_class in (("per-session", PerSessionApp), ("shared", SharedApp)):
+        for sessions in args.sessions:
+            data_dir = tempfile.mkdtemp(prefix="motivagent-load-")
+            try:
+                seed_history(data_dir, args.history_days)
+                held, cpu = run(app_class, data_dir, sessions, args.reruns, args.log_every)
+                print(f"{label:<14}{sessions:>9}{held / 1e6:>11.2f} MB{held / sessions / 1e3:>11.1f} KB"
+                      f"{cpu * 1000:>9.2f} ms")
+            finally:
+                SharedApp.stores.clear()
+                shutil.rmtree(data_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Migrate a single-file activity_log.json into time-partitioned shards.
+
+Refuses to touch a log that already has shards or archives unless --force
+is given, in which case the legacy sessions are appended to it.
+
+Usage: python -m tools.migrate_shards [--data-dir data] [--shard-by month|week] [--force]
+"""
+
+import argparse
+import os
+from src.memory import Memory
+
+def main():
+    parser = argparse.ArgumentParser(description="Split activity_log.json into per-month/per-week shards")
+    parser.add_argument("--data-dir", default="data")
+    parser.add_argument("--shard-by", choices=["month", "week"], default="month")
+    parser.add_argument("--remove-legacy", action="store_true",
+                        help="delete activity_log.json instead of renaming it to .migrated")
+    parser.add_argument("--force", action="store_true",
+                        help="append the legacy sessions to a log that already has shards")
+    args = parser.parse_args()
+
+    legacy_file = os.path.join(args.data_dir, "activity_log.json")
+    if not os.path.exists(legacy_file):
+        print(f"Nothing to migrate: {legacy_file} not found")
+        return
+
+    # Memory() only migrates on its own when no manifest exists yet
+    memory = Memory(data_dir=args.data_dir, shard_by=args.shard_by)
+    if os.path.exists(legacy_file):
+        try:
+            migrated = memory.migrate_legacy_log(remove_legacy=args.remove_legacy, force=args.force)
+        except ValueError as e:
+            print(f"❌ {e}")
+            raise SystemExit(1)
+        print(f"Migrated {migrated} legacy session(s)")
+    elif args.remove_legacy:
+        os.remove(legacy_file + ".migrated")
+
+    manifest = memory._load_manifest()
+    print(f"Log now has {len(manifest['shards'])} shard(s):")
+    for key in sorted(manifest['shards']):
+        entry = manifest['shards'][key]
+        print(f"   • {key}: {entry['rows']} sessions ({entry['start'][:10]} → {entry['end'][:10]})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Multi-process write stress test for Memory.
+
+Spawns several processes that call store_session concurrently against one
+data directory, then checks that no session was lost and reports throughput.
+
+Usage: python -m tools.stress_writers [--processes 8] [--sessions 200]
+"""
+
+import argparse
+import multiprocessing
+import shutil
+import tempfile
+import time
+from src.memory import Memory
+
+def _writer(data_dir: str, user_id: str, worker_id: int, sessions: int):
+    memory = Memory(user_id=user_id, data_dir=data_dir)
+    for i in range(sessions):
+        memory.store_session([{
+            'text': f"worker {worker_id} session {i}",
+            'category': 'exercise',
+            'duration': 30,
+            'intensity': 'medium',
+            'calories_burned': 150,
+            'productivity_score': 7
+        }])
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent Memory writer stress test")
+    parser.add_argument("--processes", type=int, default=8)
+    parser.add_argument("--sessions", type=int, default=200, help="sessions per process")
+    parser.add_argument("--user", default="stress")
+    args = parser.parse_args()
+
+    data_dir = tempfile.mkdtemp(prefix="motivagent-stress-")
+    try:
+        # Create the partition up front so workers only race on writes
+        Memory(user_id=args.user, data_dir=data_dir)
+
+        start = time.perf_counter()
+        workers = [
+            multiprocessing.Process(target=_writer, args=(data_dir, args.user, i, args.sessions))
+            for i in range(args.processes)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        elapsed = time.perf_counter() - start
+
+        memory = Memory(user_id=args.user, data_dir=data_dir)
+        expected = args.processes * args.sessions
+        stored = len(memory.get_sessions())
+        manifest_rows = sum(e['rows'] for e in memory._load_manifest()['shards'].values())
+        stats_sessions = memory.get_streak_info()['total_sessions']
+
+        print(f"Writers: {args.processes} processes × {args.sessions} sessions")
+        print(f"Expected sessions:  {expected}")
+        print(f"Sessions in shards: {stored}")
+        print(f"Manifest rows:      {manifest_rows}")
+        print(f"Stats total:        {stats_sessions}")
+        print(f"Throughput:         {expected / elapsed:.0f} sessions/s ({elapsed:.2f}s)")
+
+        ok = stored == manifest_rows == stats_sessions == expected
+        print("✅ No lost writes" if ok else "❌ Lost or duplicated writes detected")
+        return 0 if ok else 1
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Recompute user stats from the full session log and diff them against the
+checkpointed/materialized view.
+
+Usage: python -m tools.verify_stats [--user alice] [--data-dir data] [--repair]
+"""
+
+import argparse
+from src.fileio import read_json
+from src.memory import Memory
+from src.stats_view import StatsView
+
+FIELDS = ['total_sessions', 'total_activities', 'total_calories',
+          'current_streak', 'longest_streak', 'last_active_date', 'active_runs']
+
+def _diff(expected: dict, actual: dict) -> list:
+    return [(field, expected.get(field), actual.get(field))
+            for field in FIELDS if expected.get(field) != actual.get(field)]
+
+def main():
+    parser = argparse.ArgumentParser(description="Verify the user stats view against the session log")
+    parser.add_argument("--user", help="user partition to check (defaults to the shared log)")
+    parser.add_argument("--data-dir", default="data")
+    parser.add_argument("--repair", action="store_true", help="overwrite the checkpoint with the recomputed stats")
+    args = parser.parse_args()
+
+    memory = Memory(user_id=args.user, data_dir=args.data_dir)
+    expected = memory.rebuild_stats()
+    checkpoint = read_json(memory.user_stats_file)
+    view = memory._refresh_view()
+
+    ok = True
+    for label, actual in (("checkpoint + replay", view.to_dict()), ("checkpoint file", checkpoint)):
+        if label == "checkpoint file" and not StatsView.is_checkpoint(checkpoint):
+            print(f"ℹ️  {label}: pre-view format, will be rebuilt on next checkpoint")
+            continue
+
+        differences = _diff(expected.to_dict(), actual)
+        if label == "checkpoint file":
+            # A checkpoint legitimately lags the log; only the replayed view must match exactly
+            differences = [d for d in differences if checkpoint['total_sessions'] >= expected.total_sessions]
+
+        if differences:
+            ok = False
+            print(f"❌ {label} differs from a full recompute:")
+            for field, want, got in differences:
+                print(f"   • {field}: expected {want!r}, got {got!r}")
+        else:
+            print(f"✅ {label} matches a full recompute ({expected.total_sessions} sessions)")
+
+    if args.repair:
+        memory._view = expected
+        memory.checkpoint_stats(force=True)
+        repaired = read_json(memory.user_stats_file)
+        if StatsView.is_checkpoint(repaired) and not _diff(expected.to_dict(), repaired):
+            print("🔧 Checkpoint rewritten from the full recompute")
+        else:
+            ok = False
+            print("❌ Checkpoint repair failed: the file still differs from the full recompute")
+
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    raise SystemExit(main())